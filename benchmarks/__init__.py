@@ -0,0 +1,4 @@
+"""
+MIPS Simulator - Benchmarks
+Performance harnesses for the simulator core (run with python -m benchmarks.<name>)
+"""
@@ -0,0 +1,57 @@
+"""
+Assembler Benchmark
+Lines/sec for a 100k-line synthetic program: first assembly, and
+re-assembly after a one-line edit (served from the per-line cache)
+"""
+
+import time
+
+from core import Assembler
+from .programs import mixed_program, labelled_program
+
+LINES = 100000
+
+
+def lines_per_sec(assemble, source, repeat=3):
+    """Best lines/sec of 'repeat' runs"""
+    lines = source.count('\n') + 1
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        assemble(source)
+        best = min(best, time.perf_counter() - start)
+    return lines / best
+
+
+def measure(source):
+    """Return (cold lines/sec, lines/sec after a one-line edit)"""
+    cold = lines_per_sec(lambda text: Assembler().assemble(text), source)
+
+    assembler = Assembler()
+    expected = assembler.assemble(source)
+    lines = source.split('\n')
+    edits = iter(range(1, 1000))
+
+    def edit_and_assemble(text):
+        # Change one line's immediate, as a small editor edit would
+        lines[len(lines) // 2] = f"ADDI r1, r1, {next(edits) % 64}"
+        return assembler.assemble('\n'.join(lines))
+
+    warm = lines_per_sec(edit_and_assemble, source)
+    lines[len(lines) // 2] = source.split('\n')[len(lines) // 2]
+    assert assembler.assemble('\n'.join(lines)) == expected
+    assert Assembler().assemble(source) == expected
+
+    return cold, warm
+
+
+def main():
+    for name, source in (("mixed", mixed_program(LINES)),
+                         ("labelled", labelled_program(LINES))):
+        cold, warm = measure(source)
+        print(f"{name:>9}: {cold:12,.0f} lines/sec cold, "
+              f"{warm:12,.0f} lines/sec after a one-line edit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Batch Runner Benchmark
+Measures programs/sec of core.runner.run_batch at 1, 2, 4 and N workers
+"""
+
+import os
+import tempfile
+import time
+
+from core.runner import run_batch, default_workers
+from .programs import mixed_program
+
+
+def write_corpus(directory, count, size):
+    """Write 'count' synthetic .asm files and return their paths"""
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"program_{i:05d}.asm")
+        with open(path, 'w') as f:
+            f.write(mixed_program(size, seed=i))
+        paths.append(path)
+    return paths
+
+
+def measure(count=400, size=300):
+    """Return programs/sec for each worker count"""
+    worker_counts = sorted({1, 2, 4, default_workers()})
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, count, size)
+
+        for workers in worker_counts:
+            start = time.perf_counter()
+            for _ in run_batch(paths, workers=workers, ordered=False):
+                pass
+            elapsed = time.perf_counter() - start
+            results[workers] = count / elapsed
+
+    return results
+
+
+def main():
+    results = measure()
+    single = results[1]
+    for workers, rate in results.items():
+        print(f"{workers:3d} worker(s): {rate:8,.1f} programs/sec ({rate / single:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
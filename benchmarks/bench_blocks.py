@@ -0,0 +1,46 @@
+"""
+Block Cache Benchmark
+Compares FunctionalCPU (per-instruction dispatch) with BlockCachedCPU
+on a loop-heavy program
+"""
+
+import time
+
+from core import FunctionalCPU, BlockCachedCPU, Assembler
+from .programs import loop_program
+
+
+def measure(repeat=5):
+    """Return the best instructions/sec of each engine"""
+    instructions = Assembler().assemble(loop_program(outer=63, inner=63, body=4))
+    results = {}
+    final_states = {}
+
+    for cpu_class in (FunctionalCPU, BlockCachedCPU):
+        cpu = cpu_class()
+        best = 0.0
+
+        # Reload every round so translation cost is included
+        for _ in range(repeat):
+            cpu.load_program(instructions)
+            start = time.perf_counter()
+            count = cpu.run()
+            elapsed = time.perf_counter() - start
+            best = max(best, count / elapsed)
+
+        results[cpu_class.__name__] = best
+        final_states[cpu_class.__name__] = (cpu.registers, list(cpu.memory), cpu.pc)
+
+    assert final_states['FunctionalCPU'] == final_states['BlockCachedCPU'], "final state differs"
+    return results
+
+
+def main():
+    results = measure()
+    for name, rate in results.items():
+        print(f"{name}: {rate:,.0f} instructions/sec")
+    print(f"Speedup: {results['BlockCachedCPU'] / results['FunctionalCPU']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
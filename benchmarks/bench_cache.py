@@ -0,0 +1,77 @@
+"""
+Data Cache Benchmark
+Hit rate and CPI of a strided memory kernel under several data cache
+configurations, and the simulation speed cost of the cache model
+"""
+
+import time
+
+from core import PipelinedCPU, Assembler
+from core.cache import CacheConfig
+
+MEMORY_SIZE = 4096
+
+CONFIGS = {
+    'none': None,
+    'direct 256w/4': CacheConfig(size=256, block_size=4),
+    '2-way lru 256w/4': CacheConfig(size=256, block_size=4, associativity=2),
+    '4-way fifo 256w/4': CacheConfig(size=256, block_size=4, associativity=4,
+                                     replacement='fifo'),
+    'write-through 256w/4': CacheConfig(size=256, block_size=4, write_policy='write-through'),
+}
+
+STRIDES = (1, 4, 16)
+
+
+def strided_kernel(stride, count=63, passes=32):
+    """Read-modify-write 'count' words 'stride' apart, 'passes' times"""
+    return f"""
+ADDI r6, r0, 1
+ADDI r5, r0, {passes}
+outer:
+ADD r1, r0, r0
+ADDI r2, r0, {count}
+inner:
+LW r3, 0(r1)
+ADD r4, r4, r3
+SW r4, 0(r1)
+ADDI r1, r1, {stride}
+SUB r2, r2, r6
+BNE r2, r0, inner
+SUB r5, r5, r6
+BNE r5, r0, outer
+"""
+
+
+def run(instructions, config):
+    """Run to completion; return (stats, cycles per second)"""
+    cpu = PipelinedCPU(memory_size=MEMORY_SIZE)
+    cpu.enable_data_cache(config)
+    cpu.load_program(instructions)
+
+    step = cpu.step
+    is_complete = cpu.is_program_complete
+    start = time.perf_counter()
+    while not is_complete():
+        step()
+    elapsed = time.perf_counter() - start
+    return cpu.get_stats(), cpu.cycle / elapsed
+
+
+def main():
+    assembler = Assembler()
+    for stride in STRIDES:
+        instructions = assembler.assemble(strided_kernel(stride))
+        print(f"stride {stride}:")
+        for name, config in CONFIGS.items():
+            stats, rate = run(instructions, config)
+            line = f"  {name:<22} CPI {stats['cpi']:5.2f}  {rate:10,.0f} cycles/s"
+            if 'dcache' in stats:
+                dcache = stats['dcache']
+                line += (f"  hit rate {dcache['hit_rate']:6.1%}, {dcache['evictions']:5d} evictions, "
+                         f"{dcache['writebacks']:5d} writebacks")
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Decode Benchmark
+Measures PipelinedCPU cycles/sec on a straight-line program
+(kept under the 4096-word reach of the 12-bit PC)
+"""
+
+import time
+
+from core import PipelinedCPU, Assembler
+from .programs import mixed_program
+
+
+def run(size=3500, repeat=5):
+    """Return the best cycles/sec over 'repeat' full program runs"""
+    instructions = Assembler().assemble(mixed_program(size))
+    cpu = PipelinedCPU()
+    best = 0.0
+
+    for _ in range(repeat):
+        cpu.load_program(instructions)
+        start = time.perf_counter()
+        while not cpu.is_program_complete():
+            cpu.step()
+        elapsed = time.perf_counter() - start
+        best = max(best, cpu.cycle / elapsed)
+
+    return best
+
+
+def main():
+    print(f"PipelinedCPU.step: {run():,.0f} cycles/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Functional Engine Benchmark
+Checks FunctionalCPU against PipelinedCPU on examples/*.asm, then
+compares instructions/sec of both engines
+"""
+
+import glob
+import os
+import time
+
+from core import PipelinedCPU, FunctionalCPU, Assembler
+from .programs import mixed_program
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', 'examples')
+
+
+def run_pipelined(cpu, max_cycles=1000000):
+    """Run a loaded program to completion on PipelinedCPU"""
+    while not cpu.is_program_complete() and cpu.cycle < max_cycles:
+        cpu.step()
+    return cpu
+
+
+def run_functional(cpu, max_instructions=1000000):
+    """Run a loaded program to completion on FunctionalCPU"""
+    cpu.run(max_instructions)
+    return cpu
+
+
+ENGINES = (
+    ('PipelinedCPU', PipelinedCPU, run_pipelined),
+    ('FunctionalCPU', FunctionalCPU, run_functional),
+)
+
+
+def load(cpu_class, instructions):
+    """Create a CPU and load a program into it"""
+    cpu = cpu_class()
+    cpu.load_program(instructions)
+    return cpu
+
+
+def check_examples():
+    """Assert both engines reach the same final state on every example"""
+    assembler = Assembler()
+    paths = sorted(glob.glob(os.path.join(EXAMPLES_DIR, '*.asm')))
+
+    for path in paths:
+        with open(path) as f:
+            instructions = assembler.assemble(f.read())
+
+        pipelined = run_pipelined(load(PipelinedCPU, instructions))
+        functional = run_functional(load(FunctionalCPU, instructions))
+
+        name = os.path.basename(path)
+        assert functional.registers == pipelined.registers, f"{name}: registers differ"
+        assert list(functional.memory) == list(pipelined.memory), f"{name}: memory differs"
+        assert (functional.get_stats()['instructions'] ==
+                pipelined.get_stats()['instructions']), f"{name}: instruction count differs"
+
+    return len(paths)
+
+
+def measure(size=3500, repeat=5):
+    """Return the best instructions/sec of each engine"""
+    instructions = Assembler().assemble(mixed_program(size))
+    results = {}
+
+    for name, cpu_class, runner in ENGINES:
+        best = 0.0
+        for _ in range(repeat):
+            cpu = load(cpu_class, instructions)
+            start = time.perf_counter()
+            runner(cpu)
+            elapsed = time.perf_counter() - start
+            best = max(best, cpu.get_stats()['instructions'] / elapsed)
+        results[name] = best
+
+    return results
+
+
+def main():
+    print(f"Differential check: {check_examples()} example(s) match")
+
+    results = measure()
+    for name, rate in results.items():
+        print(f"{name}: {rate:,.0f} instructions/sec")
+    print(f"Speedup: {results['FunctionalCPU'] / results['PipelinedCPU']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Instruction Cache Benchmark
+CPI breakdown of a looped program whose body outgrows the instruction
+cache, and the simulation speed cost of the cache model
+"""
+
+import time
+
+from core import PipelinedCPU, Assembler
+from core.cache import CacheConfig
+
+from .programs import ALU_OPS
+
+CONFIGS = {
+    'none': None,
+    'direct 64w/4': CacheConfig(size=64, block_size=4),
+    'direct 256w/8': CacheConfig(size=256, block_size=8),
+    '2-way lru 256w/8': CacheConfig(size=256, block_size=8, associativity=2),
+    'direct 256w/2': CacheConfig(size=256, block_size=2, miss_penalty=4),
+}
+
+BODY_SIZES = (32, 128, 512)
+
+
+def looped_kernel(body, iterations=32):
+    """
+    Run a 'body'-instruction loop 'iterations' times (hazard-free)
+
+    The loop closes with J, so the body is not limited by the branch
+    offset range.
+    """
+    lines = [
+        "ADDI r3, r0, 1",
+        f"ADDI r1, r0, {iterations}",
+        "NOP",
+        "NOP",
+        "loop:",
+    ]
+    for i in range(body):
+        # Each op only depends on its predecessor (covered by forwarding)
+        lines.append(f"{ALU_OPS[i % len(ALU_OPS)]} r5, r5, r1")
+    lines += [
+        "SUB r1, r1, r3",
+        "NOP",
+        "NOP",
+        "BEQ r1, r0, done",
+        "J loop",
+        "done:",
+        "SW r5, 0(r0)",
+    ]
+    return '\n'.join(lines)
+
+
+def run(instructions, config):
+    """Run to completion; return (stats, cycles per second)"""
+    cpu = PipelinedCPU()
+    cpu.enable_instruction_cache(config)
+    cpu.load_program(instructions)
+
+    step = cpu.step
+    is_complete = cpu.is_program_complete
+    start = time.perf_counter()
+    while not is_complete():
+        step()
+    elapsed = time.perf_counter() - start
+    return cpu.get_stats(), cpu.cycle / elapsed
+
+
+def main():
+    assembler = Assembler()
+    for body in BODY_SIZES:
+        instructions = assembler.assemble(looped_kernel(body))
+        print(f"{body}-instruction loop body:")
+        for name, config in CONFIGS.items():
+            stats, rate = run(instructions, config)
+            count = stats['instructions']
+            fetch = stats['icache']['stall_cycles'] if 'icache' in stats else 0
+            line = (f"  {name:<18} CPI {stats['cpi']:5.2f} = 1 + load-use "
+                    f"{stats['stalls'] / count:4.2f} + fetch {fetch / count:4.2f} + other "
+                    f"{stats['cpi'] - 1 - (stats['stalls'] + fetch) / count:4.2f}"
+                    f"  {rate:10,.0f} cycles/s")
+            if 'icache' in stats:
+                line += f"  hit rate {stats['icache']['hit_rate']:6.1%}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
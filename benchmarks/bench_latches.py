@@ -0,0 +1,55 @@
+"""
+Pipeline Latch Benchmark
+Measures per-cycle allocation in PipelinedCPU.step (transient heap
+growth traced with tracemalloc) alongside cycles/sec
+"""
+
+import time
+import tracemalloc
+
+from core import PipelinedCPU, Assembler
+from .programs import mixed_program
+
+
+def _looping_cpu(size):
+    """CPU running a synthetic program that jumps back to 0 forever"""
+    cpu = PipelinedCPU()
+    cpu.load_program(Assembler().assemble(mixed_program(size) + "\nJ 0"))
+    return cpu
+
+
+def measure(cycles=100000, size=3000):
+    """Return allocation and throughput figures"""
+    cpu = _looping_cpu(size)
+    for _ in range(1000):  # Warm up
+        cpu.step()
+
+    start = time.perf_counter()
+    for _ in range(cycles):
+        cpu.step()
+    elapsed = time.perf_counter() - start
+
+    # Heap growth inside each step, sampled cycle by cycle
+    samples = cycles // 10
+    grown = 0
+    tracemalloc.start()
+    for _ in range(samples):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        cpu.step()
+        grown += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    return {
+        'cycles_per_sec': cycles / elapsed,
+        'bytes_allocated_per_cycle': grown / samples,
+    }
+
+
+def main():
+    for key, value in measure().items():
+        print(f"{key}: {value:,.1f}")
+
+
+if __name__ == "__main__":
+    main()
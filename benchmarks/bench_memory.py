@@ -0,0 +1,68 @@
+"""
+Data Memory Benchmark
+Bulk load/dump of a full 64K-word data memory, compared with word-by-word
+copies through a Python list
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from core import FunctionalCPU
+from core.memory import (MAX_MEMORY_SIZE, load_binary, dump_binary,
+                         load_hex, dump_hex, to_numpy)
+
+
+def timed(func, repeat=5):
+    """Best wall time of 'repeat' calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(size=MAX_MEMORY_SIZE, seed=0):
+    """Return {operation: seconds} for one full-memory transfer each"""
+    rng = random.Random(seed)
+    words = [rng.randrange(1 << 16) for _ in range(size)]
+
+    cpu = FunctionalCPU(size)
+    cpu.memory[:] = type(cpu.memory)('H', words)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bin_path = os.path.join(tmp, 'data.bin')
+        hex_path = os.path.join(tmp, 'data.hex')
+
+        results['dump binary'] = timed(lambda: dump_binary(cpu.memory, bin_path))
+        results['load binary'] = timed(lambda: load_binary(cpu.memory, bin_path))
+        results['dump hex'] = timed(lambda: dump_hex(cpu.memory, hex_path))
+        results['load hex'] = timed(lambda: load_hex(cpu.memory, hex_path))
+        assert cpu.memory.tolist() == words, "round trip changed memory"
+
+    def list_copy():
+        memory = [0] * size
+        for i, word in enumerate(words):
+            memory[i] = word
+    results['word-by-word list copy'] = timed(list_copy)
+
+    try:
+        view = to_numpy(cpu.memory)
+        results['numpy view'] = timed(lambda: to_numpy(cpu.memory))
+        assert int(view.sum()) == sum(words)
+    except ImportError:
+        pass
+
+    return results
+
+
+def main():
+    for name, seconds in measure().items():
+        print(f"{name:>24}: {seconds * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
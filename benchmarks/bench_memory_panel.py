@@ -0,0 +1,62 @@
+"""
+Memory Panel Benchmark
+Times MemoryPanel.update per simulated step for growing program and data
+memory sizes (needs a display; skipped otherwise)
+"""
+
+import sys
+import time
+
+from core import PipelinedCPU, Assembler
+from .programs import mixed_program
+
+SIZES = (100, 1000, 4000)
+MEMORY_SIZES = (64, 4096, 65536)
+
+
+def measure(root, steps=200):
+    """Return mean milliseconds per refresh for each (program, memory) size"""
+    from gui import MemoryPanel
+
+    assembler = Assembler()
+    results = {}
+
+    for size, memory_size in zip(SIZES, MEMORY_SIZES):
+        cpu = PipelinedCPU(memory_size=memory_size)
+        cpu.load_program(assembler.assemble(mixed_program(size))[:size])
+        panel = MemoryPanel(root, cpu, assembler)
+        panel.update()  # Sets the views up once per program
+        root.update_idletasks()
+
+        elapsed = 0.0
+        for _ in range(steps):
+            cpu.step()
+            start = time.perf_counter()
+            panel.update()
+            root.update_idletasks()
+            elapsed += time.perf_counter() - start
+
+        results[size, memory_size] = elapsed / steps * 1000
+        panel.destroy()
+
+    return results
+
+
+def main():
+    import tkinter as tk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Skipped: no display ({e})")
+        return 0
+
+    root.withdraw()
+    for (size, memory_size), ms in measure(root).items():
+        print(f"{size:5d} instructions, {memory_size:5d} data words: {ms:6.3f} ms per refresh")
+    root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
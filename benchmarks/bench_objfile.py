@@ -0,0 +1,79 @@
+"""
+Object File Benchmark
+Time to get a large program into a CPU from source text versus from a
+saved object file, and batch runs with a cold and a warm object cache
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from core import PipelinedCPU, Assembler
+from core.objfile import ObjectFile
+from core.runner import BatchRunner
+from .programs import labelled_program, mixed_program
+
+
+def best_time(func, repeat=5):
+    """Best wall time of 'repeat' calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_load(size=100000):
+    """Return (seconds from source, seconds from object file, file bytes)"""
+    source = labelled_program(size)
+    cpu = PipelinedCPU(memory_size=1 << 16)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'program.mobj')
+        Assembler().assemble_object(source).save(path)
+
+        from_source = best_time(lambda: cpu.load_program(Assembler().assemble(source)))
+        expected = cpu.instr_mem
+        from_object = best_time(lambda: cpu.load_program(ObjectFile.load(path)))
+        assert cpu.instr_mem == expected, "object file load changed the program"
+
+        return from_source, from_object, os.path.getsize(path)
+
+
+def measure_cache(files=200, size=2000):
+    """Return (seconds with a cold cache, seconds with a warm cache)"""
+    tmp = tempfile.mkdtemp()
+    try:
+        paths = []
+        for seed in range(files):
+            path = os.path.join(tmp, f'prog{seed}.asm')
+            with open(path, 'w') as f:
+                f.write(mixed_program(size, seed))
+            paths.append(path)
+
+        cache_dir = os.path.join(tmp, 'cache')
+        timings = []
+        for _ in range(2):
+            runner = BatchRunner(engine='functional', cache_dir=cache_dir)
+            start = time.perf_counter()
+            for path in paths:
+                runner.run_file(path)
+            timings.append(time.perf_counter() - start)
+        return tuple(timings)
+    finally:
+        shutil.rmtree(tmp)
+
+
+def main():
+    from_source, from_object, size = measure_load()
+    print(f"Load 100k-line program: from source {from_source * 1000:.1f} ms, "
+          f"from object file {from_object * 1000:.1f} ms ({size:,} bytes)")
+
+    cold, warm = measure_cache()
+    print(f"Batch of 200 files: cold cache {cold * 1000:.1f} ms, warm cache {warm * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Opcode Latency Benchmark
+Times PipelinedCPU._execute_stage for each opcode in isolation
+"""
+
+import time
+
+from core import PipelinedCPU
+from core.isa import OPCODES, decode
+
+
+def _time_opcode(opcode, iterations):
+    """Nanoseconds per EX stage call for one opcode"""
+    # rs=r1, rt=r2, rd=r3 (imm=24)
+    word = (opcode << 12) | (1 << 9) | (2 << 6) | (3 << 3)
+    cpu = PipelinedCPU()
+    cpu.load_program([word])
+    cpu.ID_EX.valid = True
+    cpu.ID_EX.pc = 0
+    cpu.ID_EX.inst = decode(word)
+    execute = cpu._execute_stage
+    ex_mem = cpu.EX_MEM
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        ex_mem.valid = False  # Keep the previous result from forwarding
+        execute()
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1e9
+
+
+def measure(iterations=100000, rounds=5):
+    """Return the best nanoseconds per EX stage call for every opcode"""
+    results = {name: float('inf') for name in OPCODES}
+
+    # Interleave opcodes across rounds so machine noise hits all of them
+    for _ in range(rounds):
+        for name, opcode in OPCODES.items():
+            results[name] = min(results[name], _time_opcode(opcode, iterations))
+
+    return results
+
+
+def main():
+    results = measure()
+    for name, ns in results.items():
+        print(f"{name:5s} {ns:7.1f} ns")
+    print(f"max/min: {max(results.values()) / min(results.values()):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Panel Refresh Benchmark
+Times MainWindow.update_display per simulated step with each notebook tab
+selected, for growing program sizes (needs a display; skipped otherwise)
+"""
+
+import sys
+import time
+
+from core import PipelinedCPU, Assembler
+from .programs import mixed_program
+
+SIZES = (100, 1000, 10000)
+
+
+def measure(root, steps=200):
+    """Return {(tab text, size): mean milliseconds per step and refresh}"""
+    from gui import MainWindow
+
+    assembler = Assembler()
+    results = {}
+
+    for size in SIZES:
+        cpu = PipelinedCPU()
+        window = MainWindow(root, cpu, assembler)
+        cpu.load_program(assembler.assemble(mixed_program(size) + "\nJ 0"))
+
+        for tab in window.notebook.tabs():
+            window.notebook.select(tab)
+            window.update_display()  # Catch the tab up before timing
+            root.update_idletasks()
+
+            elapsed = 0.0
+            for _ in range(steps):
+                cpu.step()
+                start = time.perf_counter()
+                window.update_display()
+                root.update_idletasks()
+                elapsed += time.perf_counter() - start
+
+            results[window.notebook.tab(tab, 'text'), size] = elapsed / steps * 1000
+
+        for child in root.winfo_children():
+            child.destroy()
+
+    return results
+
+
+def main():
+    import tkinter as tk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Skipped: no display ({e})")
+        return 0
+
+    root.withdraw()
+    for (tab, size), ms in measure(root).items():
+        print(f"{tab:<24} {size:6d} instructions: {ms:6.3f} ms per step")
+    root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
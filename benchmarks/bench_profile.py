@@ -0,0 +1,51 @@
+"""
+Profiling Overhead Benchmark
+Cycles/sec of PipelinedCPU with and without per-PC profiling, and a
+check that the per-PC counters add up to the global statistics
+"""
+
+import time
+
+from core import PipelinedCPU, Assembler
+from .programs import mixed_program
+
+
+def measure(cycles=100000, rounds=7, size=3000):
+    """Return best cycles/sec with profiling off and on"""
+    instructions = Assembler().assemble(mixed_program(size) + "\nJ 0")
+    cpus = {}
+    for enabled in (False, True):
+        cpu = PipelinedCPU()
+        cpu.load_program(instructions)
+        cpu.enable_profiling(enabled)
+        cpus[enabled] = cpu
+
+    # Interleave rounds so both configurations see the same machine noise
+    best = {False: 0.0, True: 0.0}
+    for _ in range(rounds):
+        for enabled, cpu in cpus.items():
+            step = cpu.step
+            start = time.perf_counter()
+            for _ in range(cycles):
+                step()
+            best[enabled] = max(best[enabled], cycles / (time.perf_counter() - start))
+
+    cpu = cpus[True]
+    profile = cpu.profile
+    assert sum(profile.stalls) == cpu.total_stalls, "stall counts differ"
+    assert sum(profile.flushes) == cpu.total_flushes, "flush counts differ"
+    assert sum(profile.forwards) == cpu.get_stats()['forwards'], \
+        "forward counts differ"
+
+    return best[False], best[True]
+
+
+def main():
+    disabled, enabled = measure()
+    print(f"Profiling off: {disabled:,.0f} cycles/sec")
+    print(f"Profiling on:  {enabled:,.0f} cycles/sec")
+    print(f"Overhead: {(1 - enabled / disabled) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Seek Benchmark
+Random "go to cycle" latency with automatic checkpoints, compared with
+replaying the program from cycle 0
+"""
+
+import random
+import time
+
+from core import PipelinedCPU, Assembler
+from .programs import loop_program
+
+
+def reference_states(instructions, cycles):
+    """Snapshots taken by plain stepping at the given cycles"""
+    cpu = PipelinedCPU()
+    cpu.load_program(instructions)
+    states = {}
+    for cycle in sorted(cycles):
+        while cpu.cycle < cycle:
+            cpu.step()
+        states[cycle] = cpu.snapshot()
+    return states
+
+
+def measure(interval=1000, seeks=50, seed=0):
+    """Return (total cycles, seconds per seek with checkpoints, seconds per replay)"""
+    instructions = Assembler().assemble(loop_program(outer=20, inner=63, body=4))
+
+    cpu = PipelinedCPU()
+    cpu.load_program(instructions)
+    cpu.enable_checkpoints(interval)
+    while not cpu.is_program_complete():
+        cpu.step()
+    total = cpu.cycle
+
+    rng = random.Random(seed)
+    targets = [rng.randrange(total) for _ in range(seeks)]
+    expected = reference_states(instructions, targets)
+
+    start = time.perf_counter()
+    for target in targets:
+        cpu.seek(target)
+    seek_time = (time.perf_counter() - start) / seeks
+
+    for target in targets:
+        cpu.seek(target)
+        assert cpu.snapshot() == expected[target], f"state differs at cycle {target}"
+
+    # Without checkpoints every seek replays from the start
+    replay = PipelinedCPU()
+    start = time.perf_counter()
+    for target in targets[:5]:
+        replay.load_program(instructions)
+        while replay.cycle < target:
+            replay.step()
+    replay_time = (time.perf_counter() - start) / 5
+
+    return total, seek_time, replay_time, len(cpu.snapshot()), len(cpu.checkpoints)
+
+
+def main():
+    total, seek_time, replay_time, size, count = measure()
+    print(f"Program length: {total:,} cycles")
+    print(f"Snapshot size: {size} bytes, {count} checkpoints")
+    print(f"Seek with checkpoints: {seek_time * 1000:.2f} ms")
+    print(f"Replay from cycle 0:   {replay_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Startup Benchmark
+Uses python -X importtime to measure the import cost of the headless
+entry points and to check that none of them loads Tk or the GUI
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Modules imported in a fresh interpreter, one per run
+ENTRY_POINTS = {
+    'import core': 'core',
+    'import main': 'main',
+    'python -m core (CLI module)': 'core.__main__',
+}
+
+GUI_MODULES = ('tkinter', '_tkinter', 'gui')
+
+# Headless startup budget for 'import core'
+BUDGET_MS = 50.0
+
+
+def import_profile(module):
+    """
+    Import a module under -X importtime
+
+    Returns:
+        (cumulative import time of the module in ms,
+         set of top-level package names imported along the way)
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    cumulative_ms = 0.0
+    packages = set()
+
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <indented module>"
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        packages.add(name.split('.')[0])
+        if name == module:
+            cumulative_ms = int(cumulative_us) / 1000
+
+    return cumulative_ms, packages
+
+
+def wall_time(args, repeat=5):
+    """Best wall-clock time in ms to run a fresh interpreter"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, capture_output=True, check=True)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main():
+    failed = False
+
+    for label, module in ENTRY_POINTS.items():
+        total_ms, packages = import_profile(module)
+        gui_loaded = sorted(set(GUI_MODULES) & packages)
+        failed |= bool(gui_loaded)
+        note = f"  GUI MODULES LOADED: {', '.join(gui_loaded)}" if gui_loaded else ""
+        print(f"{label:30s} {total_ms:7.1f} ms{note}")
+
+        if module == 'core' and total_ms > BUDGET_MS:
+            failed = True
+            print(f"{'':30s} over the {BUDGET_MS:.0f} ms budget")
+
+    example = os.path.join('examples', 'simple_addition.asm')
+    print(f"{'python main.py run (wall)':30s} {wall_time(['main.py', 'run', example]):7.1f} ms")
+    print(f"{'python -c pass (wall)':30s} {wall_time(['-c', 'pass']):7.1f} ms")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
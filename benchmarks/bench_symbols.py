@@ -0,0 +1,64 @@
+"""
+Symbol Index Benchmark
+Source-line lookup per step through the assembler's PC -> line index,
+compared with rescanning the source text (the old highlight method)
+"""
+
+import time
+
+from core import Assembler
+from .programs import mixed_program
+
+SIZES = (100, 1000, 10000)
+
+
+def commented_source(size):
+    """Program with a comment line and a blank line every 10 instructions"""
+    lines = []
+    for i, line in enumerate(mixed_program(size).split('\n')):
+        if not i % 10:
+            lines += [f"# block {i // 10}", ""]
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def rescan_line(source, pc):
+    """Line of the pc-th code line, found by scanning the whole source"""
+    code_lines = []
+    for i, line in enumerate(source.split('\n'), 1):
+        if line.split('#')[0].strip():
+            code_lines.append(i)
+    return code_lines[pc] if pc < len(code_lines) else None
+
+
+def measure(size, lookups=200):
+    """Return (microseconds per rescan lookup, per index lookup)"""
+    source = commented_source(size)
+    assembler = Assembler()
+    instructions = assembler.assemble(source)
+    pcs = [(i * 7919) % len(instructions) for i in range(lookups)]
+
+    for pc in pcs[:20]:
+        assert assembler.symbols.line_for_pc(pc) == rescan_line(source, pc)
+
+    start = time.perf_counter()
+    for pc in pcs:
+        rescan_line(source, pc)
+    rescan = (time.perf_counter() - start) / lookups
+
+    start = time.perf_counter()
+    for pc in pcs:
+        assembler.symbols.line_for_pc(pc)
+    index = (time.perf_counter() - start) / lookups
+
+    return rescan * 1e6, index * 1e6
+
+
+def main():
+    for size in SIZES:
+        rescan, index = measure(size)
+        print(f"{size:>6} instructions: rescan {rescan:10.1f} us, index {index:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
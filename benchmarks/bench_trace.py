@@ -0,0 +1,69 @@
+"""
+Trace Recorder Benchmark
+Cycles/sec with tracing disabled and enabled, trace size per cycle and
+random-access read speed through the memory-mapped reader
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from core import PipelinedCPU, Assembler
+from core.trace import TraceWriter, TraceReader
+from .programs import mixed_program
+
+
+def _run(cpu, cycles):
+    """Return seconds taken to step 'cycles' cycles"""
+    step = cpu.step
+    start = time.perf_counter()
+    for _ in range(cycles):
+        step()
+    return time.perf_counter() - start
+
+
+def measure(cycles=200000, size=3000, lookups=10000):
+    """Return throughput and trace size figures"""
+    instructions = Assembler().assemble(mixed_program(size) + "\nJ 0")
+    cpu = PipelinedCPU()
+    cpu.load_program(instructions)
+    disabled = _run(cpu, cycles)
+
+    fd, path = tempfile.mkstemp(suffix='.trace')
+    os.close(fd)
+    try:
+        cpu.load_program(instructions)
+        with TraceWriter(path) as tracer:
+            cpu.set_tracer(tracer)
+            enabled = _run(cpu, cycles)
+            cpu.set_tracer(None)
+        trace_bytes = os.path.getsize(path)
+
+        rng = random.Random(0)
+        with TraceReader(path) as trace:
+            assert len(trace) == cycles, "record count differs from cycle count"
+            targets = [rng.randint(1, cycles) for _ in range(lookups)]
+            start = time.perf_counter()
+            for cycle in targets:
+                trace.at_cycle(cycle)
+            lookup = (time.perf_counter() - start) / lookups
+            assert trace.at_cycle(cycles).cycle == cycles
+    finally:
+        os.remove(path)
+
+    return {
+        'cycles_per_sec_disabled': cycles / disabled,
+        'cycles_per_sec_enabled': cycles / enabled,
+        'trace_bytes_per_cycle': trace_bytes / cycles,
+        'lookup_us': lookup * 1e6,
+    }
+
+
+def main():
+    for key, value in measure().items():
+        print(f"{key}: {value:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
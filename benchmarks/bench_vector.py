@@ -0,0 +1,133 @@
+"""
+Vector Engine Benchmark
+Checks every VectorCPU lane against FunctionalCPU from the same initial
+state, then compares one VectorCPU with N separate PipelinedCPU runs
+"""
+
+import glob
+import os
+import random
+import time
+from array import array
+
+from core import PipelinedCPU, FunctionalCPU, Assembler
+from core.vector import VectorCPU
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', 'examples')
+
+# Sums memory words mem[2..n+1] where n = mem[0] differs per lane, so
+# lanes leave the loop at different times (hazard-free, see README)
+SWEEP_PROGRAM = """
+LW r1, 0(r0)
+ADDI r3, r0, 1
+NOP
+NOP
+LW r4, 1(r1)
+NOP
+NOP
+ADD r5, r5, r4
+SUB r1, r1, r3
+NOP
+NOP
+BNE r1, r0, -8
+SW r5, 0(r0)
+"""
+
+
+def initial_states(lanes, seed=0):
+    """Random (registers, memory) per lane; mem[0] is a loop count of 1-60"""
+    rng = random.Random(seed)
+    states = []
+    for _ in range(lanes):
+        registers = [0] + [rng.randrange(1 << 16) for _ in range(7)]
+        memory = [rng.randrange(1 << 16) for _ in range(64)]
+        memory[0] = rng.randint(1, 60)
+        states.append((registers, memory))
+    return states
+
+
+def load_vector(instructions, states):
+    """Create a VectorCPU with one lane per initial state"""
+    cpu = VectorCPU(len(states))
+    cpu.load_program(instructions)
+    for lane, (registers, memory) in enumerate(states):
+        cpu.registers[lane] = registers
+        cpu.memory[lane] = memory
+    return cpu
+
+
+def load_scalar(cpu_class, instructions, state):
+    """Create a scalar CPU loaded with a program and an initial state"""
+    cpu = cpu_class()
+    cpu.load_program(instructions)
+    cpu.registers[:] = state[0]
+    cpu.memory[:] = array('H', state[1])
+    return cpu
+
+
+def check(instructions, states):
+    """Assert each lane ends in the FunctionalCPU state"""
+    vector = load_vector(instructions, states)
+    vector.run()
+    for lane, state in enumerate(states):
+        functional = load_scalar(FunctionalCPU, instructions, state)
+        functional.run()
+        result = vector.get_lane(lane)
+        assert result['registers'] == functional.registers, f"lane {lane}: registers differ"
+        assert result['memory'] == functional.memory.tolist(), f"lane {lane}: memory differs"
+        assert result['pc'] == functional.pc, f"lane {lane}: pc differs"
+        assert result['stats'] == functional.get_stats(), f"lane {lane}: stats differ"
+
+
+def check_examples(lanes=16):
+    """Differential check on examples/*.asm and the sweep program"""
+    assembler = Assembler()
+    sources = []
+    for path in sorted(glob.glob(os.path.join(EXAMPLES_DIR, '*.asm'))):
+        with open(path) as f:
+            sources.append(f.read())
+    sources.append(SWEEP_PROGRAM)
+
+    for seed, source in enumerate(sources):
+        check(assembler.assemble(source), initial_states(lanes, seed))
+    return len(sources)
+
+
+def measure(lanes=256):
+    """Return (seconds for one VectorCPU, seconds for N PipelinedCPUs, N FunctionalCPUs)"""
+    instructions = Assembler().assemble(SWEEP_PROGRAM)
+    states = initial_states(lanes)
+
+    vector = load_vector(instructions, states)
+    start = time.perf_counter()
+    vector.run()
+    vector_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for state in states:
+        cpu = load_scalar(PipelinedCPU, instructions, state)
+        while not cpu.is_program_complete():
+            cpu.step()
+    pipelined_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for state in states:
+        load_scalar(FunctionalCPU, instructions, state).run()
+    functional_time = time.perf_counter() - start
+
+    return vector_time, pipelined_time, functional_time
+
+
+def main():
+    print(f"Differential check: {check_examples()} program(s) match on every lane")
+
+    for lanes in (16, 256, 4096):
+        vector_time, pipelined_time, functional_time = measure(lanes)
+        print(f"{lanes:>5} lanes: VectorCPU {vector_time * 1000:8.1f} ms, "
+              f"{lanes} x PipelinedCPU {pipelined_time * 1000:8.1f} ms "
+              f"({pipelined_time / vector_time:.1f}x), "
+              f"{lanes} x FunctionalCPU {functional_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Synthetic Program Generators
+Assembly sources of arbitrary size for the benchmarks
+"""
+
+import random
+
+ALU_OPS = ['ADD', 'SUB', 'AND', 'OR', 'SLT']
+IMM_OPS = ['ADDI', 'ANDI', 'ORI']
+
+
+def mixed_program(size, seed=0):
+    """
+    Generate a straight-line program with a realistic instruction mix
+
+    Args:
+        size: Number of instructions (before load padding)
+        seed: Random seed
+
+    Returns:
+        Assembly source string
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        kind = rng.random()
+        rd, rs, rt = (rng.randint(1, 7) for _ in range(3))
+        if kind < 0.4:
+            lines.append(f"{rng.choice(ALU_OPS)} r{rd}, r{rs}, r{rt}")
+        elif kind < 0.7:
+            lines.append(f"{rng.choice(IMM_OPS)} r{rd}, r{rs}, {rng.randint(0, 63)}")
+        elif kind < 0.8:
+            # Keep loads hazard free, as the README recommends
+            lines.append(f"LW r{rd}, {rng.randint(0, 31)}(r0)")
+            lines.append("NOP")
+        elif kind < 0.9:
+            lines.append(f"SW r{rd}, {rng.randint(0, 31)}(r0)")
+        else:
+            lines.append("NOP")
+    return '\n'.join(lines)
+
+
+def loop_program(outer=63, inner=63, body=4):
+    """
+    Generate a nested counted loop (hazard-free, see README)
+
+    Args:
+        outer: Outer loop iterations (1-63)
+        inner: Inner loop iterations (1-63)
+        body: ALU instructions in the inner loop body
+
+    Returns:
+        Assembly source string
+    """
+    lines = [
+        f"ADDI r4, r0, {outer}",   # r4 = outer counter
+        "ADDI r3, r0, 1",          # r3 = 1 (decrement)
+        "NOP",
+        "NOP",
+        f"ADDI r1, r0, {inner}",   # outer: r1 = inner counter
+        "NOP",
+        "NOP",
+    ]
+    inner_start = len(lines)
+    for i in range(body):
+        # Each op only depends on its predecessor (covered by forwarding)
+        lines.append(f"{ALU_OPS[i % len(ALU_OPS)]} r5, r5, r1")
+    lines += [
+        "SUB r1, r1, r3",
+        "NOP",
+        "NOP",
+    ]
+    lines.append(f"BNE r1, r0, {inner_start - len(lines) - 1}")
+    lines += [
+        "SUB r4, r4, r3",
+        "NOP",
+        "NOP",
+    ]
+    lines.append(f"BNE r4, r0, {inner_start - 3 - len(lines) - 1}")
+    lines.append("SW r5, 0(r0)")
+    return '\n'.join(lines)
+
+
+def forwarding_program(size, seed=0):
+    """
+    Generate a straight-line program where every instruction reads the
+    result of the one before it (each operand is forwarded from EX/MEM)
+
+    Args:
+        size: Number of instructions
+        seed: Random seed
+
+    Returns:
+        Assembly source string
+    """
+    rng = random.Random(seed)
+    lines = []
+    previous = 1
+    for _ in range(size):
+        rd, other = rng.randint(1, 7), rng.randint(1, 7)
+        if rng.random() < 0.7:
+            lines.append(f"{rng.choice(ALU_OPS)} r{rd}, r{previous}, r{other}")
+        else:
+            lines.append(f"{rng.choice(IMM_OPS)} r{rd}, r{previous}, {rng.randint(0, 63)}")
+        previous = rd
+    return '\n'.join(lines)
+
+
+def labelled_program(size, seed=0, block=20):
+    """
+    Generate a mixed program split into labelled blocks, each ending in
+    branches to its own label and to the next block (any size, since
+    only PC-relative targets are used)
+
+    Args:
+        size: Number of instructions (approximately)
+        seed: Random seed
+        block: Instructions per labelled block (at most 30)
+
+    Returns:
+        Assembly source string
+    """
+    body = mixed_program(size, seed).split('\n')
+    lines = []
+    for number, start in enumerate(range(0, len(body), block)):
+        lines.append(f"block{number}:")
+        lines += body[start:start + block]
+        lines.append(f"BEQ r0, r1, block{number}   # not taken unless r1 == 0")
+        lines.append(f"BNE r0, r0, block{number + 1}")
+    lines.append(f"block{len(range(0, len(body), block))}: NOP")
+    return '\n'.join(lines)
+
+
+def alu_program(size, seed=0):
+    """
+    Generate a straight-line program of register and immediate ALU
+    operations only (no memory access, no control flow)
+
+    Args:
+        size: Number of instructions
+        seed: Random seed
+
+    Returns:
+        Assembly source string
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        rd, rs, rt = (rng.randint(1, 7) for _ in range(3))
+        if rng.random() < 0.6:
+            lines.append(f"{rng.choice(ALU_OPS)} r{rd}, r{rs}, r{rt}")
+        else:
+            lines.append(f"{rng.choice(IMM_OPS)} r{rd}, r{rs}, {rng.randint(0, 63)}")
+    return '\n'.join(lines)
+
+
+def load_use_program(size, seed=0):
+    """
+    Generate a program where every load is used by the next instruction,
+    so each LW costs a load-use stall
+
+    Args:
+        size: Number of instructions (rounded to load/use pairs)
+        seed: Random seed
+
+    Returns:
+        Assembly source string
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size // 2):
+        rt, rd, other = (rng.randint(1, 7) for _ in range(3))
+        lines.append(f"LW r{rt}, {rng.randint(0, 31)}(r0)")
+        lines.append(f"{rng.choice(ALU_OPS)} r{rd}, r{rt}, r{other}")
+    return '\n'.join(lines)
+
+
+def branch_program(size, seed=0):
+    """
+    Generate a program that is mostly branches: taken ones skip the next
+    instruction (one flush each), the others fall through
+
+    Args:
+        size: Number of instructions (approximately)
+        seed: Random seed
+
+    Returns:
+        Assembly source string
+    """
+    rng = random.Random(seed)
+    lines = []
+    while len(lines) < size:
+        if rng.random() < 0.5:
+            lines.append("BEQ r0, r0, 1")    # Taken: skips the ADDI
+        else:
+            lines.append("BNE r0, r0, 1")    # Not taken
+        lines.append(f"ADDI r{rng.randint(1, 7)}, r0, {rng.randint(0, 63)}")
+    return '\n'.join(lines)
@@ -0,0 +1,277 @@
+"""
+Benchmark Suite
+Core throughput metrics as JSON, checked against a stored baseline
+
+    python -m benchmarks.suite                    # run, compare with baseline.json
+    python -m benchmarks.suite --output run.json  # also save this run
+    python -m benchmarks.suite --update-baseline  # make this run the baseline
+
+The exit status is 1 when any metric is worse than the baseline by more
+than the threshold (25% by default), and also when there is no baseline
+to compare with, so a check that was never set up cannot pass. Baselines
+only mean something on the machine and Python they were recorded with,
+so baseline.json is not kept in the repository: record it there (on an
+otherwise idle machine, e.g. in CI from the target branch, see the
+README) and again after deliberate performance changes.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from core import PipelinedCPU, Assembler
+from .programs import (alu_program, load_use_program, branch_program,
+                       forwarding_program, mixed_program)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+
+# PipelinedCPU.step workloads: name -> program generator
+STEP_MIXES = {
+    'alu': alu_program,
+    'load_use': load_use_program,
+    'branch': branch_program,
+    'forwarding': forwarding_program,
+}
+
+PROGRAM_SIZES = (1000, 10000)
+ASSEMBLY_SIZES = (1000, 10000, 100000)
+
+# Metrics where a smaller value is better (all others: larger is better)
+LOWER_IS_BETTER = ('_ms',)
+
+
+def median_rate(func, units, repeat=5, min_time=1.0):
+    """
+    Median units/sec over 'repeat' samples
+
+    Each sample calls func (which processes 'units' units) until at
+    least min_time seconds have passed. The median of long samples is
+    not thrown off by one lucky or unlucky sample, as the best or the
+    mean would be. The garbage collector is paused while timing, as in
+    timeit.
+    """
+    rates = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            calls = 0
+            start = time.perf_counter()
+            while True:
+                func()
+                calls += 1
+                elapsed = time.perf_counter() - start
+                if elapsed >= min_time:
+                    break
+            rates.append(units * calls / elapsed)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return statistics.median(rates)
+
+
+def distinct_lines(source):
+    """Number every line with a comment, so no two lines are the same text"""
+    return '\n'.join(f"{line}  # {index}"
+                     for index, line in enumerate(source.split('\n')))
+
+
+def step_rates(cycles):
+    """Cycles/sec of PipelinedCPU.step for every mix and program size"""
+    assembler = Assembler()
+    metrics = {}
+
+    for mix, generator in STEP_MIXES.items():
+        for size in PROGRAM_SIZES:
+            # Jump back to 0 at the end so any cycle count can be run
+            cpu = PipelinedCPU()
+            cpu.load_program(assembler.assemble(generator(size) + "\nJ 0"))
+            step = cpu.step
+
+            def run():
+                for _ in range(cycles):
+                    step()
+
+            metrics[f'step.{mix}.{size}.cycles_per_sec'] = median_rate(run, cycles)
+    return metrics
+
+
+def assembly_rates():
+    """
+    Lines/sec of Assembler.assemble and words/sec of disassemble
+
+    Every line is distinct and each call uses a fresh Assembler, so the
+    line cache never hits and the rate is that of a first assembly.
+    """
+    metrics = {}
+    for size in ASSEMBLY_SIZES:
+        source = distinct_lines(mixed_program(size))
+        lines = source.count('\n') + 1
+        metrics[f'assemble.{size}.lines_per_sec'] = median_rate(
+            lambda: Assembler().assemble(source), lines)
+
+    assembler = Assembler()
+    words = assembler.assemble(mixed_program(ASSEMBLY_SIZES[-1]))
+    disassemble = assembler.disassemble
+    metrics['disassemble.words_per_sec'] = median_rate(
+        lambda: [disassemble(word) for word in words], len(words))
+    return metrics
+
+
+def display_costs(steps=50):
+    """Mean ms per MainWindow.update_display after a step (needs a display)"""
+    import tkinter as tk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return {}
+    root.withdraw()
+
+    from gui import MainWindow
+
+    metrics = {}
+    try:
+        for size in PROGRAM_SIZES:
+            cpu = PipelinedCPU()
+            assembler = Assembler()
+            window = MainWindow(root, cpu, assembler)
+            cpu.load_program(assembler.assemble(mixed_program(size) + "\nJ 0"))
+            window.update_display()  # First refresh builds the rows
+            root.update_idletasks()
+
+            elapsed = 0.0
+            for _ in range(steps):
+                cpu.step()
+                start = time.perf_counter()
+                window.update_display()
+                root.update_idletasks()
+                elapsed += time.perf_counter() - start
+            metrics[f'update_display.{size}.mean_ms'] = elapsed / steps * 1000
+
+            for child in root.winfo_children():
+                child.destroy()
+    finally:
+        root.destroy()
+    return metrics
+
+
+def run_suite(cycles=50000, gui=True):
+    """
+    Run every benchmark
+
+    Returns:
+        Result dict: 'metrics' (name -> value) and 'environment'
+    """
+    metrics = {}
+    metrics.update(step_rates(cycles))
+    metrics.update(assembly_rates())
+    if gui:
+        metrics.update(display_costs())
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'system': platform.system(),
+        },
+        'metrics': metrics,
+    }
+
+
+def compare(metrics, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare metrics with a baseline
+
+    Args:
+        metrics: Current metric values
+        baseline: Baseline metric values
+        threshold: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        List of (name, baseline, current, change, regressed) for metrics
+        present in both, change being the relative improvement
+    """
+    rows = []
+    for name in sorted(metrics.keys() & baseline.keys()):
+        old, new = baseline[name], metrics[name]
+        if name.endswith(LOWER_IS_BETTER):
+            change = (old - new) / old
+        else:
+            change = (new - old) / old
+        rows.append((name, old, new, change, change < -threshold))
+    return rows
+
+
+def _build_parser():
+    """Create the argument parser"""
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.suite',
+        description='Simulator benchmark suite with baseline regression check')
+    parser.add_argument('--baseline', default=BASELINE_PATH, metavar='FILE',
+                        help='Baseline JSON to compare against (default: benchmarks/baseline.json)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Allowed relative slowdown per metric (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--output', metavar='FILE', help='Also write this run as JSON')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Write this run to the baseline file instead of comparing')
+    parser.add_argument('--cycles', type=int, default=50000,
+                        help='Cycles per step measurement (default: 50000)')
+    parser.add_argument('--no-gui', action='store_true', help='Skip the display benchmarks')
+    return parser
+
+
+def _write_json(result, path):
+    """Write a result dict as JSON"""
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    """Run the suite, returning the exit status"""
+    args = _build_parser().parse_args(argv)
+    result = run_suite(cycles=args.cycles, gui=not args.no_gui)
+
+    if args.output:
+        _write_json(result, args.output)
+    if args.update_baseline:
+        _write_json(result, args.baseline)
+        print(f"Baseline written to {args.baseline} ({len(result['metrics'])} metrics)")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(json.dumps(result, indent=2, sort_keys=True))
+        print(f"FAILED: no baseline at {args.baseline}; run with --update-baseline to create one")
+        return 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    if baseline.get('environment') != result['environment']:
+        print(f"Warning: baseline was recorded on {baseline.get('environment')}, "
+              f"this run is {result['environment']}")
+    status = 0
+    for name, old, new, change, regressed in compare(result['metrics'], baseline['metrics'],
+                                                     args.threshold):
+        mark = 'REGRESSION' if regressed else ''
+        print(f"{name:<42} {old:14,.2f} -> {new:14,.2f} {change:+7.1%} {mark}")
+        if regressed:
+            status = 1
+
+    skipped = sorted(baseline['metrics'].keys() - result['metrics'].keys())
+    if skipped:
+        print(f"Not measured in this run: {', '.join(skipped)}")
+    print("FAILED: regressions beyond threshold" if status else "OK")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+pytest configuration: a conftest.py in the repository root puts the root
+on sys.path, so a bare `pytest` can import core, gui and benchmarks
+"""
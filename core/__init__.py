@@ -4,6 +4,8 @@ Backend components for CPU simulation
 """
 
 from .cpu import PipelinedCPU
+from .functional import FunctionalCPU
+from .blocks import BlockCachedCPU
 from .assembler import Assembler
 
-__all__ = ['PipelinedCPU', 'Assembler']
+__all__ = ['PipelinedCPU', 'FunctionalCPU', 'BlockCachedCPU', 'Assembler']
@@ -0,0 +1,166 @@
+"""
+MIPS 16-bit Simulator - Command Line Interface
+Headless entry point: python -m core run program.asm [...]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from .runner import run_batch, ENGINES, DEFAULT_MAX_CYCLES
+from .profile import COUNTERS
+from .memory import DEFAULT_MEMORY_SIZE, MAX_MEMORY_SIZE, new_memory, load_image
+from .assembler import Assembler
+from .objfile import OBJECT_SUFFIX
+from .cache import CacheConfig
+
+
+def _build_parser():
+    """Create the argument parser"""
+    parser = argparse.ArgumentParser(
+        prog='python -m core',
+        description='Headless 16-bit MIPS simulator')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser(
+        'run', help='Assemble and run .asm files, printing one JSON result per line')
+    run.add_argument('files', nargs='+', help=f'Assembly source or {OBJECT_SUFFIX} object files')
+    run.add_argument('--max-cycles', type=int, default=DEFAULT_MAX_CYCLES,
+                     help=f'Cycle cap per program (default: {DEFAULT_MAX_CYCLES})')
+    run.add_argument('--engine', choices=sorted(ENGINES), default='pipelined',
+                     help='Execution engine (default: pipelined)')
+    run.add_argument('-j', '--jobs', type=int, default=1,
+                     help='Worker processes, 0 for one per CPU (default: 1)')
+    run.add_argument('--unordered', action='store_true',
+                     help='Print results as they finish instead of in input order')
+    run.add_argument('--profile', type=int, default=0, metavar='N',
+                     help='Report the N hottest instructions per program (pipelined engine)')
+    run.add_argument('--profile-sort', choices=COUNTERS, default='executions',
+                     help='Profile counter to rank instructions by (default: executions)')
+    run.add_argument('--memory-size', type=int, default=DEFAULT_MEMORY_SIZE, metavar='WORDS',
+                     help=f'Data memory words, up to {MAX_MEMORY_SIZE} (default: {DEFAULT_MEMORY_SIZE})')
+    run.add_argument('--data', metavar='IMAGE',
+                     help='Data memory image loaded before each program (.hex/.txt as hex, else raw binary)')
+    run.add_argument('--cache-dir', metavar='DIR',
+                     help='Reuse assembled object files stored here, keyed by source hash')
+    run.add_argument('--dcache', metavar='SPEC',
+                     help='Model a data cache (pipelined engine), e.g. '
+                          '"size=256,block=4,ways=2,replacement=lru,write=back,penalty=10"')
+    run.add_argument('--icache', metavar='SPEC',
+                     help='Model an instruction cache (pipelined engine), same SPEC keys as --dcache '
+                          '(write is ignored)')
+
+    asm = commands.add_parser(
+        'asm', help=f'Assemble .asm files into {OBJECT_SUFFIX} object files')
+    asm.add_argument('files', nargs='+', help='Assembly source files')
+    asm.add_argument('-o', '--output', metavar='FILE',
+                     help=f'Object file (single input only; default: source name with {OBJECT_SUFFIX})')
+    asm.add_argument('--rom', metavar='HEX',
+                     help='Also write the instructions as a Logisim v2.0 raw image (single input only)')
+    asm.add_argument('--ram', metavar='HEX',
+                     help='Also write the .data segment as a Logisim v2.0 raw image (single input only)')
+    asm.add_argument('--strip', action='store_true',
+                     help='Leave out the symbol/line table and messages')
+
+    return parser
+
+
+def _assemble(parser, args):
+    """Run the asm command, returning the exit status"""
+    single = (args.output, args.rom, args.ram)
+    if len(args.files) > 1 and any(single):
+        parser.error('-o, --rom and --ram need a single input file')
+
+    assembler = Assembler()
+    status = 0
+
+    for path in args.files:
+        try:
+            with open(path) as f:
+                code_text = f.read()
+        except OSError as e:
+            sys.stderr.write(f"{path}: {e.strerror or e}\n")
+            status = 1
+            continue
+        program = assembler.assemble_object(code_text)
+        for message in program.messages:
+            sys.stderr.write(f"{path}: {message}\n")
+        if assembler.errors:
+            status = 1
+        if args.strip:
+            program.symbols = None
+
+        try:
+            program.save(args.output or os.path.splitext(path)[0] + OBJECT_SUFFIX)
+        except ValueError as e:
+            sys.stderr.write(f"{path}: {e}\n")
+            status = 1
+            continue
+        if args.rom:
+            program.save_logisim(args.rom, 'code')
+        if args.ram:
+            program.save_logisim(args.ram, 'data')
+
+    return status
+
+
+def _cache_config(parser, args, option):
+    """Parse the cache SPEC given for --<option>, or None when absent"""
+    spec = getattr(args, option)
+    if spec is None:
+        return None
+    if args.engine != 'pipelined':
+        parser.error(f'--{option} needs the pipelined engine')
+    try:
+        return CacheConfig.parse(spec)
+    except ValueError as e:
+        parser.error(f'--{option}: {e}')
+
+
+def _data_image(parser, args):
+    """Read and check the --data image once, or None when absent"""
+    if args.data is None:
+        return None
+    data = new_memory(args.memory_size)
+    try:
+        count = load_image(data, args.data)
+    except (OSError, ValueError) as e:
+        parser.error(f'--data: {e}')
+    del data[count:]
+    return data
+
+
+def main(argv=None):
+    """Run the command line interface, returning the exit status"""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'asm':
+        return _assemble(parser, args)
+
+    if args.profile and args.engine != 'pipelined':
+        parser.error('--profile needs the pipelined engine')
+    if not 1 <= args.memory_size <= MAX_MEMORY_SIZE:
+        parser.error(f'--memory-size must be between 1 and {MAX_MEMORY_SIZE}')
+    dcache = _cache_config(parser, args, 'dcache')
+    icache = _cache_config(parser, args, 'icache')
+    data = _data_image(parser, args)
+
+    results = run_batch(args.files, engine=args.engine, max_cycles=args.max_cycles,
+                        workers=args.jobs or None, ordered=not args.unordered,
+                        profile_top=args.profile, profile_sort=args.profile_sort,
+                        memory_size=args.memory_size, data=data,
+                        cache_dir=args.cache_dir, dcache=dcache, icache=icache)
+    status = 0
+
+    for result in results:
+        if 'error' in result:
+            status = 1
+        sys.stdout.write(json.dumps(result) + '\n')
+        sys.stdout.flush()
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
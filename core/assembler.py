@@ -3,125 +3,371 @@ MIPS 16-bit Assembler
 Converts assembly code to binary machine code
 """
 
+import re
+from array import array
+
+from .isa import OPCODES, OPCODE_NAMES, to_word
+
+NOP_WORD = OPCODES['NOP'] << 12
+
+# Label names: a letter, '_' or '.' followed by word characters or '.'
+LABEL_PATTERN = re.compile(r'[A-Za-z_.][\w.]*')
+
+# Source line (comment removed): leading "name:" labels, then the statement
+LINE_PATTERN = re.compile(r'\s*((?:[A-Za-z_.][\w.]*\s*:\s*)*)(.*)')
+
+# Statement tokens are separated by whitespace, commas and parentheses
+TOKEN_PATTERN = re.compile(r'[^\s,()]+')
+
+# Most distinct source lines remembered (the cache is emptied when full)
+LINE_CACHE_SIZE = 1 << 16
+
+# Parsed line kinds
+_BLANK, _SECTION, _WORDS, _DIRECTIVE, _INSTRUCTION = range(5)
+
+# Message severities
+ERROR = 'error'
+WARNING = 'warning'
+
+
+class UnknownLabelError(ValueError):
+    """An operand names a label that is not defined"""
+
+
+class AssemblerMessage:
+    """
+    Error or warning reported for one source line
+    
+    Attributes:
+        line: Source line number (1-based)
+        severity: ERROR or WARNING
+        text: Message without the line prefix
+    """
+    
+    __slots__ = ('line', 'severity', 'text')
+    
+    def __init__(self, line, severity, text):
+        self.line = line
+        self.severity = severity
+        self.text = text
+    
+    def __str__(self):
+        return f"{self.severity.capitalize()} at line {self.line}: {self.text}"
+    
+    def __repr__(self):
+        return f"AssemblerMessage({self.line}, {self.severity!r}, {self.text!r})"
+
+
+class SymbolTable:
+    """
+    Symbols of the last assembled program
+    
+    Attributes:
+        labels: Label name -> address (instruction address for labels in
+                .text, data memory word address for labels in .data)
+        data_labels: Names of the labels defined in .data
+        pc_lines: array('I') of the source line (1-based) of each
+                  instruction, indexed by PC
+    """
+    
+    def __init__(self):
+        self.labels = {}
+        self.data_labels = set()
+        self.pc_lines = array('I')
+    
+    def line_for_pc(self, pc):
+        """Source line of the instruction at 'pc' (None if out of range)"""
+        if 0 <= pc < len(self.pc_lines):
+            return self.pc_lines[pc]
+        return None
+    
+    def __contains__(self, name):
+        return name in self.labels
+    
+    def __getitem__(self, name):
+        return self.labels[name]
+
+
 class Assembler:
     """
     Assembler for 16-bit MIPS
     Supports all 16 instructions with 16-bit encoding
+    
+    Two passes: the first assigns addresses to labels, the second encodes
+    instructions, so branches and jumps may name labels defined later.
+    BEQ/BNE labels become PC-relative offsets, J/JAL labels absolute
+    addresses. A '.data' section holds '.word' values that preload data
+    memory from address 0; '.text' switches back to code.
+    
+    After assemble(), 'symbols' holds the SymbolTable, 'data' the data
+    memory image (array('H')) and 'messages' the AssemblerMessage list
+    of that program.
+    
+    Each distinct line is tokenized and, unless it names a label, encoded
+    only once per Assembler; re-assembling an edited source only does
+    that work for the lines that changed. The line cache holds at most
+    LINE_CACHE_SIZE lines and is emptied when a new line does not fit,
+    so memory stays bounded however many sources an Assembler sees.
     """
     
     def __init__(self):
-        self.OPCODES = {
-            'ADD':  0b0000,
-            'SUB':  0b0001,
-            'AND':  0b0010,
-            'OR':   0b0011,
-            'SLT':  0b0100,
-            'ADDI': 0b0101,
-            'ANDI': 0b0110,
-            'ORI':  0b0111,
-            'LW':   0b1000,
-            'SW':   0b1001,
-            'BEQ':  0b1010,
-            'BNE':  0b1011,
-            'J':    0b1100,
-            'JAL':  0b1101,
-            'JR':   0b1110,
-            'NOP':  0b1111
-        }
+        self.OPCODES = dict(OPCODES)
+        self.symbols = SymbolTable()
+        self.data = array('H')
+        self.messages = []
+        self._line_cache = {}  # Line text -> (labels, kind, first token, payload)
+    
+    @property
+    def errors(self):
+        """Error messages of the last assembled program"""
+        return [message for message in self.messages if message.severity == ERROR]
     
     def assemble(self, code_text):
         """
         Assemble assembly code to binary instructions
         
+        Bad lines become NOPs and are reported in 'messages'.
+        
         Args:
             code_text: String containing assembly code
             
         Returns:
-            List of binary instruction strings
+            array('H') of 16-bit instruction words
         """
-        instructions = []
-        lines = code_text.strip().split('\n')
+        self.symbols = symbols = SymbolTable()
+        self.data = data = array('H')
+        self.messages = messages = []
+        labels = symbols.labels
+        pc_lines = symbols.pc_lines
         
-        for line_num, line in enumerate(lines, 1):
-            try:
-                # Remove comments
-                line = line.split('#')[0].strip()
-                
-                if not line:
-                    continue
-                
-                # Tokenize
-                parts = line.replace(',', ' ').replace('(', ' ').replace(')', ' ').split()
-                
-                if not parts:
+        cache = self._line_cache
+        parse_line = self._parse_line
+        
+        # Pass 1: split off labels and directives, assign addresses
+        statements = []  # (line_num, kind, payload)
+        section = '.text'
+        pc = 0
+        data_size = 0
+        
+        for line_num, line in enumerate(code_text.split('\n'), 1):
+            parsed = cache.get(line)
+            if parsed is None:
+                if len(cache) >= LINE_CACHE_SIZE:
+                    cache.clear()
+                parsed = cache[line] = parse_line(line)
+            line_labels, kind, first, payload = parsed
+            
+            for name in line_labels:
+                if name in labels:
+                    messages.append(AssemblerMessage(line_num, ERROR, f"Duplicate label '{name}'"))
+                elif section == '.data':
+                    labels[name] = data_size
+                    symbols.data_labels.add(name)
+                else:
+                    labels[name] = pc
+            
+            if kind == _INSTRUCTION and section == '.text':
+                pc_lines.append(line_num)
+                pc += 1
+            elif kind == _BLANK:
+                continue
+            elif kind == _SECTION:
+                section = payload
+                continue
+            elif section == '.data':
+                if kind != _WORDS:
+                    messages.append(AssemblerMessage(
+                        line_num, ERROR, f"Only .word is allowed in .data, got '{first}'"))
                     continue
-                
-                op_name = parts[0].upper()
-                
-                # Check if valid instruction
-                if op_name not in self.OPCODES:
-                    print(f"Warning: Unknown instruction '{op_name}' at line {line_num}, inserting NOP")
-                    instructions.append("1111000000000000")
+                data_size += len(payload[1])
+            else:
+                messages.append(AssemblerMessage(
+                    line_num, ERROR, f"Unknown directive '{first}' in .text"))
+                continue
+            
+            statements.append((line_num, kind, payload))
+        
+        # Pass 2: encode with every label known
+        instructions = array('H')
+        
+        for line_num, kind, payload in statements:
+            if kind == _WORDS:
+                values, tokens = payload
+                if values is not None:
+                    data.extend(values)
                     continue
-                
-                # Encode instruction
-                binary = self._encode_instruction(op_name, parts[1:])
-                instructions.append(binary)
-                
-            except Exception as e:
-                print(f"Error at line {line_num}: {e}")
-                instructions.append("1111000000000000")  # NOP on error
+                for token in tokens:
+                    try:
+                        data.append(self._parse_value(token, labels) & 0xFFFF)
+                    except ValueError as e:
+                        messages.append(AssemblerMessage(line_num, ERROR, str(e)))
+                        data.append(0)
+                continue
+            
+            word, problem, op_name, operands = payload
+            if word is None:
+                # Names a label: encode now that every address is known
+                try:
+                    word = self._encode_instruction(op_name, operands, len(instructions), labels)
+                except Exception as e:
+                    messages.append(AssemblerMessage(line_num, ERROR, str(e)))
+                    word = NOP_WORD  # NOP on error
+            elif problem is not None:
+                messages.append(AssemblerMessage(line_num, *problem))
+            instructions.append(word)
         
         return instructions
     
-    def _encode_instruction(self, op_name, operands):
-        """Encode a single instruction"""
+    def assemble_object(self, code_text):
+        """
+        Assemble code into an object file image
+        
+        Args:
+            code_text: String containing assembly code
+            
+        Returns:
+            core.objfile.ObjectFile with the instructions, .data image,
+            symbol table and messages
+        """
+        from .objfile import ObjectFile
+        instructions = self.assemble(code_text)
+        return ObjectFile(instructions, self.data, self.symbols, self.messages)
+    
+    def _parse_line(self, line):
+        """
+        Tokenize one source line and encode it if it names no label
+        
+        Returns:
+            (labels, kind, first token, payload). The payload of a .word
+            line is (values or None, tokens); that of an instruction is
+            (word or None, (severity, text) or None, op_name, operands),
+            the word being None when it depends on label addresses.
+        """
+        match = LINE_PATTERN.match(line.split('#', 1)[0])
+        labels = tuple(LABEL_PATTERN.findall(match.group(1)))
+        tokens = TOKEN_PATTERN.findall(match.group(2))
+        
+        if not tokens:
+            return labels, _BLANK, None, None
+        
+        first = tokens[0]
+        directive = first.lower()
+        if directive in ('.text', '.data'):
+            return labels, _SECTION, first, directive
+        if directive == '.word':
+            try:
+                values = tuple(self._parse_value(token, {}) & 0xFFFF for token in tokens[1:])
+            except ValueError:
+                values = None
+            return labels, _WORDS, first, (values, tokens[1:])
+        if directive.startswith('.'):
+            return labels, _DIRECTIVE, first, None
+        
+        op_name = first.upper()
+        operands = tokens[1:]
+        
+        # Check if valid instruction
+        if op_name not in self.OPCODES:
+            problem = (WARNING, f"Unknown instruction '{op_name}', inserting NOP")
+            return labels, _INSTRUCTION, first, (NOP_WORD, problem, op_name, operands)
+        
+        # Encode instruction (numeric operands do not depend on the pc)
+        try:
+            word, problem = self._encode_instruction(op_name, operands, 0, {}), None
+        except UnknownLabelError:
+            word, problem = None, None
+        except Exception as e:
+            word, problem = NOP_WORD, (ERROR, str(e))  # NOP on error
+        return labels, _INSTRUCTION, first, (word, problem, op_name, operands)
+    
+    def _encode_instruction(self, op_name, operands, pc=0, labels=None):
+        """Encode a single instruction at address 'pc' into a 16-bit word"""
         opcode = self.OPCODES[op_name]
+        if labels is None:
+            labels = self.symbols.labels
         
         # R-Type: ADD, SUB, AND, OR, SLT
         if op_name in ['ADD', 'SUB', 'AND', 'OR', 'SLT']:
             rd = self._parse_register(operands[0])
             rs = self._parse_register(operands[1])
             rt = self._parse_register(operands[2])
-            return f"{opcode:04b}{rs:03b}{rt:03b}{rd:03b}000"
+            return (opcode << 12) | (rs << 9) | (rt << 6) | (rd << 3)
         
         # R-Type: JR
         elif op_name == 'JR':
             rs = self._parse_register(operands[0])
-            return f"{opcode:04b}{rs:03b}000000000"
+            return (opcode << 12) | (rs << 9)
         
         # I-Type: ADDI, ANDI, ORI
         elif op_name in ['ADDI', 'ANDI', 'ORI']:
             rt = self._parse_register(operands[0])
             rs = self._parse_register(operands[1])
-            imm = int(operands[2]) & 0x3F  # 6-bit immediate
-            return f"{opcode:04b}{rs:03b}{rt:03b}{imm:06b}"
+            imm = self._parse_immediate(operands[2], labels)  # 6-bit immediate
+            return (opcode << 12) | (rs << 9) | (rt << 6) | imm
         
         # I-Type: LW, SW (format: LW rt, imm(rs))
         elif op_name in ['LW', 'SW']:
             rt = self._parse_register(operands[0])
-            imm = int(operands[1]) & 0x3F  # 6-bit immediate
+            imm = self._parse_immediate(operands[1], labels)  # 6-bit immediate
             rs = self._parse_register(operands[2]) if len(operands) > 2 else 0
-            return f"{opcode:04b}{rs:03b}{rt:03b}{imm:06b}"
+            return (opcode << 12) | (rs << 9) | (rt << 6) | imm
         
         # I-Type: BEQ, BNE
         elif op_name in ['BEQ', 'BNE']:
             rs = self._parse_register(operands[0])
             rt = self._parse_register(operands[1])
-            imm = int(operands[2]) & 0x3F  # 6-bit immediate (offset)
-            return f"{opcode:04b}{rs:03b}{rt:03b}{imm:06b}"
+            imm = self._parse_offset(operands[2], pc, labels)  # 6-bit offset
+            return (opcode << 12) | (rs << 9) | (rt << 6) | imm
         
         # J-Type: J, JAL
         elif op_name in ['J', 'JAL']:
-            addr = int(operands[0]) & 0xFFF  # 12-bit address
-            return f"{opcode:04b}{addr:012b}"
+            addr = self._parse_address(operands[0], labels)  # 12-bit address
+            return (opcode << 12) | addr
         
         # NOP
         elif op_name == 'NOP':
-            return "1111000000000000"
+            return NOP_WORD
         
         else:
-            return "1111000000000000"  # Default NOP
+            return NOP_WORD  # Default NOP
+    
+    def _parse_value(self, token, labels):
+        """Value of a label or an integer literal (decimal, 0x.., 0b..)"""
+        if token in labels:
+            return labels[token]
+        try:
+            return int(token)
+        except ValueError:
+            pass
+        try:
+            return int(token, 0)
+        except ValueError:
+            if LABEL_PATTERN.fullmatch(token):
+                raise UnknownLabelError(f"Unknown label '{token}'") from None
+            raise ValueError(f"Invalid number '{token}'") from None
+    
+    def _parse_immediate(self, token, labels):
+        """6-bit immediate; a label must be a data address in 0-63"""
+        value = self._parse_value(token, labels)
+        if token in labels and not 0 <= value <= 0x3F:
+            raise ValueError(f"Address of '{token}' ({value}) does not fit in 6 bits")
+        return value & 0x3F
+    
+    def _parse_offset(self, token, pc, labels):
+        """Branch offset: a label becomes target - (pc + 1)"""
+        if token not in labels:
+            return self._parse_value(token, labels) & 0x3F
+        offset = labels[token] - (pc + 1)
+        if not -32 <= offset <= 31:
+            raise ValueError(f"Branch to '{token}' is out of range (offset {offset})")
+        return offset & 0x3F
+    
+    def _parse_address(self, token, labels):
+        """12-bit jump address"""
+        value = self._parse_value(token, labels)
+        if token in labels and not 0 <= value <= 0xFFF:
+            raise ValueError(f"Address of '{token}' ({value}) does not fit in 12 bits")
+        return value & 0xFFF
     
     def _parse_register(self, reg_str):
         """Parse register string (r1, R1, $1) to register number"""
@@ -135,34 +381,35 @@ class Assembler:
         
         return int(reg_str) & 0x7  # 3-bit register (0-7)
     
-    def disassemble(self, binary_str):
+    def disassemble(self, word):
         """
         Disassemble binary instruction to assembly
         
         Args:
-            binary_str: 16-bit binary string
+            word: 16-bit instruction word (binary strings are also accepted)
             
         Returns:
             Assembly instruction string
         """
-        if len(binary_str) != 16:
-            return "INVALID"
+        if isinstance(word, str):
+            if len(word) != 16:
+                return "INVALID"
+            word = to_word(word)
         
-        opcode = int(binary_str[0:4], 2)
+        opcode = word >> 12
         
         # Find instruction name
-        opcode_names = {v: k for k, v in self.OPCODES.items()}
-        op_name = opcode_names.get(opcode, "UNKNOWN")
+        op_name = OPCODE_NAMES.get(opcode, "UNKNOWN")
         
         if op_name == 'NOP':
             return "NOP"
         
         # Decode fields
-        rs = int(binary_str[4:7], 2)
-        rt = int(binary_str[7:10], 2)
-        rd = int(binary_str[10:13], 2)
-        imm = int(binary_str[10:16], 2)
-        addr = int(binary_str[4:16], 2)
+        rs = (word >> 9) & 0x7
+        rt = (word >> 6) & 0x7
+        rd = (word >> 3) & 0x7
+        imm = word & 0x3F
+        addr = word & 0xFFF
         
         # R-Type
         if op_name in ['ADD', 'SUB', 'AND', 'OR', 'SLT']:
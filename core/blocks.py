@@ -0,0 +1,201 @@
+"""
+MIPS 16-bit Block-Cached CPU
+Functional execution with a basic-block translation cache
+"""
+
+from .functional import FunctionalCPU, bind
+from .memory import DEFAULT_MEMORY_SIZE
+from .isa import (OP_SLT, OP_LW, OP_SW, OP_BEQ, OP_BNE, OP_J, OP_JAL, OP_JR,
+                  CONTROL_OPS, ALU_TEMPLATES, decode, to_word)
+
+# Longest straight-line run compiled into one block
+MAX_BLOCK_LENGTH = 64
+
+
+class Block:
+    """
+    Compiled basic block
+
+    Attributes:
+        start: PC of the first instruction
+        length: Number of instructions (all execute on every entry)
+        function: function(registers, memory) -> next pc
+        links: Successor blocks by next pc, filled in as exits are taken
+    """
+
+    __slots__ = ('start', 'length', 'function', 'links')
+
+    def __init__(self, start, length, function):
+        self.start = start
+        self.length = length
+        self.function = function
+        self.links = {}
+
+
+class BlockCachedCPU(FunctionalCPU):
+    """
+    Functional CPU that translates basic blocks into Python functions
+
+    Straight-line runs of pre-decoded instructions ending in a branch or
+    jump are compiled (via compile()) on first execution, cached by start
+    PC and chained to their successors, so hot loops run without
+    per-instruction dispatch. Architectural results match FunctionalCPU.
+    """
+
+    def __init__(self, memory_size=DEFAULT_MEMORY_SIZE):
+        super().__init__(memory_size)
+        self.blocks = {}  # Translation cache by start PC
+
+    def load_program(self, instructions):
+        """Load program, dropping every cached block"""
+        super().load_program(instructions)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop all compiled blocks (call after changing instruction memory)"""
+        self.blocks = {}
+
+    def write_instruction(self, address, instr):
+        """
+        Replace one instruction and invalidate the translation cache
+
+        Args:
+            address: Instruction memory address
+            instr: New 16-bit instruction word
+        """
+        self.instr_mem[address] = to_word(instr)
+        self.decoded[address] = decode(self.instr_mem[address])
+        self.ops[address] = bind(self.decoded[address], address)
+        self.invalidate()
+
+    def run(self, max_instructions=None):
+        """
+        Execute until the program completes
+
+        Args:
+            max_instructions: Optional cap on instructions executed
+
+        Returns:
+            Number of instructions executed
+        """
+        if max_instructions is None:
+            max_instructions = 1 << 62
+
+        regs = self.registers
+        mem = self.memory
+        end = len(self.decoded)
+        pc = self.pc
+        count = 0
+
+        if pc < end:
+            block = self._get_block(pc)
+
+            while count + block.length <= max_instructions:
+                pc = block.function(regs, mem)
+                count += block.length
+                if pc >= end:
+                    break
+
+                # Follow the chained exit, translating it on first use
+                successor = block.links.get(pc)
+                if successor is None:
+                    successor = block.links[pc] = self._get_block(pc)
+                block = successor
+
+        self.pc = pc
+        self.total_instructions += count
+
+        # Finish a partial block one instruction at a time
+        if count < max_instructions and pc < end:
+            count += super().run(max_instructions - count)
+
+        return count
+
+    def _get_block(self, pc):
+        """Return the cached block starting at pc, compiling it if needed"""
+        block = self.blocks.get(pc)
+        if block is None:
+            block = self.blocks[pc] = self._compile_block(pc)
+        return block
+
+    def _compile_block(self, start):
+        """Translate the basic block starting at 'start'"""
+        decoded = self.decoded
+        end = len(decoded)
+
+        # Find the block extent: up to and including the first control instruction
+        pc = start
+        while True:
+            inst = decoded[pc]
+            if (inst.opcode in CONTROL_OPS or pc + 1 >= end or
+                    pc + 1 > 0xFFF or pc + 1 - start >= MAX_BLOCK_LENGTH):
+                break
+            pc += 1
+        last = pc
+
+        body = []
+        used = set()
+        written = set()
+        exit_expr = str((last + 1) & 0xFFF)
+
+        def reg(number):
+            if number == 0:
+                return "0"
+            used.add(number)
+            return f"r{number}"
+
+        def write(number, expr):
+            if number:
+                used.add(number)
+                written.add(number)
+                body.append(f"r{number} = {expr}")
+
+        for pc in range(start, last + 1):
+            inst = decoded[pc]
+            opcode = inst.opcode
+
+            if opcode in ALU_TEMPLATES:
+                b = reg(inst.rt) if opcode <= OP_SLT else str(inst.imm)
+                write(inst.dest, ALU_TEMPLATES[opcode].format(a=reg(inst.rs), b=b))
+
+            elif opcode == OP_LW:
+                if inst.dest:
+                    write(inst.dest, self._address_expr(reg(inst.rs), inst.simm, 'mem[{}]'))
+
+            elif opcode == OP_SW:
+                body.append(self._address_expr(reg(inst.rs), inst.simm, 'mem[{}]') +
+                            f" = {reg(inst.rt)}")
+
+            elif opcode in (OP_BEQ, OP_BNE):
+                taken = (pc + 1 + inst.simm) & 0xFFF
+                compare = '==' if opcode == OP_BEQ else '!='
+                exit_expr = (f"{taken} if {reg(inst.rs)} {compare} {reg(inst.rt)} "
+                             f"else {(pc + 1) & 0xFFF}")
+
+            elif opcode == OP_J:
+                exit_expr = str(inst.addr)
+
+            elif opcode == OP_JAL:
+                write(7, str((pc + 1) & 0xFFF))
+                exit_expr = str(inst.addr)
+
+            elif opcode == OP_JR:
+                exit_expr = f"{reg(inst.rs)} & 0xFFF"
+
+        # Registers live in locals inside the block
+        lines = ["def block(regs, mem):"]
+        lines += [f"    r{n} = regs[{n}]" for n in sorted(used)]
+        lines += [f"    {line}" for line in body]
+        lines.append(f"    next_pc = {exit_expr}")
+        lines += [f"    regs[{n}] = r{n}" for n in sorted(written)]
+        lines.append("    return next_pc")
+
+        namespace = {}
+        exec(compile('\n'.join(lines), f"<block {start}-{last}>", 'exec'), namespace)
+        return Block(start, last - start + 1, namespace['block'])
+
+    def _address_expr(self, base, offset, template):
+        """Source for a data memory access at base + offset"""
+        if base == "0":
+            return template.format((offset & 0xFFFF) % self.memory_size)
+        return template.format(f"(({base} + {offset}) & 0xFFFF) % {self.memory_size}")
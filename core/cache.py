@@ -0,0 +1,312 @@
+"""
+MIPS 16-bit Cache Model
+Timing-only set-associative caches with array-backed tag stores
+"""
+
+import struct
+import sys
+from array import array
+
+REPLACEMENT_POLICIES = ('lru', 'fifo')
+WRITE_POLICIES = ('write-back', 'write-through')
+
+# Saved state: hits, misses, evictions, writebacks, stall cycles, clock,
+# stall cycles still to come, miss completing on the next access,
+# block of the previous access and its line
+STATE_STRUCT = struct.Struct('<6QI?iI')
+
+# Largest miss penalty (a write-back eviction waits for two transfers)
+MAX_MISS_PENALTY = 0xFFFF
+
+INVALID_TAG = -1
+
+
+def _is_power_of_two(value):
+    return value > 0 and not value & (value - 1)
+
+
+class CacheConfig:
+    """
+    Cache geometry and policies (sizes in 16-bit words)
+
+    Attributes:
+        size: Total capacity in words
+        block_size: Words per block
+        associativity: Ways per set (1 = direct-mapped)
+        replacement: 'lru' or 'fifo'
+        write_policy: 'write-back' (write-allocate, dirty blocks cost a
+                      second penalty when evicted) or 'write-through'
+                      (no-write-allocate, stores drain through a write
+                      buffer without stalling)
+        miss_penalty: Stall cycles per block transfer from memory (at most 65535)
+    """
+
+    # Spec keys accepted by parse() -> attribute
+    SPEC_KEYS = {
+        'size': 'size',
+        'block': 'block_size',
+        'ways': 'associativity',
+        'replacement': 'replacement',
+        'write': 'write_policy',
+        'penalty': 'miss_penalty',
+    }
+
+    def __init__(self, size=256, block_size=4, associativity=1,
+                 replacement='lru', write_policy='write-back', miss_penalty=10):
+        if not _is_power_of_two(block_size):
+            raise ValueError(f"Cache block size must be a power of two, got {block_size}")
+        if associativity < 1:
+            raise ValueError(f"Cache associativity must be at least 1, got {associativity}")
+        if size % (block_size * associativity):
+            raise ValueError(f"Cache size {size} is not a multiple of "
+                             f"block size x associativity ({block_size * associativity})")
+        if not _is_power_of_two(size // (block_size * associativity)):
+            raise ValueError("Cache set count (size / (block size x associativity)) "
+                             "must be a power of two")
+        if replacement not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy '{replacement}' "
+                             f"(choose from {', '.join(REPLACEMENT_POLICIES)})")
+        if write_policy not in WRITE_POLICIES:
+            raise ValueError(f"Unknown write policy '{write_policy}' "
+                             f"(choose from {', '.join(WRITE_POLICIES)})")
+        if not 0 <= miss_penalty <= MAX_MISS_PENALTY:
+            raise ValueError(f"Miss penalty must be between 0 and {MAX_MISS_PENALTY}, "
+                             f"got {miss_penalty}")
+
+        self.size = size
+        self.block_size = block_size
+        self.associativity = associativity
+        self.replacement = replacement
+        self.write_policy = write_policy
+        self.miss_penalty = miss_penalty
+
+    @property
+    def sets(self):
+        """Number of sets"""
+        return self.size // (self.block_size * self.associativity)
+
+    @classmethod
+    def parse(cls, spec):
+        """
+        Build a config from 'key=value' pairs separated by commas
+
+        Keys: size, block, ways, replacement (lru/fifo), write
+        (back/through) and penalty, e.g. "size=512,block=8,ways=2".
+        Missing keys keep their defaults.
+        """
+        options = {}
+        for item in filter(None, (part.strip() for part in spec.split(','))):
+            key, sep, value = item.partition('=')
+            key = key.strip()
+            value = value.strip()
+            if not sep or key not in cls.SPEC_KEYS:
+                raise ValueError(f"Bad cache option '{item}' "
+                                 f"(keys: {', '.join(cls.SPEC_KEYS)})")
+            name = cls.SPEC_KEYS[key]
+            if name == 'write_policy':
+                value = value if value.startswith('write-') else f'write-{value}'
+            elif name != 'replacement':
+                try:
+                    value = int(value, 0)
+                except ValueError:
+                    raise ValueError(f"Cache option '{key}' needs a number, got '{value}'") from None
+            options[name] = value
+        return cls(**options)
+
+    def __repr__(self):
+        return (f"CacheConfig(size={self.size}, block_size={self.block_size}, "
+                f"associativity={self.associativity}, replacement={self.replacement!r}, "
+                f"write_policy={self.write_policy!r}, miss_penalty={self.miss_penalty})")
+
+
+class Cache:
+    """
+    Set-associative cache timing model
+
+    Only tags are modelled: data always comes from the CPU's memory
+    array, the cache decides how many cycles an access costs. Tags,
+    replacement stamps and dirty bits are flat arrays indexed by
+    set * associativity + way, so a lookup is a shift, a mask and a
+    search of one set.
+
+    Counters:
+        hits, misses: Accesses found / not found in the cache
+        evictions: Valid blocks replaced on a miss
+        writebacks: Dirty blocks written back on eviction (write-back only)
+        stall_cycles: Pipeline cycles spent waiting for this cache
+                      (counted by stall())
+
+    Miss in progress (driven by the CPU):
+        wait: Stall cycles still to come for the access that missed
+        ready: The access that missed completes on the next cycle,
+               without another lookup
+
+    Consecutive accesses to the same block (sequential fetch, walking an
+    array) only count a hit: the block is still where the previous
+    access left it (last_block, in line last_way) and still the most
+    recently used line of its set, so no search or stamp update is
+    needed. The CPU's fetch stage makes that check inline.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.ways = config.associativity
+        self.offset_bits = config.block_size.bit_length() - 1
+        self.set_mask = config.sets - 1
+        self.set_bits = config.sets.bit_length() - 1
+        self.miss_penalty = config.miss_penalty
+        self.lru = config.replacement == 'lru'
+        self.write_back = config.write_policy == 'write-back'
+        self.reset()
+
+    def reset(self):
+        """Invalidate every block and clear the counters"""
+        lines = self.config.sets * self.ways
+        self.tags = array('i', [INVALID_TAG]) * lines
+        self.stamps = array('Q', bytes(8 * lines))  # Fill (FIFO) or use (LRU) order
+        self.dirty = bytearray(lines)
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+        self.stall_cycles = 0
+        self.wait = 0
+        self.ready = False
+        self.last_block = -1
+        self.last_way = 0
+
+    def access(self, address, write=False):
+        """
+        Look up a word address, updating tags and counters
+
+        Args:
+            address: Word address
+            write: True for a store
+
+        Returns:
+            Stall cycles the access costs (0 for a hit)
+        """
+        block = address >> self.offset_bits
+        if block == self.last_block:
+            self.hits += 1
+            if write and self.write_back:
+                self.dirty[self.last_way] = 1
+            return 0
+
+        ways = self.ways
+        base = (block & self.set_mask) * ways
+        tag = block >> self.set_bits
+        tags = self.tags
+        self.clock += 1
+
+        way = self._find(tag, base)
+        if way >= 0:
+            self.hits += 1
+            if self.lru:
+                self.stamps[way] = self.clock
+            if write and self.write_back:
+                self.dirty[way] = 1
+            self.last_block = block
+            self.last_way = way
+            return 0
+
+        self.misses += 1
+        if write and not self.write_back:
+            return 0  # No-write-allocate: the write buffer absorbs it
+
+        penalty = self.miss_penalty
+        way = self._find(INVALID_TAG, base)
+        if way < 0:
+            stamps = self.stamps[base:base + ways]
+            way = base + stamps.index(min(stamps))
+            self.evictions += 1
+            if self.dirty[way]:
+                self.writebacks += 1
+                penalty += self.miss_penalty
+
+        tags[way] = tag
+        self.stamps[way] = self.clock
+        self.dirty[way] = write and self.write_back
+        self.last_block = block
+        self.last_way = way
+        return penalty
+
+    @property
+    def pending(self):
+        """True while a miss is in progress or completes on the next access"""
+        return bool(self.wait or self.ready)
+
+    def stall(self):
+        """Count one stall cycle of the miss in progress"""
+        self.stall_cycles += 1
+        self.advance()
+
+    def advance(self):
+        """Let one cycle of the miss in progress pass without counting a stall"""
+        self.wait -= 1
+        if not self.wait:
+            self.ready = True
+
+    def cancel(self):
+        """Abandon the miss in progress (the block stays filled)"""
+        self.wait = 0
+        self.ready = False
+
+    def _find(self, tag, base):
+        """Index of the way in the set at 'base' holding tag, or -1"""
+        if self.ways == 1:
+            return base if self.tags[base] == tag else -1
+        try:
+            return base + self.tags[base:base + self.ways].index(tag)
+        except ValueError:
+            return -1
+
+    def get_stats(self):
+        """Counters and hit rate as a dict"""
+        accesses = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'writebacks': self.writebacks,
+            'stall_cycles': self.stall_cycles,
+            'hit_rate': self.hits / accesses if accesses else 0.0
+        }
+
+    @property
+    def state_size(self):
+        """Length of the bytes returned by snapshot()"""
+        lines = len(self.tags)
+        return STATE_STRUCT.size + 4 * lines + 8 * lines + lines
+
+    def snapshot(self):
+        """Tag store and counters as bytes (little-endian)"""
+        tags, stamps = self.tags, self.stamps
+        if sys.byteorder == 'big':
+            tags, stamps = array('i', tags), array('Q', stamps)
+            tags.byteswap()
+            stamps.byteswap()
+        return (STATE_STRUCT.pack(self.hits, self.misses, self.evictions,
+                                  self.writebacks, self.stall_cycles, self.clock,
+                                  self.wait, self.ready, self.last_block, self.last_way)
+                + tags.tobytes() + stamps.tobytes() + bytes(self.dirty))
+
+    def restore(self, state):
+        """Restore a state returned by snapshot() for the same configuration"""
+        if len(state) != self.state_size:
+            raise ValueError("Cache state does not match the cache configuration")
+        (self.hits, self.misses, self.evictions, self.writebacks,
+         self.stall_cycles, self.clock, self.wait, self.ready,
+         self.last_block, self.last_way) = STATE_STRUCT.unpack_from(state)
+
+        lines = len(self.tags)
+        offset = STATE_STRUCT.size
+        self.tags = array('i', state[offset:offset + 4 * lines])
+        offset += 4 * lines
+        self.stamps = array('Q', state[offset:offset + 8 * lines])
+        offset += 8 * lines
+        if sys.byteorder == 'big':
+            self.tags.byteswap()
+            self.stamps.byteswap()
+        self.dirty = bytearray(state[offset:])
@@ -0,0 +1,108 @@
+"""
+MIPS 16-bit Change Tracking
+Dirty sets telling displays which registers, memory words and latches changed
+"""
+
+# Pipeline registers, in pipeline order
+LATCH_NAMES = ('IF_ID', 'ID_EX', 'EX_MEM', 'MEM_WB')
+
+
+class ChangeSet:
+    """
+    State changed since a subscriber last cleared its set
+
+    Attributes:
+        registers: Register numbers written
+        memory: Data memory addresses written
+        latches: Names of the pipeline registers that may have changed
+        everything: True when the whole state must be redrawn (after a
+                    reset, program load or restore)
+    """
+
+    __slots__ = ('registers', 'memory', 'latches', 'everything')
+
+    def __init__(self):
+        self.registers = set()
+        self.memory = set()
+        self.latches = set()
+        self.everything = True  # Nothing has been drawn yet
+
+    def __bool__(self):
+        return bool(self.everything or self.registers or self.memory or self.latches)
+
+    def clear(self):
+        """Mark everything as drawn"""
+        self.registers.clear()
+        self.memory.clear()
+        self.latches.clear()
+        self.everything = False
+
+
+class ChangeTracker:
+    """
+    Change notifications collected by PipelinedCPU.step()
+
+    The CPU adds to one set of pending changes (a set.add per register
+    or memory write, a counter bump per cycle), so tracking costs almost
+    nothing while running. Subscribers (the GUI panels) each get their
+    own ChangeSet, filled from the pending changes when they call
+    collect(); a panel that is not refreshed (e.g. on a hidden tab)
+    keeps accumulating changes until it is.
+
+    Attributes:
+        version: Incremented on every cycle and every invalidate(); equal
+                 versions mean the state has not changed
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.registers = set()   # Pending changes, not yet handed out
+        self.memory = set()
+        self.everything = False
+        self._collected_version = 0
+        self._subscribers = []
+
+    def subscribe(self):
+        """
+        Register a new subscriber
+
+        Returns:
+            ChangeSet, initially marking everything as changed
+        """
+        changes = ChangeSet()
+        self._subscribers.append(changes)
+        return changes
+
+    def unsubscribe(self, changes):
+        """Stop filling a ChangeSet returned by subscribe()"""
+        self._subscribers.remove(changes)
+
+    def invalidate(self):
+        """Mark the whole state as changed"""
+        self.everything = True
+        self.version += 1
+
+    def collect(self, changes):
+        """
+        Hand the pending changes out to every subscriber
+
+        Args:
+            changes: The caller's ChangeSet
+
+        Returns:
+            The same ChangeSet, now holding everything changed since it
+            was last cleared
+        """
+        if self.version != self._collected_version:
+            # Every cycle shifts the pipeline, so all latches may differ
+            for subscriber in self._subscribers:
+                subscriber.registers |= self.registers
+                subscriber.memory |= self.memory
+                subscriber.latches.update(LATCH_NAMES)
+                if self.everything:
+                    subscriber.everything = True
+            self.registers.clear()
+            self.memory.clear()
+            self.everything = False
+            self._collected_version = self.version
+        return changes
@@ -3,6 +3,124 @@ MIPS 16-bit Pipelined CPU Core
 Main execution engine with 5-stage pipeline
 """
 
+import bisect
+import struct
+from array import array
+
+from .isa import (OPCODES, OP_LW, OP_SW, OP_J, OP_JAL, OP_JR, OP_NOP,
+                  R_TYPE_OPS, IMM_ALU_OPS, MEMORY_OPS, BRANCH_OPS,
+                  ALU_FUNCTIONS, BRANCH_CONDITIONS, decode, sign_extend, to_word)
+from .latches import IFIDLatch, IDEXLatch, EXMEMLatch, MEMWBLatch
+from .profile import PCProfile
+from .changes import ChangeTracker
+from .cache import Cache
+from .memory import (DEFAULT_MEMORY_SIZE, new_memory, clear_memory, load_words,
+                     words_to_bytes, words_from_bytes)
+from .objfile import ObjectFile
+from .events import (Hazard, ForwardSource, NO_FORWARDING,
+                     hazard_message, forwarding_message)
+
+
+# EX stage handlers: handler(cpu, ID_EX, rs_value, rt_value) -> ALU result
+
+def _ex_register(alu):
+    """R-type: rs op rt"""
+    def handler(cpu, ID_EX, rs_value, rt_value):
+        return alu(rs_value, rt_value)
+    return handler
+
+
+def _ex_immediate(alu):
+    """ADDI/ANDI/ORI: rs op imm (unsigned 0-63)"""
+    def handler(cpu, ID_EX, rs_value, rt_value):
+        return alu(rs_value, ID_EX.inst.imm)
+    return handler
+
+
+def _ex_address(alu):
+    """LW/SW: rs + sign-extended offset"""
+    def handler(cpu, ID_EX, rs_value, rt_value):
+        return alu(rs_value, ID_EX.inst.simm)
+    return handler
+
+
+def _ex_branch(condition):
+    """BEQ/BNE: PC-relative branch when the condition holds"""
+    def handler(cpu, ID_EX, rs_value, rt_value):
+        if condition(rs_value, rt_value):
+            cpu._take_branch((ID_EX.pc + 1 + ID_EX.inst.simm) & 0xFFF)
+        return 0
+    return handler
+
+
+def _ex_j(cpu, ID_EX, rs_value, rt_value):
+    cpu._take_branch(ID_EX.inst.addr & 0xFFF)
+    return 0
+
+
+def _ex_jal(cpu, ID_EX, rs_value, rt_value):
+    cpu.registers[7] = (ID_EX.pc + 1) & 0xFFF
+    if cpu.changes is not None:
+        cpu.changes.registers.add(7)
+    cpu._take_branch(ID_EX.inst.addr & 0xFFF)
+    return 0
+
+
+def _ex_jr(cpu, ID_EX, rs_value, rt_value):
+    cpu._take_branch(rs_value & 0xFFF)
+    return 0
+
+
+def _ex_nop(cpu, ID_EX, rs_value, rt_value):
+    return 0
+
+
+EX_HANDLERS = [None] * 16
+for _opcode in range(16):
+    if _opcode in R_TYPE_OPS:
+        EX_HANDLERS[_opcode] = _ex_register(ALU_FUNCTIONS[_opcode])
+    elif _opcode in IMM_ALU_OPS:
+        EX_HANDLERS[_opcode] = _ex_immediate(ALU_FUNCTIONS[_opcode])
+    elif _opcode in MEMORY_OPS:
+        EX_HANDLERS[_opcode] = _ex_address(ALU_FUNCTIONS[_opcode])
+    elif _opcode in BRANCH_OPS:
+        EX_HANDLERS[_opcode] = _ex_branch(BRANCH_CONDITIONS[_opcode])
+EX_HANDLERS[OP_J] = _ex_j
+EX_HANDLERS[OP_JAL] = _ex_jal
+EX_HANDLERS[OP_JR] = _ex_jr
+EX_HANDLERS[OP_NOP] = _ex_nop
+
+
+# Forwarding source codes as plain ints for the EX stage
+FORWARD_NONE = int(ForwardSource.NONE)
+FORWARD_EX_MEM = int(ForwardSource.EX_MEM)
+FORWARD_MEM_WB = int(ForwardSource.MEM_WB)
+FORWARD_WB = int(ForwardSource.WB)
+
+
+# Snapshot layout (little-endian), followed by the data memory words:
+# format version, statistics counters, pc, stall/flush flags, registers,
+# then the four pipeline latches. ID/EX stores only its pc; the decoded
+# instruction is looked up again on restore.
+SNAPSHOT_VERSION = 2
+SNAPSHOT_STRUCT = struct.Struct(
+    '<H'       # SNAPSHOT_VERSION
+    '8Q'       # cycle, total_cycles, instructions, stalls, flushes, forwards x3
+    'H??'      # pc, stall, flush
+    '8H'       # registers
+    '?HH'      # IF/ID: valid, pc, instr
+    '?HHHB'    # ID/EX: valid, pc, rs_value, rt_value, wb_forwards
+    '?HBHHB?'  # EX/MEM: valid, pc, opcode, alu_result, rt_value, rd, write_reg
+    '?HBBH?'   # MEM/WB: valid, pc, opcode, rd, write_data, write_reg
+    'I'        # number of data memory words
+)
+
+# Appended after the memory words when a data cache is enabled: the
+# cycle was a miss stall (followed by the cache's own state, then the
+# instruction cache's state when one is enabled)
+CACHE_STATE_STRUCT = struct.Struct('<?')
+
+
 class PipelinedCPU:
     """
     16-bit MIPS Pipelined CPU Implementation
@@ -15,22 +133,40 @@ class PipelinedCPU:
     5. WB (Write Back)
     """
     
-    def __init__(self):
+    # Instruction Set (Opcodes)
+    OPCODES = dict(OPCODES)
+    
+    # Reverse mapping for disassembly
+    OPCODE_NAMES = {v: k for k, v in OPCODES.items()}
+    
+    def __init__(self, memory_size=DEFAULT_MEMORY_SIZE):
+        # CPython keeps attribute access fast (shared-key instance dicts)
+        # only up to 30 instance attributes; step() slows down noticeably
+        # beyond that, so keep new state on helper objects where possible
+        
         # Hardware Components
         self.registers = [0] * 8  # R0-R7 (R0 always 0)
-        self.memory = [0] * 64    # 64 words of data memory
-        self.instr_mem = []       # Instruction memory
+        self.memory = new_memory(memory_size)  # 16-bit data words (array('H'))
+        self.memory_size = memory_size
+        self.instr_mem = array('H')  # Instruction memory (16-bit words)
+        self.decoded = []         # Pre-decoded instruction memory
         self.pc = 0               # Program counter
         
-        # Pipeline Registers
-        self.IF_ID = None
-        self.ID_EX = None
-        self.EX_MEM = None
-        self.MEM_WB = None
+        # Pipeline Registers (reused in place, 'valid' is False for a bubble)
+        self.IF_ID = IFIDLatch()
+        self.ID_EX = IDEXLatch()
+        self.EX_MEM = EXMEMLatch()
+        self.MEM_WB = MEMWBLatch()
         
         # Control Signals
         self.stall = False
         self.flush = False
+        self.mem_stall = False    # MEM waited for the data cache this cycle
+        
+        # Optional cache timing models (see enable_data_cache and
+        # enable_instruction_cache)
+        self.dcache = None
+        self.icache = None
         
         # Statistics
         self.cycle = 0
@@ -40,46 +176,37 @@ class PipelinedCPU:
         self.total_flushes = 0
         self.forwarding_ex_mem = 0
         self.forwarding_mem_wb = 0
+        self.forwarding_wb = 0
         
-        # Status Messages
-        self.hazard_msg = "No Hazard"
-        self.forwarding_msg = "No Forwarding"
-        
-        # Instruction Set (Opcodes)
-        self.OPCODES = {
-            'ADD':  0b0000,
-            'SUB':  0b0001,
-            'AND':  0b0010,
-            'OR':   0b0011,
-            'SLT':  0b0100,
-            'ADDI': 0b0101,
-            'ANDI': 0b0110,
-            'ORI':  0b0111,
-            'LW':   0b1000,
-            'SW':   0b1001,
-            'BEQ':  0b1010,
-            'BNE':  0b1011,
-            'J':    0b1100,
-            'JAL':  0b1101,
-            'JR':   0b1110,
-            'NOP':  0b1111
-        }
+        # Forwarding event of the cycle: (rs source, rt source, rs, rt)
+        self.forwarding = NO_FORWARDING
+        
+        # Optional per-cycle trace recorder (see core.trace)
+        self.tracer = None
+        
+        # Optional per-PC counters (see enable_profiling)
+        self.profile = None
+        
+        # Optional change notifications for displays (see enable_change_tracking)
+        self.changes = None
         
-        # Reverse mapping for disassembly
-        self.OPCODE_NAMES = {v: k for k, v in self.OPCODES.items()}
+        # Automatic checkpoints (cycle -> snapshot), disabled while interval is 0
+        self.checkpoint_interval = 0
+        self.checkpoints = {}
+        self._checkpoint_cycles = []  # Sorted keys of self.checkpoints
     
     def reset(self):
         """Reset CPU to initial state"""
         self.registers = [0] * 8
-        self.memory = [0] * 64
+        clear_memory(self.memory)  # In place, so memoryviews stay valid
         self.pc = 0
         self.cycle = 0
         
         # Clear pipeline
-        self.IF_ID = None
-        self.ID_EX = None
-        self.EX_MEM = None
-        self.MEM_WB = None
+        self.IF_ID.clear()
+        self.ID_EX.clear()
+        self.EX_MEM.clear()
+        self.MEM_WB.clear()
         
         # Reset statistics
         self.total_cycles = 0
@@ -88,350 +215,693 @@ class PipelinedCPU:
         self.total_flushes = 0
         self.forwarding_ex_mem = 0
         self.forwarding_mem_wb = 0
+        self.forwarding_wb = 0
         
-        self.hazard_msg = "No Hazard"
-        self.forwarding_msg = "No Forwarding"
+        self.stall = False
+        self.flush = False
+        self.mem_stall = False
+        if self.dcache is not None:
+            self.dcache.reset()
+        if self.icache is not None:
+            self.icache.reset()
+        self.forwarding = NO_FORWARDING
+        if self.tracer is not None:
+            self.tracer.attach(self)
+        if self.profile is not None:
+            self.profile.resize(len(self.instr_mem))
+        if self.changes is not None:
+            self.changes.invalidate()
+        
+        # Checkpoints belong to the previous run
+        self.checkpoints = {}
+        self._checkpoint_cycles = []
     
     def load_program(self, instructions):
-        """Load program into instruction memory"""
-        self.instr_mem = instructions.copy()
+        """
+        Load program into instruction memory and pre-decode it
+        
+        Args:
+            instructions: Sequence of 16-bit instruction words
+                          (binary strings are also accepted), or an
+                          ObjectFile whose data segment is preloaded too
+        """
+        if isinstance(instructions, ObjectFile):
+            program = instructions
+            self.instr_mem = array('H', program.instructions)
+        else:
+            program = None
+            self.instr_mem = array('H', [to_word(instr) for instr in instructions])
+        self.decoded = [decode(instr) for instr in self.instr_mem]
         self.reset()
+        if program is not None:
+            load_words(self.memory, program.data)
     
     def step(self):
         """Execute one clock cycle"""
+        if self.checkpoint_interval and not self.cycle % self.checkpoint_interval:
+            self._save_checkpoint()
+        
         self.cycle += 1
         self.total_cycles += 1
         
         # Reset per-cycle status
-        self.hazard_msg = "No Hazard"
-        self.forwarding_msg = "No Forwarding"
+        self.forwarding = NO_FORWARDING
         self.stall = False
         self.flush = False
+        self.mem_stall = False
         
-        # Check for load-use hazard
-        if self.detect_load_use_hazard():
+        # Data cache miss: everything before MEM waits; then load-use hazard
+        if self.dcache is not None and self._data_cache_stall():
+            self._handle_memory_stall()
+        elif self.detect_load_use_hazard():
             self._handle_stall()
-            return
-        
-        # Execute pipeline stages (reverse order)
-        self._writeback_stage()
-        self._memory_stage()
-        self._execute_stage()
-        self._decode_stage()
-        self._fetch_stage()
+        else:
+            # Execute pipeline stages (reverse order)
+            self._writeback_stage()
+            self._memory_stage()
+            self._execute_stage()
+            self._decode_stage()
+            self._fetch_stage()
+            
+            # Ensure R0 is always 0
+            self.registers[0] = 0
         
-        # Ensure R0 is always 0
-        self.registers[0] = 0
+        if self.tracer is not None:
+            self.tracer.record(self)
+        if self.changes is not None:
+            self.changes.version += 1
+    
+    def enable_profiling(self, enabled=True):
+        """
+        Turn per-PC profiling on or off
+        
+        The profile starts empty; checkpoints taken without it are
+        dropped, since seek() could not rewind its counters to them.
+        
+        Args:
+            enabled: Collect counters in self.profile (a PCProfile) when True
+        """
+        if not enabled:
+            self.profile = None
+        elif self.profile is None:
+            self.profile = PCProfile(len(self.instr_mem))
+            self.checkpoints = {}
+            self._checkpoint_cycles = []
+    
+    def enable_data_cache(self, config):
+        """
+        Model a data cache between the MEM stage and data memory
+        
+        Misses stall the pipeline for the configured penalty. The cache
+        starts empty; checkpoints taken without it are dropped.
+        
+        Args:
+            config: core.cache.CacheConfig, or None to remove the cache
+        """
+        self.dcache = Cache(config) if config is not None else None
+        self.checkpoints = {}
+        self._checkpoint_cycles = []
+    
+    def enable_instruction_cache(self, config):
+        """
+        Model an instruction cache between the IF stage and instruction memory
+        
+        A fetch that misses sends bubbles into IF/ID for the configured
+        penalty (a block transfer, so block size and penalty set the
+        fetch bandwidth) while the later stages keep running. The write
+        policy of the config is ignored. The cache starts empty;
+        checkpoints taken without it are dropped.
+        
+        Args:
+            config: core.cache.CacheConfig, or None to remove the cache
+        """
+        self.icache = Cache(config) if config is not None else None
+        self.checkpoints = {}
+        self._checkpoint_cycles = []
+    
+    def enable_change_tracking(self, enabled=True):
+        """
+        Turn change notifications on or off
+        
+        Args:
+            enabled: Record written registers and memory words in
+                     self.changes (a ChangeTracker) when True
+        """
+        if not enabled:
+            self.changes = None
+        elif self.changes is None:
+            self.changes = ChangeTracker()
+            self.changes.invalidate()
+    
+    @property
+    def hazards(self):
+        """Hazard flags for the last cycle"""
+        hazards = Hazard.NONE
+        if self.stall:
+            hazards |= Hazard.LOAD_USE
+        if self.flush:
+            hazards |= Hazard.CONTROL
+        if self.mem_stall:
+            hazards |= Hazard.MEMORY
+        if self.fetch_stall:
+            hazards |= Hazard.FETCH
+        return hazards
+    
+    @property
+    def fetch_stall(self):
+        """True when IF waited for the instruction cache in the last cycle"""
+        icache = self.icache
+        if icache is None:
+            return False
+        # The last wait of a miss leaves only 'ready' set, and it stays set
+        # through data cache stalls until IF runs again
+        return icache.wait > 0 or (icache.ready and not self.mem_stall)
+    
+    @property
+    def hazard_msg(self):
+        """Hazard status message for the last cycle (built on demand)"""
+        return hazard_message(self.hazards)
+    
+    @property
+    def forwarding_msg(self):
+        """Forwarding status message for the last cycle (built on demand)"""
+        return forwarding_message(self.forwarding)
+    
+    @property
+    def memory_view(self):
+        """Writable memoryview over the data memory words (no copy)"""
+        return memoryview(self.memory)
+    
+    def set_tracer(self, tracer):
+        """
+        Record every following cycle with a trace writer
+        
+        Args:
+            tracer: core.trace.TraceWriter, or None to stop tracing
+        """
+        self.tracer = tracer
+        if tracer is not None:
+            tracer.attach(self)
     
     def _handle_stall(self):
         """Handle pipeline stall"""
         self.stall = True
         self.total_stalls += 1
-        self.hazard_msg = "⚠️ LOAD-USE HAZARD: Pipeline Stalled"
         
-        # WB and MEM continue
+        # Charge the stall to the LW it waits for
+        if self.profile is not None:
+            self.profile.stalls[self.ID_EX.pc] += 1
+        
+        # WB, MEM and EX continue
         self._writeback_stage()
         self._memory_stage()
+        self._execute_stage()
+        
+        # Insert bubble in ID/EX
+        self.ID_EX.valid = False
+        
+        # Keep IF and PC frozen (don't update), unless EX redirected PC
+        if self.flush:
+            self.IF_ID.valid = False
+    
+    def _data_cache_stall(self):
+        """
+        Check if MEM must wait for the data cache this cycle
+        
+        The cache is looked up once per access, when the LW/SW reaches
+        EX/MEM; a miss holds it there for the returned penalty.
+        """
+        dcache = self.dcache
+        if dcache.wait:
+            return True
+        if dcache.ready:
+            # The access that missed completes this cycle
+            dcache.ready = False
+            return False
+        
+        EX_MEM = self.EX_MEM
+        if EX_MEM.valid and EX_MEM.opcode in MEMORY_OPS:
+            penalty = dcache.access(EX_MEM.alu_result % self.memory_size,
+                                    EX_MEM.opcode == OP_SW)
+            if penalty:
+                dcache.wait = penalty
+                return True
+        return False
+    
+    def _handle_memory_stall(self):
+        """Handle a data cache miss stall cycle"""
+        self.mem_stall = True
+        self.dcache.stall()
         
-        # Insert bubble in EX
-        self.EX_MEM = None
+        # WB continues; EX/MEM and everything before it hold, and WB
+        # gets a bubble
+        self._writeback_stage()
+        self.MEM_WB.valid = False
         
-        # Keep IF and ID frozen (don't update)
+        # An instruction cache refill carries on behind the stall
+        icache = self.icache
+        if icache is not None and icache.wait:
+            icache.advance()
     
     def _writeback_stage(self):
         """WB Stage: Write result to register file"""
-        if self.MEM_WB and self.MEM_WB['write_reg']:
-            if self.MEM_WB['rd'] != 0:
-                self.registers[self.MEM_WB['rd']] = self.MEM_WB['write_data'] & 0xFFFF
+        MEM_WB = self.MEM_WB
+        if MEM_WB.valid and MEM_WB.write_reg:
+            rd = MEM_WB.rd
+            if rd != 0:
+                value = MEM_WB.write_data & 0xFFFF
+                self.registers[rd] = value
+                if self.changes is not None:
+                    self.changes.registers.add(rd)
+                
+                # ID/EX read its operands before this write, and MEM is about
+                # to replace MEM/WB, so forward the value now (an instruction
+                # two slots behind, e.g. across a fetch bubble); EX counts it
+                ID_EX = self.ID_EX
+                if ID_EX.valid:
+                    inst = ID_EX.inst
+                    if inst.rs == rd:
+                        ID_EX.rs_value = value
+                        ID_EX.wb_forwards |= 1
+                    if inst.rt == rd:
+                        ID_EX.rt_value = value
+                        ID_EX.wb_forwards |= 2
     
     def _memory_stage(self):
         """MEM Stage: Access data memory"""
-        new_MEM_WB = None
-        
-        if self.EX_MEM:
-            opcode = self.EX_MEM['opcode']
-            write_data = self.EX_MEM['alu_result']
-            write_reg = self.EX_MEM['write_reg']
-            rd = self.EX_MEM['rd']
+        EX_MEM = self.EX_MEM
+        MEM_WB = self.MEM_WB
+        MEM_WB.valid = EX_MEM.valid
+        
+        if EX_MEM.valid:
+            opcode = EX_MEM.opcode
+            write_data = EX_MEM.alu_result
+            write_reg = EX_MEM.write_reg
             
             # Load Word
-            if opcode == self.OPCODES['LW']:
-                addr = self.EX_MEM['alu_result'] % 64
+            if opcode == OP_LW:
+                addr = EX_MEM.alu_result % self.memory_size
                 write_data = self.memory[addr]
                 write_reg = True
+                if self.profile is not None:
+                    self.profile.mem_reads[EX_MEM.pc] += 1
             
             # Store Word
-            elif opcode == self.OPCODES['SW']:
-                addr = self.EX_MEM['alu_result'] % 64
-                self.memory[addr] = self.EX_MEM['rt_value'] & 0xFFFF
+            elif opcode == OP_SW:
+                addr = EX_MEM.alu_result % self.memory_size
+                self.memory[addr] = EX_MEM.rt_value & 0xFFFF
                 write_reg = False
+                if self.profile is not None:
+                    self.profile.mem_writes[EX_MEM.pc] += 1
+                if self.changes is not None:
+                    self.changes.memory.add(addr)
             
-            new_MEM_WB = {
-                'rd': rd,
-                'write_dest': rd,
-                'write_data': write_data,
-                'write_reg': write_reg,
-                'opcode': opcode
-            }
-        
-        self.MEM_WB = new_MEM_WB
+            MEM_WB.pc = EX_MEM.pc
+            MEM_WB.opcode = opcode
+            MEM_WB.rd = EX_MEM.rd
+            MEM_WB.write_data = write_data
+            MEM_WB.write_reg = write_reg
     
     def _execute_stage(self):
         """EX Stage: Execute operation"""
-        new_EX_MEM = None
+        ID_EX = self.ID_EX
         
-        if self.ID_EX:
-            # Get forwarded values
-            forward_rs, forward_rt, fwd_rs_src, fwd_rt_src = self.get_forwarding_values()
-            
-            rs_value = forward_rs if forward_rs is not None else self.ID_EX['rs_value']
-            rt_value = forward_rt if forward_rt is not None else self.ID_EX['rt_value']
-            
-            # Update forwarding message
-            if forward_rs is not None or forward_rt is not None:
-                fwd_msg = []
-                if forward_rs is not None:
-                    fwd_msg.append(f"R{self.ID_EX['rs']} from {fwd_rs_src}")
-                if forward_rt is not None:
-                    fwd_msg.append(f"R{self.ID_EX['rt']} from {fwd_rt_src}")
-                self.forwarding_msg = "✓ Forwarding: " + ", ".join(fwd_msg)
-            
-            opcode = self.ID_EX['opcode']
-            alu_result = 0
-            write_reg = False
+        if not ID_EX.valid:
+            self.EX_MEM.valid = False
+            return
+        
+        inst = ID_EX.inst
+        profile = self.profile
+        
+        # Get forwarded values
+        forward_rs, forward_rt, fwd_rs_src, fwd_rt_src = self.get_forwarding_values()
+        
+        rs_value = forward_rs if forward_rs is not None else ID_EX.rs_value
+        rt_value = forward_rt if forward_rt is not None else ID_EX.rt_value
+        
+        # Operands WB wrote into ID/EX, unless a newer value was forwarded
+        wb_forwards = ID_EX.wb_forwards
+        if wb_forwards:
+            if wb_forwards & 1 and not fwd_rs_src:
+                fwd_rs_src = FORWARD_WB
+                self.forwarding_wb += 1
+            if wb_forwards & 2 and not fwd_rt_src:
+                fwd_rt_src = FORWARD_WB
+                self.forwarding_wb += 1
+        
+        # Record the forwarding event (messages are built on demand)
+        if fwd_rs_src or fwd_rt_src:
+            self.forwarding = (fwd_rs_src, fwd_rt_src, inst.rs, inst.rt)
+            if profile is not None:
+                profile.forwards[ID_EX.pc] += (fwd_rs_src != 0) + (fwd_rt_src != 0)
+        
+        # Execute based on opcode
+        opcode = inst.opcode
+        alu_result = EX_HANDLERS[opcode](self, ID_EX, rs_value, rt_value)
+        if profile is not None:
+            executions = profile.executions
+            pc = ID_EX.pc
+            count = executions[pc] + 1
+            executions[pc] = count
+            if count > profile.peak:
+                profile.peak = count
+        
+        rd = inst.dest
+        write_reg = rd is not None
+        if not write_reg:
             rd = 0
-            branch_taken = False
-            target_pc = 0
-            
-            # Execute based on opcode
-            if opcode == self.OPCODES['ADD']:
-                alu_result = (rs_value + rt_value) & 0xFFFF
-                rd = self.ID_EX['rd']
-                write_reg = True
-            
-            elif opcode == self.OPCODES['SUB']:
-                alu_result = (rs_value - rt_value) & 0xFFFF
-                rd = self.ID_EX['rd']
-                write_reg = True
-            
-            elif opcode == self.OPCODES['AND']:
-                alu_result = (rs_value & rt_value) & 0xFFFF
-                rd = self.ID_EX['rd']
-                write_reg = True
-            
-            elif opcode == self.OPCODES['OR']:
-                alu_result = (rs_value | rt_value) & 0xFFFF
-                rd = self.ID_EX['rd']
-                write_reg = True
-            
-            elif opcode == self.OPCODES['SLT']:
-                alu_result = 1 if rs_value < rt_value else 0
-                rd = self.ID_EX['rd']
-                write_reg = True
-            
-            elif opcode == self.OPCODES['ADDI']:
-                imm = self.ID_EX['imm']  # Use as unsigned (0-63)
-                alu_result = (rs_value + imm) & 0xFFFF
-                rd = self.ID_EX['rt']
-                write_reg = True
-            
-            elif opcode == self.OPCODES['ANDI']:
-                alu_result = (rs_value & self.ID_EX['imm']) & 0xFFFF
-                rd = self.ID_EX['rt']
-                write_reg = True
-            
-            elif opcode == self.OPCODES['ORI']:
-                alu_result = (rs_value | self.ID_EX['imm']) & 0xFFFF
-                rd = self.ID_EX['rt']
-                write_reg = True
-            
-            elif opcode == self.OPCODES['LW']:
-                imm = self._sign_extend(self.ID_EX['imm'], 6)
-                alu_result = (rs_value + imm) & 0xFFFF
-                rd = self.ID_EX['rt']
-                write_reg = True
-            
-            elif opcode == self.OPCODES['SW']:
-                imm = self._sign_extend(self.ID_EX['imm'], 6)
-                alu_result = (rs_value + imm) & 0xFFFF
-                rd = 0
-                write_reg = False
-            
-            elif opcode == self.OPCODES['BEQ']:
-                if rs_value == rt_value:
-                    offset = self._sign_extend(self.ID_EX['imm'], 6)
-                    target_pc = (self.ID_EX['pc'] + 1 + offset) & 0xFFF
-                    branch_taken = True
-            
-            elif opcode == self.OPCODES['BNE']:
-                if rs_value != rt_value:
-                    offset = self._sign_extend(self.ID_EX['imm'], 6)
-                    target_pc = (self.ID_EX['pc'] + 1 + offset) & 0xFFF
-                    branch_taken = True
-            
-            elif opcode == self.OPCODES['J']:
-                target_pc = self.ID_EX['addr'] & 0xFFF
-                branch_taken = True
-            
-            elif opcode == self.OPCODES['JAL']:
-                self.registers[7] = (self.ID_EX['pc'] + 1) & 0xFFF
-                target_pc = self.ID_EX['addr'] & 0xFFF
-                branch_taken = True
-            
-            elif opcode == self.OPCODES['JR']:
-                target_pc = rs_value & 0xFFF
-                branch_taken = True
-            
-            # Handle branches
-            if branch_taken:
-                self.pc = target_pc
-                self.flush = True
-                self.total_flushes += 1
-                self.hazard_msg = "⚡ CONTROL HAZARD: Branch Taken (Flushed)"
-            
-            new_EX_MEM = {
-                'opcode': opcode,
-                'alu_result': alu_result,
-                'rt_value': rt_value,
-                'rd': rd,
-                'write_dest': rd,
-                'write_reg': write_reg
-            }
         
-        self.EX_MEM = new_EX_MEM
+        EX_MEM = self.EX_MEM
+        EX_MEM.valid = True
+        EX_MEM.pc = ID_EX.pc
+        EX_MEM.opcode = opcode
+        EX_MEM.alu_result = alu_result
+        EX_MEM.rt_value = rt_value
+        EX_MEM.rd = rd
+        EX_MEM.write_reg = write_reg
+    
+    def _take_branch(self, target_pc):
+        """Redirect fetch to target_pc and flush the wrong-path instruction"""
+        self.pc = target_pc
+        self.flush = True
+        self.total_flushes += 1
+        if self.icache is not None:
+            self.icache.cancel()  # Wrong-path fetch miss
+        if self.profile is not None:
+            self.profile.flushes[self.ID_EX.pc] += 1
     
     def _decode_stage(self):
         """ID Stage: Decode instruction and read registers"""
-        new_ID_EX = None
+        IF_ID = self.IF_ID
+        ID_EX = self.ID_EX
         
-        if self.IF_ID and not self.flush:
-            instr = self.IF_ID['instr']
-            pc = self.IF_ID['pc']
+        if IF_ID.valid and not self.flush:
+            pc = IF_ID.pc
             
-            # Decode instruction fields
-            opcode = int(instr[0:4], 2)
-            rs = int(instr[4:7], 2)
-            rt = int(instr[7:10], 2)
-            rd = int(instr[10:13], 2)
-            imm = int(instr[10:16], 2)
-            addr = int(instr[4:16], 2)
+            # Instruction fields were decoded at load time
+            inst = self.decoded[pc]
             
             # Read registers
-            rs_value = self.registers[rs]
-            rt_value = self.registers[rt]
-            
-            new_ID_EX = {
-                'opcode': opcode,
-                'pc': pc,
-                'rs': rs,
-                'rt': rt,
-                'rd': rd,
-                'rs_value': rs_value,
-                'rt_value': rt_value,
-                'imm': imm,
-                'addr': addr
-            }
+            ID_EX.valid = True
+            ID_EX.pc = pc
+            ID_EX.inst = inst
+            ID_EX.rs_value = self.registers[inst.rs]
+            ID_EX.rt_value = self.registers[inst.rt]
+            ID_EX.wb_forwards = 0
             
             self.total_instructions += 1
-        
-        self.ID_EX = new_ID_EX
+        else:
+            ID_EX.valid = False
     
     def _fetch_stage(self):
         """IF Stage: Fetch instruction from memory"""
-        new_IF_ID = None
+        IF_ID = self.IF_ID
         
         if not self.flush and self.pc < len(self.instr_mem):
-            new_IF_ID = {
-                'instr': self.instr_mem[self.pc],
-                'pc': self.pc
-            }
+            icache = self.icache
+            if icache is not None:
+                # Same block as the previous fetch: a hit, counted inline
+                if (icache.wait or icache.ready
+                        or self.pc >> icache.offset_bits != icache.last_block):
+                    if self._instruction_cache_miss():
+                        IF_ID.valid = False
+                        return
+                else:
+                    icache.hits += 1
+            IF_ID.valid = True
+            IF_ID.instr = self.instr_mem[self.pc]
+            IF_ID.pc = self.pc
             self.pc = (self.pc + 1) & 0xFFF
+        else:
+            IF_ID.valid = False
+    
+    def _instruction_cache_miss(self):
+        """
+        Check if IF must wait for the instruction cache this cycle
+        
+        Counts the cycle as a fetch stall when it does. IF/ID is always
+        a bubble while a fetch waits, so a load-use stall never overlaps
+        one; a taken branch abandons it (see _take_branch).
+        """
+        icache = self.icache
+        if icache.wait:
+            icache.stall()
+            return True
+        if icache.ready:
+            # The fetch that missed completes this cycle
+            icache.ready = False
+            return False
         
-        self.IF_ID = new_IF_ID
+        penalty = icache.access(self.pc)
+        if penalty:
+            icache.wait = penalty
+            icache.stall()
+            return True
+        return False
     
     def detect_load_use_hazard(self):
         """Detect load-use hazard (LW followed by dependent instruction)"""
-        if not self.ID_EX or not self.IF_ID:
-            return False
-        
-        # Check if EX stage has LW
-        if self.ID_EX['opcode'] != self.OPCODES['LW']:
+        if not self.IF_ID.valid:
             return False
         
-        # Decode IF_ID instruction
-        instr = self.IF_ID['instr']
-        opcode = int(instr[0:4], 2)
-        rs = int(instr[4:7], 2)
-        rt = int(instr[7:10], 2)
-        
-        lw_dest = self.ID_EX['rt']
+        reads = self.decoded[self.IF_ID.pc].reads
         
-        # Check if instruction uses LW destination
-        if opcode in [self.OPCODES['ADD'], self.OPCODES['SUB'], self.OPCODES['AND'], 
-                      self.OPCODES['OR'], self.OPCODES['SLT']]:
-            if rs == lw_dest or rt == lw_dest:
-                return True
-        
-        elif opcode in [self.OPCODES['ADDI'], self.OPCODES['ANDI'], self.OPCODES['ORI']]:
-            if rs == lw_dest:
-                return True
-        
-        elif opcode in [self.OPCODES['SW'], self.OPCODES['BEQ'], self.OPCODES['BNE']]:
-            if rs == lw_dest or rt == lw_dest:
-                return True
-        
-        return False
+        # Stall one cycle while the LW is in EX: the dependent instruction
+        # is then decoded while the LW is in MEM, and WB forwards the
+        # loaded value into ID/EX (an instruction two behind the LW, as
+        # in LW; LW; use, needs no stall)
+        ID_EX = self.ID_EX
+        return ID_EX.valid and ID_EX.inst.opcode == OP_LW and ID_EX.inst.rt in reads
     
     def get_forwarding_values(self):
-        """Determine forwarding values from EX/MEM and MEM/WB stages"""
-        if not self.ID_EX:
-            return None, None, None, None
+        """
+        Determine forwarding values from EX/MEM and MEM/WB stages
+        
+        Returns:
+            (rs value, rt value, rs source, rt source); a value is None and
+            its source ForwardSource.NONE when the operand is not forwarded
+        """
+        if not self.ID_EX.valid:
+            return None, None, FORWARD_NONE, FORWARD_NONE
         
         forward_rs = None
         forward_rt = None
-        forward_rs_source = None
-        forward_rt_source = None
+        forward_rs_source = FORWARD_NONE
+        forward_rt_source = FORWARD_NONE
         
-        rs = self.ID_EX['rs']
-        rt = self.ID_EX['rt']
+        rs = self.ID_EX.inst.rs
+        rt = self.ID_EX.inst.rt
         
         # EX/MEM Forwarding (higher priority)
-        if self.EX_MEM and self.EX_MEM.get('write_reg') and self.EX_MEM.get('write_dest', 0) != 0:
-            if self.EX_MEM['write_dest'] == rs:
-                forward_rs = self.EX_MEM['alu_result']
-                forward_rs_source = 'EX/MEM'
+        EX_MEM = self.EX_MEM
+        if EX_MEM.valid and EX_MEM.write_reg and EX_MEM.rd != 0:
+            if EX_MEM.rd == rs:
+                forward_rs = EX_MEM.alu_result
+                forward_rs_source = FORWARD_EX_MEM
                 self.forwarding_ex_mem += 1
             
-            if self.EX_MEM['write_dest'] == rt:
-                forward_rt = self.EX_MEM['alu_result']
-                forward_rt_source = 'EX/MEM'
+            if EX_MEM.rd == rt:
+                forward_rt = EX_MEM.alu_result
+                forward_rt_source = FORWARD_EX_MEM
                 self.forwarding_ex_mem += 1
         
         # MEM/WB Forwarding (lower priority)
-        if self.MEM_WB and self.MEM_WB.get('write_reg') and self.MEM_WB.get('write_dest', 0) != 0:
-            if forward_rs is None and self.MEM_WB['write_dest'] == rs:
-                forward_rs = self.MEM_WB['write_data']
-                forward_rs_source = 'MEM/WB'
+        MEM_WB = self.MEM_WB
+        if MEM_WB.valid and MEM_WB.write_reg and MEM_WB.rd != 0:
+            if forward_rs is None and MEM_WB.rd == rs:
+                forward_rs = MEM_WB.write_data
+                forward_rs_source = FORWARD_MEM_WB
                 self.forwarding_mem_wb += 1
             
-            if forward_rt is None and self.MEM_WB['write_dest'] == rt:
-                forward_rt = self.MEM_WB['write_data']
-                forward_rt_source = 'MEM/WB'
+            if forward_rt is None and MEM_WB.rd == rt:
+                forward_rt = MEM_WB.write_data
+                forward_rt_source = FORWARD_MEM_WB
                 self.forwarding_mem_wb += 1
         
         return forward_rs, forward_rt, forward_rs_source, forward_rt_source
     
+    def snapshot(self):
+        """
+        Capture the full CPU state in a compact binary form
+        
+        Covers registers, data memory, pc, the pipeline latches, control
+        flags and statistics. Only valid for the program currently loaded.
+        
+        Returns:
+            bytes
+        """
+        IF_ID = self.IF_ID
+        ID_EX = self.ID_EX
+        EX_MEM = self.EX_MEM
+        MEM_WB = self.MEM_WB
+        memory = self.memory
+        
+        return SNAPSHOT_STRUCT.pack(
+            SNAPSHOT_VERSION, self.cycle, self.total_cycles, self.total_instructions,
+            self.total_stalls, self.total_flushes,
+            self.forwarding_ex_mem, self.forwarding_mem_wb, self.forwarding_wb,
+            self.pc, self.stall, self.flush,
+            *self.registers,
+            IF_ID.valid, IF_ID.pc, IF_ID.instr,
+            ID_EX.valid, ID_EX.pc, ID_EX.rs_value, ID_EX.rt_value, ID_EX.wb_forwards,
+            EX_MEM.valid, EX_MEM.pc, EX_MEM.opcode, EX_MEM.alu_result,
+            EX_MEM.rt_value, EX_MEM.rd, EX_MEM.write_reg,
+            MEM_WB.valid, MEM_WB.pc, MEM_WB.opcode, MEM_WB.rd,
+            MEM_WB.write_data, MEM_WB.write_reg,
+            len(memory)
+        ) + words_to_bytes(memory) + self._cache_state()
+    
+    def _cache_state(self):
+        """Snapshot tail for the caches (empty without any)"""
+        state = b''
+        if self.dcache is not None:
+            state += CACHE_STATE_STRUCT.pack(self.mem_stall) + self.dcache.snapshot()
+        if self.icache is not None:
+            state += self.icache.snapshot()
+        return state
+    
+    def restore(self, snapshot):
+        """
+        Restore a state captured by snapshot()
+        
+        Registers and memory are updated in place. Checkpoints are kept,
+        since replaying from any of them gives the same states again.
+        
+        Args:
+            snapshot: Bytes returned by snapshot()
+        """
+        header_size = SNAPSHOT_STRUCT.size
+        if len(snapshot) < header_size:
+            raise ValueError("Snapshot is truncated")
+        
+        values = SNAPSHOT_STRUCT.unpack_from(snapshot)
+        if values[0] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {values[0]}")
+        memory_size = values[-1]
+        memory_end = header_size + 2 * memory_size
+        if len(snapshot) < memory_end:
+            raise ValueError("Snapshot size does not match its memory size")
+        cache_state = snapshot[memory_end:]
+        dcache_size = 0
+        if self.dcache is not None:
+            dcache_size = CACHE_STATE_STRUCT.size + self.dcache.state_size
+        expected = dcache_size
+        if self.icache is not None:
+            expected += self.icache.state_size
+        if len(cache_state) != expected:
+            raise ValueError("Snapshot cache state does not match the CPU's caches")
+        if memory_size != self.memory_size:
+            raise ValueError(f"Snapshot has {memory_size} words of memory, "
+                             f"CPU has {self.memory_size}")
+        
+        (self.cycle, self.total_cycles, self.total_instructions,
+         self.total_stalls, self.total_flushes,
+         self.forwarding_ex_mem, self.forwarding_mem_wb, self.forwarding_wb,
+         self.pc, self.stall, self.flush) = values[1:12]
+        self.registers[:] = values[12:20]
+        
+        IF_ID = self.IF_ID
+        ID_EX = self.ID_EX
+        EX_MEM = self.EX_MEM
+        MEM_WB = self.MEM_WB
+        (IF_ID.valid, IF_ID.pc, IF_ID.instr,
+         ID_EX.valid, ID_EX.pc, ID_EX.rs_value, ID_EX.rt_value, ID_EX.wb_forwards,
+         EX_MEM.valid, EX_MEM.pc, EX_MEM.opcode, EX_MEM.alu_result,
+         EX_MEM.rt_value, EX_MEM.rd, EX_MEM.write_reg,
+         MEM_WB.valid, MEM_WB.pc, MEM_WB.opcode, MEM_WB.rd,
+         MEM_WB.write_data, MEM_WB.write_reg) = values[20:-1]
+        ID_EX.inst = self.decoded[ID_EX.pc] if ID_EX.valid else None
+        
+        self.memory[:] = words_from_bytes(snapshot[header_size:memory_end])
+        if self.dcache is not None:
+            (self.mem_stall,) = CACHE_STATE_STRUCT.unpack_from(cache_state)
+            self.dcache.restore(cache_state[CACHE_STATE_STRUCT.size:dcache_size])
+        if self.icache is not None:
+            self.icache.restore(cache_state[dcache_size:])
+        
+        # Operand numbers of the forwarding event are not stored
+        self.forwarding = NO_FORWARDING
+        
+        # Later trace records must describe the restored latches
+        if self.tracer is not None:
+            self.tracer.attach(self)
+        if self.changes is not None:
+            self.changes.invalidate()
+    
+    def enable_checkpoints(self, interval=1000):
+        """
+        Take a snapshot automatically every 'interval' cycles
+        
+        Args:
+            interval: Cycles between checkpoints (0 disables them)
+        """
+        self.checkpoint_interval = max(0, int(interval))
+    
+    def _save_checkpoint(self):
+        """Record a checkpoint for the current cycle (once per cycle)"""
+        cycle = self.cycle
+        if cycle not in self.checkpoints:
+            self.checkpoints[cycle] = self.snapshot()
+            bisect.insort(self._checkpoint_cycles, cycle)
+        if self.profile is not None and cycle not in self.profile.checkpoints:
+            self.profile.save(cycle)
+    
+    def seek(self, target_cycle):
+        """
+        Move to the state at the end of 'target_cycle'
+        
+        Seeking forward stops early if the program completes first.
+        
+        Restores the nearest earlier checkpoint and replays from there, so
+        the cost is bounded by the checkpoint interval. Seeking backwards
+        needs checkpoints (see enable_checkpoints) and raises ValueError
+        without one.
+        
+        Args:
+            target_cycle: Cycle number to move to (0 is the initial state)
+        
+        Returns:
+            Cycle reached
+        """
+        target_cycle = max(0, target_cycle)
+        if target_cycle == self.cycle:
+            return self.cycle
+        
+        # Latest checkpoint before the target (or at it, for cycle 0),
+        # so at least one cycle is replayed and the status messages are set
+        cycles = self._checkpoint_cycles
+        index = bisect.bisect_left(cycles, target_cycle)
+        if index < len(cycles) and cycles[index] == 0 == target_cycle:
+            index += 1
+        if index:
+            start = cycles[index - 1]
+            if target_cycle < self.cycle or start > self.cycle:
+                self.restore(self.checkpoints[start])
+                if self.profile is not None:
+                    self.profile.rewind(start)
+        elif target_cycle < self.cycle:
+            raise ValueError("No checkpoint to rewind to; call "
+                             "enable_checkpoints() before running")
+        
+        step = self.step
+        is_complete = self.is_program_complete
+        while self.cycle < target_cycle and not is_complete():
+            step()
+        return self.cycle
+    
+    def step_back(self):
+        """Undo the last clock cycle"""
+        if self.cycle:
+            self.seek(self.cycle - 1)
+    
     def _sign_extend(self, value, bits):
         """Sign extend a value from 'bits' to 16 bits"""
-        sign_bit = 1 << (bits - 1)
-        if value & sign_bit:
-            mask = (1 << bits) - 1
-            return value | (~mask & 0xFFFF)
-        return value
+        return sign_extend(value, bits)
     
     def is_pipeline_empty(self):
         """Check if pipeline is empty"""
-        return not any([self.IF_ID, self.ID_EX, self.EX_MEM, self.MEM_WB])
+        return not (self.IF_ID.valid or self.ID_EX.valid or
+                    self.EX_MEM.valid or self.MEM_WB.valid)
     
     def is_program_complete(self):
         """Check if program execution is complete"""
@@ -439,10 +909,10 @@ class PipelinedCPU:
     
     def get_stats(self):
         """Get execution statistics"""
-        total_fwd = self.forwarding_ex_mem + self.forwarding_mem_wb
+        total_fwd = self.forwarding_ex_mem + self.forwarding_mem_wb + self.forwarding_wb
         cpi = self.cycle / max(self.total_instructions, 1)
         
-        return {
+        stats = {
             'cycles': self.cycle,
             'instructions': self.total_instructions,
             'stalls': self.total_stalls,
@@ -450,3 +920,8 @@ class PipelinedCPU:
             'forwards': total_fwd,
             'cpi': cpi
         }
+        if self.dcache is not None:
+            stats['dcache'] = self.dcache.get_stats()
+        if self.icache is not None:
+            stats['icache'] = self.icache.get_stats()
+        return stats
@@ -0,0 +1,75 @@
+"""
+MIPS 16-bit Pipeline Events
+Per-cycle hazard and forwarding codes, and their display messages
+"""
+
+from enum import IntEnum, IntFlag
+
+
+class Hazard(IntFlag):
+    """Hazards handled in a cycle (several can occur in the same cycle)"""
+    NONE = 0
+    LOAD_USE = 1   # Pipeline stalled for a load-use dependency
+    CONTROL = 2    # Taken branch/jump flushed the fetched instruction
+    MEMORY = 4     # Pipeline stalled on a data cache miss
+    FETCH = 8      # Fetch waited for an instruction cache miss (bubble)
+
+
+class ForwardSource(IntEnum):
+    """Pipeline register an EX operand was forwarded from"""
+    NONE = 0
+    EX_MEM = 1
+    MEM_WB = 2
+    WB = 3       # Written into ID/EX by WB (two instructions behind)
+
+
+FORWARD_SOURCE_NAMES = {
+    ForwardSource.EX_MEM: 'EX/MEM',
+    ForwardSource.MEM_WB: 'MEM/WB',
+    ForwardSource.WB: 'WB',
+}
+
+# Forwarding event: (rs source, rt source, rs number, rt number)
+NO_FORWARDING = (ForwardSource.NONE, ForwardSource.NONE, 0, 0)
+
+
+def hazard_message(hazards):
+    """
+    Build the status message for a cycle's hazards
+
+    Args:
+        hazards: Hazard flags
+
+    Returns:
+        Human-readable message
+    """
+    if hazards & Hazard.CONTROL:
+        return "⚡ CONTROL HAZARD: Branch Taken (Flushed)"
+    if hazards & Hazard.LOAD_USE:
+        return "⚠️ LOAD-USE HAZARD: Pipeline Stalled"
+    if hazards & Hazard.MEMORY:
+        return "⏳ DATA CACHE MISS: Pipeline Stalled"
+    if hazards & Hazard.FETCH:
+        return "⏳ INSTRUCTION CACHE MISS: Fetch Bubble"
+    return "No Hazard"
+
+
+def forwarding_message(forwarding):
+    """
+    Build the status message for a cycle's forwarding event
+
+    Args:
+        forwarding: (rs source, rt source, rs, rt) tuple
+
+    Returns:
+        Human-readable message
+    """
+    rs_source, rt_source, rs, rt = forwarding
+    parts = []
+    if rs_source:
+        parts.append(f"R{rs} from {FORWARD_SOURCE_NAMES[rs_source]}")
+    if rt_source:
+        parts.append(f"R{rt} from {FORWARD_SOURCE_NAMES[rt_source]}")
+    if not parts:
+        return "No Forwarding"
+    return "✓ Forwarding: " + ", ".join(parts)
@@ -0,0 +1,238 @@
+"""
+MIPS 16-bit Functional CPU
+Fast non-pipelined execution engine for architectural results only
+"""
+
+from array import array
+
+from .memory import DEFAULT_MEMORY_SIZE, new_memory, clear_memory, load_words
+from .objfile import ObjectFile
+from .isa import (OPCODES, OP_LW, OP_SW, OP_J, OP_JAL, OP_JR, OP_NOP,
+                  IMM_ALU_OPS, BRANCH_OPS,
+                  ALU_TEMPLATES, BRANCH_CONDITIONS, decode, to_word)
+
+
+# Instruction binders: binder(decoded, pc) -> op(registers, memory) -> next pc
+# Each instruction is bound once at load time, with its register numbers,
+# immediate and fall-through pc as closure constants, so run() makes one
+# call per instruction and reads no instruction fields. Built from the
+# shared ALU templates and branch tables in core.isa, so the semantics
+# match PipelinedCPU's EX and MEM stages.
+
+def _alu_binder(template, immediate):
+    """
+    Binder for an ALU operation (rd = rs op rt, or rt = rs op imm for
+    ADDI/ANDI/ORI), with the operation inlined from its source template
+    """
+    operand = 'imm' if immediate else 'regs[rt]'
+    source = (
+        "def bind(d, pc):\n"
+        "    rs, rt, imm, dest, next_pc = d.rs, d.rt, d.imm, d.dest, (pc + 1) & 0xFFF\n"
+        "    if not dest:\n"
+        "        return _bind_nop(d, pc)\n"
+        "    def op(regs, mem):\n"
+        f"        regs[dest] = {template.format(a='regs[rs]', b=operand)}\n"
+        "        return next_pc\n"
+        "    return op\n"
+    )
+    namespace = {'_bind_nop': _bind_nop}
+    exec(compile(source, '<alu binder>', 'exec'), namespace)
+    return namespace['bind']
+
+
+def _bind_lw(d, pc):
+    rs, simm, dest, next_pc = d.rs, d.simm, d.dest, (pc + 1) & 0xFFF
+
+    def op(regs, mem):
+        value = mem[((regs[rs] + simm) & 0xFFFF) % len(mem)]
+        if dest:
+            regs[dest] = value
+        return next_pc
+    return op
+
+
+def _bind_sw(d, pc):
+    rs, rt, simm, next_pc = d.rs, d.rt, d.simm, (pc + 1) & 0xFFF
+
+    def op(regs, mem):
+        mem[((regs[rs] + simm) & 0xFFFF) % len(mem)] = regs[rt]
+        return next_pc
+    return op
+
+
+def _bind_branch(condition):
+    """BEQ/BNE: PC-relative branch when the condition holds"""
+    def bind(d, pc):
+        rs, rt = d.rs, d.rt
+        next_pc, target = (pc + 1) & 0xFFF, (pc + 1 + d.simm) & 0xFFF
+
+        def op(regs, mem):
+            return target if condition(regs[rs], regs[rt]) else next_pc
+        return op
+    return bind
+
+
+def _bind_j(d, pc):
+    target = d.addr
+
+    def op(regs, mem):
+        return target
+    return op
+
+
+def _bind_jal(d, pc):
+    link, target = (pc + 1) & 0xFFF, d.addr
+
+    def op(regs, mem):
+        regs[7] = link
+        return target
+    return op
+
+
+def _bind_jr(d, pc):
+    rs = d.rs
+
+    def op(regs, mem):
+        return regs[rs] & 0xFFF
+    return op
+
+
+def _bind_nop(d, pc):
+    next_pc = (pc + 1) & 0xFFF
+
+    def op(regs, mem):
+        return next_pc
+    return op
+
+
+# Binder table indexed by opcode
+BINDERS = [None] * 16
+for _opcode in range(16):
+    if _opcode in ALU_TEMPLATES:
+        BINDERS[_opcode] = _alu_binder(ALU_TEMPLATES[_opcode], _opcode in IMM_ALU_OPS)
+    elif _opcode in BRANCH_OPS:
+        BINDERS[_opcode] = _bind_branch(BRANCH_CONDITIONS[_opcode])
+BINDERS[OP_LW] = _bind_lw
+BINDERS[OP_SW] = _bind_sw
+BINDERS[OP_J] = _bind_j
+BINDERS[OP_JAL] = _bind_jal
+BINDERS[OP_JR] = _bind_jr
+BINDERS[OP_NOP] = _bind_nop
+
+
+def bind(decoded, pc):
+    """Bind the pre-decoded instruction at pc into an op(registers, memory)"""
+    return BINDERS[decoded.opcode](decoded, pc)
+
+
+class FunctionalCPU:
+    """
+    16-bit MIPS Functional CPU Implementation
+
+    Executes one whole instruction per step with no pipeline model, so
+    only the architectural state (registers, memory, pc) is tracked.
+    Every program ends with the same registers, memory and instruction
+    count as on PipelinedCPU (with or without its cache models), whose
+    forwarding and load-use stalls resolve all data hazards;
+    tests/test_engines.py checks this. Cycle counts and pipeline
+    statistics are not modelled.
+    """
+
+    # Instruction Set (Opcodes)
+    OPCODES = dict(OPCODES)
+
+    def __init__(self, memory_size=DEFAULT_MEMORY_SIZE):
+        # Hardware Components
+        self.registers = [0] * 8  # R0-R7 (R0 always 0)
+        self.memory = new_memory(memory_size)  # 16-bit data words (array('H'))
+        self.memory_size = memory_size
+        self.instr_mem = array('H')  # Instruction memory (16-bit words)
+        self.decoded = []         # Pre-decoded instruction memory
+        self.ops = []             # Bound instructions (see bind)
+        self.pc = 0               # Program counter
+
+        # Statistics
+        self.total_instructions = 0
+
+    def reset(self):
+        """Reset CPU to initial state"""
+        # Clear in place so callers holding references stay in sync
+        self.registers[:] = [0] * 8
+        clear_memory(self.memory)
+        self.pc = 0
+        self.total_instructions = 0
+
+    @property
+    def memory_view(self):
+        """Writable memoryview over the data memory words (no copy)"""
+        return memoryview(self.memory)
+
+    def load_program(self, instructions):
+        """
+        Load program into instruction memory and pre-decode it
+
+        Args:
+            instructions: Sequence of 16-bit instruction words
+                          (binary strings are also accepted), or an
+                          ObjectFile whose data segment is preloaded too
+        """
+        if isinstance(instructions, ObjectFile):
+            program = instructions
+            self.instr_mem = array('H', program.instructions)
+        else:
+            program = None
+            self.instr_mem = array('H', [to_word(instr) for instr in instructions])
+        self.decoded = [decode(instr) for instr in self.instr_mem]
+        self.ops = [bind(d, pc) for pc, d in enumerate(self.decoded)]
+        self.reset()
+        if program is not None:
+            load_words(self.memory, program.data)
+
+    def step(self):
+        """Execute one instruction"""
+        if self.pc < len(self.ops):
+            self.pc = self.ops[self.pc](self.registers, self.memory)
+            self.total_instructions += 1
+
+    def run(self, max_instructions=None):
+        """
+        Execute until the program completes
+
+        Args:
+            max_instructions: Optional cap on instructions executed
+
+        Returns:
+            Number of instructions executed
+        """
+        if max_instructions is None:
+            max_instructions = 1 << 62
+
+        regs = self.registers
+        mem = self.memory
+        ops = self.ops
+        end = len(ops)
+        pc = self.pc
+        count = 0
+
+        while pc < end and count < max_instructions:
+            pc = ops[pc](regs, mem)
+            count += 1
+
+        self.pc = pc
+        self.total_instructions += count
+        return count
+
+    def is_program_complete(self):
+        """Check if program execution is complete"""
+        return self.pc >= len(self.instr_mem)
+
+    def get_stats(self):
+        """Get execution statistics (one instruction per cycle)"""
+        return {
+            'cycles': self.total_instructions,
+            'instructions': self.total_instructions,
+            'stalls': 0,
+            'flushes': 0,
+            'forwards': 0,
+            'cpi': 1.0 if self.total_instructions else 0.0
+        }
@@ -0,0 +1,219 @@
+"""
+MIPS 16-bit Instruction Set
+Opcode table and instruction decoder shared by the core components
+"""
+
+# Instruction Set (Opcodes)
+OPCODES = {
+    'ADD':  0b0000,
+    'SUB':  0b0001,
+    'AND':  0b0010,
+    'OR':   0b0011,
+    'SLT':  0b0100,
+    'ADDI': 0b0101,
+    'ANDI': 0b0110,
+    'ORI':  0b0111,
+    'LW':   0b1000,
+    'SW':   0b1001,
+    'BEQ':  0b1010,
+    'BNE':  0b1011,
+    'J':    0b1100,
+    'JAL':  0b1101,
+    'JR':   0b1110,
+    'NOP':  0b1111
+}
+
+# Reverse mapping for disassembly
+OPCODE_NAMES = {v: k for k, v in OPCODES.items()}
+
+# Opcode constants
+OP_ADD = OPCODES['ADD']
+OP_SUB = OPCODES['SUB']
+OP_AND = OPCODES['AND']
+OP_OR = OPCODES['OR']
+OP_SLT = OPCODES['SLT']
+OP_ADDI = OPCODES['ADDI']
+OP_ANDI = OPCODES['ANDI']
+OP_ORI = OPCODES['ORI']
+OP_LW = OPCODES['LW']
+OP_SW = OPCODES['SW']
+OP_BEQ = OPCODES['BEQ']
+OP_BNE = OPCODES['BNE']
+OP_J = OPCODES['J']
+OP_JAL = OPCODES['JAL']
+OP_JR = OPCODES['JR']
+OP_NOP = OPCODES['NOP']
+
+# Opcode classes
+R_TYPE_OPS = frozenset({OP_ADD, OP_SUB, OP_AND, OP_OR, OP_SLT})
+IMM_ALU_OPS = frozenset({OP_ADDI, OP_ANDI, OP_ORI})
+MEMORY_OPS = frozenset({OP_LW, OP_SW})
+BRANCH_OPS = frozenset({OP_BEQ, OP_BNE})
+JUMP_OPS = frozenset({OP_J, OP_JAL, OP_JR})
+CONTROL_OPS = BRANCH_OPS | JUMP_OPS
+
+# Opcodes whose ALU result is written back (to rd for R-type, rt otherwise)
+WRITEBACK_OPS = R_TYPE_OPS | IMM_ALU_OPS | {OP_LW}
+
+# Opcodes that must wait for a preceding LW (they read rs, and rt if listed);
+# LW/SW read rs for the address and JR for the target
+LOAD_USE_RS_OPS = R_TYPE_OPS | IMM_ALU_OPS | MEMORY_OPS | BRANCH_OPS | {OP_JR}
+LOAD_USE_RT_OPS = R_TYPE_OPS | {OP_SW} | BRANCH_OPS
+
+
+# ALU operations: ALU_FUNCTIONS[opcode](a, b) -> 16-bit result
+# b is rt for R-type, the unsigned immediate for ADDI/ANDI/ORI and the
+# sign-extended offset for LW/SW address calculation.
+
+def _alu_add(a, b):
+    return (a + b) & 0xFFFF
+
+
+def _alu_sub(a, b):
+    return (a - b) & 0xFFFF
+
+
+def _alu_and(a, b):
+    return (a & b) & 0xFFFF
+
+
+def _alu_or(a, b):
+    return (a | b) & 0xFFFF
+
+
+def _alu_slt(a, b):
+    return 1 if a < b else 0
+
+
+ALU_FUNCTIONS = [None] * 16
+for _opcode, _function in ((OP_ADD, _alu_add), (OP_SUB, _alu_sub),
+                           (OP_AND, _alu_and), (OP_OR, _alu_or),
+                           (OP_SLT, _alu_slt), (OP_ADDI, _alu_add),
+                           (OP_ANDI, _alu_and), (OP_ORI, _alu_or),
+                           (OP_LW, _alu_add), (OP_SW, _alu_add)):
+    ALU_FUNCTIONS[_opcode] = _function
+
+
+# Source templates of the register/immediate ALU operations, for engines
+# that compile instructions into Python code ({a}, {b}: operand expressions
+# holding 16-bit values)
+ALU_TEMPLATES = {
+    OP_ADD: "({a} + {b}) & 0xFFFF",
+    OP_SUB: "({a} - {b}) & 0xFFFF",
+    OP_AND: "{a} & {b}",
+    OP_OR: "{a} | {b}",
+    OP_SLT: "1 if {a} < {b} else 0",
+    OP_ADDI: "({a} + {b}) & 0xFFFF",
+    OP_ANDI: "{a} & {b}",
+    OP_ORI: "{a} | {b}",
+}
+
+
+# Branch conditions: BRANCH_CONDITIONS[opcode](rs_value, rt_value) -> taken
+
+def _branch_eq(a, b):
+    return a == b
+
+
+def _branch_ne(a, b):
+    return a != b
+
+
+BRANCH_CONDITIONS = [None] * 16
+BRANCH_CONDITIONS[OP_BEQ] = _branch_eq
+BRANCH_CONDITIONS[OP_BNE] = _branch_ne
+
+
+def sign_extend(value, bits):
+    """Sign extend a value from 'bits' to 16 bits"""
+    sign_bit = 1 << (bits - 1)
+    if value & sign_bit:
+        mask = (1 << bits) - 1
+        return value | (~mask & 0xFFFF)
+    return value
+
+
+class DecodedInstruction:
+    """
+    Pre-decoded instruction fields
+
+    Built once per instruction when a program is loaded so the pipeline
+    never has to slice the binary string again.
+
+    Attributes:
+        opcode, rs, rt, rd: Raw register/opcode fields
+        imm: 6-bit immediate (unsigned)
+        simm: 6-bit immediate sign extended to 16 bits
+        addr: 12-bit jump address
+        reads: Registers checked by the load-use hazard unit
+        dest: Register written back in WB (None if no write)
+    """
+
+    __slots__ = ('opcode', 'rs', 'rt', 'rd', 'imm', 'simm', 'addr', 'reads', 'dest')
+
+    def __init__(self, opcode, rs, rt, rd, imm, addr):
+        self.opcode = opcode
+        self.rs = rs
+        self.rt = rt
+        self.rd = rd
+        self.imm = imm
+        self.simm = sign_extend(imm, 6)
+        self.addr = addr
+
+        # Registers that make this instruction dependent on a preceding LW
+        if opcode in LOAD_USE_RT_OPS:
+            self.reads = (rs, rt)
+        elif opcode in LOAD_USE_RS_OPS:
+            self.reads = (rs,)
+        else:
+            self.reads = ()
+
+        # Register written back in WB
+        if opcode in R_TYPE_OPS:
+            self.dest = rd
+        elif opcode in WRITEBACK_OPS:
+            self.dest = rt
+        else:
+            self.dest = None
+
+    def __repr__(self):
+        name = OPCODE_NAMES.get(self.opcode, 'UNKNOWN')
+        return (f"DecodedInstruction({name}, rs={self.rs}, rt={self.rt}, "
+                f"rd={self.rd}, imm={self.imm}, addr={self.addr})")
+
+
+def to_word(instr):
+    """
+    Convert an instruction to its 16-bit integer encoding
+
+    Args:
+        instr: Integer word or 16-character binary string (legacy format)
+
+    Returns:
+        Integer instruction word
+    """
+    if isinstance(instr, str):
+        return int(instr, 2) & 0xFFFF
+    return instr & 0xFFFF
+
+
+def decode(word):
+    """
+    Decode a 16-bit instruction word
+
+    Args:
+        word: Integer instruction word (binary strings are also accepted)
+
+    Returns:
+        DecodedInstruction
+    """
+    if isinstance(word, str):
+        word = to_word(word)
+    return DecodedInstruction(
+        word >> 12,
+        (word >> 9) & 0x7,
+        (word >> 6) & 0x7,
+        (word >> 3) & 0x7,
+        word & 0x3F,
+        word & 0xFFF
+    )
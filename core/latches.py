@@ -0,0 +1,122 @@
+"""
+MIPS 16-bit Pipeline Latches
+Fixed-layout pipeline registers reused in place every cycle
+"""
+
+class IFIDLatch:
+    """IF/ID pipeline register"""
+
+    __slots__ = ('valid', 'pc', 'instr')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Turn the latch into a bubble"""
+        self.valid = False
+        self.pc = 0
+        self.instr = 0
+
+    def as_dict(self):
+        """Read-only view (None for a bubble)"""
+        if not self.valid:
+            return None
+        return {'instr': self.instr, 'pc': self.pc}
+
+
+class IDEXLatch:
+    """ID/EX pipeline register"""
+
+    # wb_forwards: operands WB wrote after ID read them (bit 0 rs, bit 1 rt)
+    __slots__ = ('valid', 'pc', 'inst', 'rs_value', 'rt_value', 'wb_forwards')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Turn the latch into a bubble"""
+        self.valid = False
+        self.pc = 0
+        self.inst = None
+        self.rs_value = 0
+        self.rt_value = 0
+        self.wb_forwards = 0
+
+    def as_dict(self):
+        """Read-only view (None for a bubble)"""
+        if not self.valid:
+            return None
+        inst = self.inst
+        return {
+            'opcode': inst.opcode,
+            'pc': self.pc,
+            'rs': inst.rs,
+            'rt': inst.rt,
+            'rd': inst.rd,
+            'rs_value': self.rs_value,
+            'rt_value': self.rt_value,
+            'imm': inst.imm,
+            'addr': inst.addr
+        }
+
+
+class EXMEMLatch:
+    """EX/MEM pipeline register"""
+
+    __slots__ = ('valid', 'pc', 'opcode', 'alu_result', 'rt_value', 'rd', 'write_reg')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Turn the latch into a bubble"""
+        self.valid = False
+        self.pc = 0
+        self.opcode = 0
+        self.alu_result = 0
+        self.rt_value = 0
+        self.rd = 0
+        self.write_reg = False
+
+    def as_dict(self):
+        """Read-only view (None for a bubble)"""
+        if not self.valid:
+            return None
+        return {
+            'opcode': self.opcode,
+            'pc': self.pc,
+            'alu_result': self.alu_result,
+            'rt_value': self.rt_value,
+            'rd': self.rd,
+            'write_reg': self.write_reg
+        }
+
+
+class MEMWBLatch:
+    """MEM/WB pipeline register"""
+
+    __slots__ = ('valid', 'pc', 'opcode', 'rd', 'write_data', 'write_reg')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Turn the latch into a bubble"""
+        self.valid = False
+        self.pc = 0
+        self.opcode = 0
+        self.rd = 0
+        self.write_data = 0
+        self.write_reg = False
+
+    def as_dict(self):
+        """Read-only view (None for a bubble)"""
+        if not self.valid:
+            return None
+        return {
+            'opcode': self.opcode,
+            'pc': self.pc,
+            'rd': self.rd,
+            'write_data': self.write_data,
+            'write_reg': self.write_reg
+        }
@@ -0,0 +1,189 @@
+"""
+MIPS 16-bit Data Memory
+array('H')-backed data memory with bulk load/dump helpers
+"""
+
+import sys
+from array import array
+
+DEFAULT_MEMORY_SIZE = 64        # Words, as on the original board
+MAX_MEMORY_SIZE = 1 << 16       # Full 16-bit address space
+
+
+def new_memory(size=DEFAULT_MEMORY_SIZE):
+    """
+    Create a zeroed data memory
+
+    Args:
+        size: Number of 16-bit words (1 to MAX_MEMORY_SIZE). Addresses
+              wrap around modulo the size.
+
+    Returns:
+        array('H')
+    """
+    if not 1 <= size <= MAX_MEMORY_SIZE:
+        raise ValueError(f"Memory size must be between 1 and {MAX_MEMORY_SIZE} words")
+    return array('H', bytes(2 * size))
+
+
+def clear_memory(memory):
+    """Zero a data memory in place (keeps buffers exported by memoryview valid)"""
+    memory[:] = array('H', bytes(2 * len(memory)))
+
+
+def words_to_bytes(words):
+    """array('H') to little-endian bytes"""
+    if sys.byteorder == 'big':
+        words = array('H', words)
+        words.byteswap()
+    return words.tobytes()
+
+
+def words_from_bytes(data):
+    """Little-endian bytes to array('H')"""
+    if len(data) % 2:
+        raise ValueError("Binary image has an odd number of bytes")
+    words = array('H', bytes(data))
+    if sys.byteorder == 'big':
+        words.byteswap()
+    return words
+
+
+def load_words(memory, words, address=0):
+    """
+    Copy words into memory starting at 'address'
+
+    Args:
+        memory: Data memory array
+        words: Sequence of 16-bit values
+        address: First word address
+
+    Returns:
+        Number of words written
+    """
+    words = words if isinstance(words, array) and words.typecode == 'H' else array('H', words)
+    if address < 0 or address + len(words) > len(memory):
+        raise ValueError(f"Image of {len(words)} words at {address} does not fit "
+                         f"in {len(memory)} words of memory")
+    memory[address:address + len(words)] = words
+    return len(words)
+
+
+def load_binary(memory, path, address=0):
+    """
+    Load a raw binary image (little-endian 16-bit words)
+
+    Args:
+        memory: Data memory array
+        path: Image file path
+        address: First word address
+
+    Returns:
+        Number of words loaded
+    """
+    with open(path, 'rb') as f:
+        return load_words(memory, words_from_bytes(f.read()), address)
+
+
+def dump_binary(memory, path, start=0, count=None):
+    """
+    Write memory words to a raw binary image (little-endian 16-bit words)
+
+    Args:
+        memory: Data memory array
+        path: Output file path
+        start: First word address
+        count: Number of words (default: up to the end of memory)
+    """
+    end = len(memory) if count is None else start + count
+    with open(path, 'wb') as f:
+        f.write(words_to_bytes(memory[start:end]))
+
+
+def parse_hex(text):
+    """
+    Parse a hex memory image
+
+    Words are whitespace-separated hex numbers; '#' starts a comment and
+    a Logisim 'v2.0 raw' header line is skipped.
+
+    Args:
+        text: Image text
+
+    Returns:
+        array('H') of words
+    """
+    words = array('H')
+    for line_num, line in enumerate(text.splitlines(), 1):
+        line = line.split('#', 1)[0].strip()
+        if not line or line == 'v2.0 raw':
+            continue
+        for token in line.split():
+            try:
+                value = int(token, 16)
+            except ValueError:
+                raise ValueError(f"Line {line_num}: invalid hex word '{token}'") from None
+            if not 0 <= value <= 0xFFFF:
+                raise ValueError(f"Line {line_num}: word '{token}' does not fit in 16 bits")
+            words.append(value)
+    return words
+
+
+def load_hex(memory, path, address=0):
+    """
+    Load a hex image (see parse_hex)
+
+    Args:
+        memory: Data memory array
+        path: Image file path
+        address: First word address
+
+    Returns:
+        Number of words loaded
+    """
+    with open(path) as f:
+        return load_words(memory, parse_hex(f.read()), address)
+
+
+def dump_hex(memory, path, start=0, count=None, per_line=8, header=None):
+    """
+    Write memory words as a hex image, 'per_line' words per line
+
+    Args:
+        memory: Data memory array
+        path: Output file path
+        start: First word address
+        count: Number of words (default: up to the end of memory)
+        per_line: Words per line
+        header: Optional first line (e.g. 'v2.0 raw' for Logisim)
+    """
+    end = len(memory) if count is None else start + count
+    with open(path, 'w') as f:
+        if header is not None:
+            f.write(header + '\n')
+        for line_start in range(start, end, per_line):
+            line = memory[line_start:min(line_start + per_line, end)]
+            f.write(' '.join(f'{word:04x}' for word in line) + '\n')
+
+
+def load_image(memory, path, address=0):
+    """Load a .hex/.txt image as hex and anything else as raw binary"""
+    if path.lower().endswith(('.hex', '.txt')):
+        return load_hex(memory, path, address)
+    return load_binary(memory, path, address)
+
+
+def to_numpy(memory):
+    """
+    Zero-copy NumPy view of a data memory (requires NumPy)
+
+    Writes through the view change the simulated memory.
+
+    Returns:
+        numpy.ndarray of dtype uint16
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("to_numpy() requires NumPy (pip install numpy)") from None
+    return numpy.frombuffer(memory, dtype=numpy.uint16)
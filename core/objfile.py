@@ -0,0 +1,217 @@
+"""
+MIPS 16-bit Object Files
+Binary container for assembled programs, loaded without re-assembling
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from .assembler import SymbolTable, AssemblerMessage
+from .memory import dump_hex, words_from_bytes, words_to_bytes
+
+# File header: magic, format version, flags, instruction words, data
+# words, debug section bytes, CRC-32 of everything after the header
+OBJECT_MAGIC = b'MOBJ'
+OBJECT_VERSION = 1
+HEADER_STRUCT = struct.Struct('<4sHHIIII')
+
+# Flag bits
+FLAG_DEBUG = 0x01       # Debug section (symbols, line table, messages) present
+
+# Debug section: label count, message count, then the line table
+# (one uint32 source line per instruction), the labels and the messages
+DEBUG_STRUCT = struct.Struct('<II')
+LABEL_STRUCT = struct.Struct('<IBB')     # address, is data label, name length
+MESSAGE_STRUCT = struct.Struct('<IBH')   # line, is error, text length
+
+OBJECT_SUFFIX = '.mobj'
+
+
+class ObjectFile:
+    """
+    Assembled program: instruction words, initial data memory image and,
+    optionally, the assembler's symbol table and messages
+
+    PipelinedCPU/FunctionalCPU.load_program() accept an ObjectFile and
+    preload its data segment. Files are read through a memory map and
+    checked against their CRC-32 before use.
+
+    Attributes:
+        instructions: array('H') of instruction words
+        data: array('H') data memory image (loaded from address 0)
+        symbols: SymbolTable, or None if the file has no debug section
+        messages: AssemblerMessage list from assembly
+    """
+
+    def __init__(self, instructions, data=(), symbols=None, messages=()):
+        self.instructions = array('H', instructions)
+        self.data = array('H', data)
+        self.symbols = symbols
+        self.messages = list(messages)
+
+    def to_bytes(self):
+        """Serialise to the object file format"""
+        payload = [words_to_bytes(self.instructions), words_to_bytes(self.data)]
+
+        flags = 0
+        debug_size = 0
+        if self.symbols is not None:
+            flags |= FLAG_DEBUG
+            debug = self._debug_bytes()
+            debug_size = len(debug)
+            payload.append(debug)
+
+        payload = b''.join(payload)
+        header = HEADER_STRUCT.pack(OBJECT_MAGIC, OBJECT_VERSION, flags,
+                                    len(self.instructions), len(self.data),
+                                    debug_size, zlib.crc32(payload))
+        return header + payload
+
+    def _debug_bytes(self):
+        """
+        Line table, labels and messages
+
+        Raises:
+            ValueError: A label name is longer than 255 bytes (UTF-8)
+        """
+        symbols = self.symbols
+        lines = array('I', symbols.pc_lines)
+        if sys.byteorder == 'big':
+            lines.byteswap()
+        parts = [DEBUG_STRUCT.pack(len(symbols.labels), len(self.messages)),
+                 lines.tobytes()]
+
+        for name, address in symbols.labels.items():
+            encoded = name.encode('utf-8')
+            if len(encoded) > 255:
+                raise ValueError(f"Label '{name[:32]}...' is too long for an object file "
+                                 f"({len(encoded)} bytes, at most 255)")
+            parts.append(LABEL_STRUCT.pack(address, name in symbols.data_labels, len(encoded)))
+            parts.append(encoded)
+
+        for message in self.messages:
+            # Cut long texts on a character boundary, so they still decode
+            text = message.text.encode('utf-8')
+            if len(text) > 0xFFFF:
+                text = text[:0xFFFF].decode('utf-8', 'ignore').encode('utf-8')
+            parts.append(MESSAGE_STRUCT.pack(message.line, message.severity == 'error', len(text)))
+            parts.append(text)
+
+        return b''.join(parts)
+
+    def save(self, path):
+        """
+        Write the object file
+
+        The file is written under a temporary name and renamed, so
+        concurrent readers never see a partial file.
+
+        Raises:
+            ValueError: The program cannot be stored (see _debug_bytes)
+        """
+        contents = self.to_bytes()
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, 'wb') as f:
+            f.write(contents)
+        os.replace(temp, path)
+
+    @classmethod
+    def from_bytes(cls, buffer, name='object'):
+        """
+        Parse an object file image
+
+        Args:
+            buffer: bytes-like object (e.g. an mmap)
+            name: Name used in error messages
+
+        Returns:
+            ObjectFile
+        """
+        view = memoryview(buffer)
+        try:
+            if len(view) < HEADER_STRUCT.size:
+                raise ValueError(f"{name}: not an object file (too short)")
+
+            (magic, version, flags, code_words, data_words,
+             debug_size, checksum) = HEADER_STRUCT.unpack_from(view)
+            if magic != OBJECT_MAGIC:
+                raise ValueError(f"{name}: not an object file (bad magic)")
+            if version != OBJECT_VERSION:
+                raise ValueError(f"{name}: unsupported object file version {version}")
+
+            code_end = HEADER_STRUCT.size + 2 * code_words
+            data_end = code_end + 2 * data_words
+            if len(view) != data_end + debug_size:
+                raise ValueError(f"{name}: object file is truncated or has trailing data")
+            if zlib.crc32(view[HEADER_STRUCT.size:]) != checksum:
+                raise ValueError(f"{name}: object file checksum mismatch")
+
+            program = cls(words_from_bytes(view[HEADER_STRUCT.size:code_end]),
+                          words_from_bytes(view[code_end:data_end]))
+            if flags & FLAG_DEBUG:
+                program._load_debug(view[data_end:], code_words)
+            return program
+        finally:
+            view.release()
+
+    def _load_debug(self, view, code_words):
+        """Rebuild the symbol table and messages from the debug section"""
+        label_count, message_count = DEBUG_STRUCT.unpack_from(view)
+        offset = DEBUG_STRUCT.size
+
+        self.symbols = symbols = SymbolTable()
+        symbols.pc_lines.frombytes(view[offset:offset + 4 * code_words])
+        if sys.byteorder == 'big':
+            symbols.pc_lines.byteswap()
+        offset += 4 * code_words
+
+        for _ in range(label_count):
+            address, is_data, length = LABEL_STRUCT.unpack_from(view, offset)
+            offset += LABEL_STRUCT.size
+            name = bytes(view[offset:offset + length]).decode('utf-8')
+            offset += length
+            symbols.labels[name] = address
+            if is_data:
+                symbols.data_labels.add(name)
+
+        for _ in range(message_count):
+            line, is_error, length = MESSAGE_STRUCT.unpack_from(view, offset)
+            offset += MESSAGE_STRUCT.size
+            text = bytes(view[offset:offset + length]).decode('utf-8')
+            offset += length
+            self.messages.append(AssemblerMessage(line, 'error' if is_error else 'warning', text))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an object file through a memory map
+
+        Args:
+            path: Object file path
+
+        Returns:
+            ObjectFile
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls.from_bytes(b'', path)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return cls.from_bytes(mapped, path)
+
+    def save_logisim(self, path, segment='code'):
+        """
+        Write a Logisim 'v2.0 raw' hex image of the instructions (for the
+        16-bit ROM in CORG.circ) or of the data segment (for its RAM)
+
+        Args:
+            path: Output file path
+            segment: 'code' or 'data'
+        """
+        if segment not in ('code', 'data'):
+            raise ValueError(f"Unknown segment '{segment}' (choose from code, data)")
+        words = self.instructions if segment == 'code' else self.data
+        dump_hex(words, path, header='v2.0 raw')
@@ -0,0 +1,98 @@
+"""
+MIPS 16-bit Per-PC Profile
+List-backed counters showing which instructions cost cycles
+"""
+
+from array import array
+
+# Counter names, in report column order
+COUNTERS = ('executions', 'stalls', 'flushes', 'forwards', 'mem_reads', 'mem_writes')
+
+
+class PCProfile:
+    """
+    Per-instruction counters collected by PipelinedCPU.step()
+
+    The pipeline stages bump the counters where the events happen, so a
+    cycle with profiling enabled costs one counter increment in EX plus
+    one for each memory access, stall, flush or forward. The counters
+    are lists: bumping an array('Q') element converts the value out of
+    and back into a C integer, which makes it about twice as slow.
+
+    One list per counter, indexed by instruction address:
+        executions: Times the instruction went through EX
+        stalls: Load-use stall cycles caused by this LW
+        flushes: Taken branches/jumps (each flushes the fetched instruction)
+        forwards: Operands forwarded to this instruction in EX
+        mem_reads, mem_writes: Data memory accesses made in MEM
+
+    Counters cover the cycles up to the CPU's current one: with each CPU
+    checkpoint the profile saves a compact copy of its counters (save),
+    and seek()/step_back() put them back (rewind) before replaying, so
+    replayed cycles are not counted twice.
+
+    EX also keeps 'peak', the highest execution count, so displays
+    scaling by it need no pass over the whole program.
+    """
+
+    def __init__(self, size=0):
+        self.resize(size)
+
+    def resize(self, size):
+        """Clear all counters and size them for 'size' instructions"""
+        self.size = size
+        for name in COUNTERS:
+            setattr(self, name, [0] * size)
+        self.peak = 0
+        self.checkpoints = {}  # Cycle -> (counters as array('Q'), peak)
+
+    def clear(self):
+        """Zero all counters (and drop the saved ones)"""
+        self.resize(self.size)
+
+    def save(self, cycle):
+        """Save the counters as they are at the end of 'cycle'"""
+        self.checkpoints[cycle] = ([array('Q', getattr(self, name)) for name in COUNTERS],
+                                   self.peak)
+
+    def rewind(self, cycle):
+        """
+        Put back the counters saved for 'cycle'
+
+        The lists are updated in place. Without a saved copy (the
+        counters were cleared after that cycle) they restart from zero.
+        """
+        saved = self.checkpoints.get(cycle)
+        if saved is None:
+            counters = [bytes(8 * self.size)] * len(COUNTERS)
+            saved = [array('Q', zeros) for zeros in counters], 0
+        counters, self.peak = saved
+        for name, values in zip(COUNTERS, counters):
+            getattr(self, name)[:] = values
+
+    def hot_instructions(self, key='executions', limit=None):
+        """
+        Instructions sorted by a counter, highest first
+
+        Args:
+            key: Counter name to sort by (see COUNTERS)
+            limit: Maximum number of entries (None for all)
+
+        Returns:
+            List of dicts with 'pc' and every counter, skipping
+            instructions whose counters are all zero
+        """
+        if key not in COUNTERS:
+            raise ValueError(f"Unknown profile counter '{key}' (choose from {', '.join(COUNTERS)})")
+
+        columns = [getattr(self, name) for name in COUNTERS]
+        rows = []
+        for pc in range(self.size):
+            values = [column[pc] for column in columns]
+            if any(values):
+                row = {'pc': pc}
+                row.update(zip(COUNTERS, values))
+                rows.append(row)
+
+        rows.sort(key=lambda row: (-row[key], row['pc']))
+        return rows if limit is None else rows[:limit]
@@ -0,0 +1,283 @@
+"""
+MIPS 16-bit Batch Runner
+Assembles and executes programs without any GUI dependency
+"""
+
+import hashlib
+import os
+from array import array
+
+from .assembler import Assembler
+from .cpu import PipelinedCPU
+from .functional import FunctionalCPU
+from .blocks import BlockCachedCPU
+from .profile import COUNTERS
+from .memory import DEFAULT_MEMORY_SIZE, load_words
+from .objfile import ObjectFile, OBJECT_VERSION, OBJECT_SUFFIX
+
+DEFAULT_MAX_CYCLES = 100000
+
+ENGINES = {
+    'pipelined': PipelinedCPU,
+    'functional': FunctionalCPU,
+    'blocks': BlockCachedCPU,
+}
+
+
+class BatchRunner:
+    """
+    Runs many programs through one Assembler and one CPU instance
+
+    Each program is assembled, loaded (which resets the CPU) and run
+    until is_program_complete() or the cycle cap, and its results are
+    returned as a JSON-serialisable dict.
+
+    With profile_top > 0 the pipelined engine also collects per-PC
+    counters and each result lists its hottest instructions. With a
+    dcache (core.cache.CacheConfig) it models a data cache, whose
+    counters appear under stats['dcache']; likewise an icache models an
+    instruction cache (stats['icache']).
+
+    A program's .data section is copied into data memory after it is
+    loaded. Optional data words (e.g. an image read with
+    core.memory.load_image) are copied in after that, on top of the
+    .data words.
+
+    Object files (.mobj) run without assembling. With a cache_dir, each
+    assembled source is saved there as an object file named by the
+    hash of its text, and unchanged sources are loaded from it instead
+    of being assembled again.
+    """
+
+    def __init__(self, engine='pipelined', max_cycles=DEFAULT_MAX_CYCLES,
+                 profile_top=0, profile_sort='executions',
+                 memory_size=DEFAULT_MEMORY_SIZE, data=None, cache_dir=None,
+                 dcache=None, icache=None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' (choose from {', '.join(ENGINES)})")
+        if profile_top and engine != 'pipelined':
+            raise ValueError("Profiling needs the pipelined engine")
+        if dcache is not None and engine != 'pipelined':
+            raise ValueError("The data cache model needs the pipelined engine")
+        if icache is not None and engine != 'pipelined':
+            raise ValueError("The instruction cache model needs the pipelined engine")
+        if profile_sort not in COUNTERS:
+            raise ValueError(f"Unknown profile counter '{profile_sort}' (choose from {', '.join(COUNTERS)})")
+        if data is not None and len(data) > memory_size:
+            raise ValueError(f"Data image of {len(data)} words does not fit "
+                             f"in {memory_size} words of memory")
+
+        self.engine = engine
+        self.max_cycles = max_cycles
+        self.profile_top = profile_top
+        self.profile_sort = profile_sort
+        self.assembler = Assembler()
+        self.cpu = ENGINES[engine](memory_size)
+        if profile_top:
+            self.cpu.enable_profiling()
+        if dcache is not None:
+            self.cpu.enable_data_cache(dcache)
+        if icache is not None:
+            self.cpu.enable_instruction_cache(icache)
+
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self.data = None if data is None else array('H', data)
+
+    def run_source(self, code_text):
+        """
+        Assemble and execute assembly source
+
+        Args:
+            code_text: String containing assembly code
+
+        Returns:
+            Result dict with stats, registers and memory
+        """
+        return self.run_object(self.compile(code_text))
+
+    def compile(self, code_text):
+        """
+        Assemble source into an ObjectFile, through the cache if enabled
+
+        Args:
+            code_text: String containing assembly code
+
+        Returns:
+            ObjectFile
+        """
+        if self.cache_dir is None:
+            return self.assembler.assemble_object(code_text)
+
+        key = hashlib.sha256(b'%d:' % OBJECT_VERSION + code_text.encode('utf-8')).hexdigest()
+        path = os.path.join(self.cache_dir, key + OBJECT_SUFFIX)
+        try:
+            return ObjectFile.load(path)
+        except (OSError, ValueError):
+            pass  # Not cached yet (or unreadable): assemble it again
+
+        program = self.assembler.assemble_object(code_text)
+        try:
+            program.save(path)
+        except ValueError:
+            pass  # Cannot be stored (e.g. an over-long label): run it uncached
+        return program
+
+    def run_object(self, program):
+        """
+        Execute an assembled program
+
+        Args:
+            program: ObjectFile
+
+        Returns:
+            Result dict with stats, registers and memory
+        """
+        cpu = self.cpu
+        cpu.load_program(program)  # Also preloads the .data segment
+        if self.data is not None:
+            load_words(cpu.memory, self.data)
+
+        if self.engine != 'pipelined':
+            cpu.run(self.max_cycles)
+        else:
+            while not cpu.is_program_complete() and cpu.cycle < self.max_cycles:
+                cpu.step()
+
+        result = {
+            'completed': cpu.is_program_complete(),
+            'stats': cpu.get_stats(),
+            'pc': cpu.pc,
+            'registers': list(cpu.registers),
+            'memory': cpu.memory.tolist(),
+            'warnings': [str(message) for message in program.messages],
+        }
+        if self.profile_top:
+            result['hot_instructions'] = self.hot_instructions()
+
+        return result
+
+    def hot_instructions(self):
+        """
+        Hottest instructions of the last program run
+
+        Returns:
+            Up to profile_top dicts (pc, disassembly and counters),
+            sorted by profile_sort
+        """
+        cpu = self.cpu
+        rows = cpu.profile.hot_instructions(self.profile_sort, self.profile_top)
+        for row in rows:
+            row['instruction'] = self.assembler.disassemble(cpu.instr_mem[row['pc']])
+        return rows
+
+    def run_file(self, path):
+        """
+        Assemble and execute an assembly file, or execute an object file
+
+        Args:
+            path: Path to a .asm (or .mobj) file
+
+        Returns:
+            Result dict tagged with the file name ('error' set on failure)
+        """
+        result = {'file': path}
+        try:
+            if path.endswith(OBJECT_SUFFIX):
+                result.update(self.run_object(ObjectFile.load(path)))
+            else:
+                with open(path) as f:
+                    code_text = f.read()
+                result.update(self.run_source(code_text))
+        except Exception as e:
+            result['error'] = str(e)
+
+        return result
+
+
+def default_workers():
+    """Number of CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# Per-process runner used by run_batch workers
+_worker_runner = None
+
+
+def _init_worker(options):
+    """Create the runner once per worker process"""
+    global _worker_runner
+    _worker_runner = BatchRunner(**options)
+
+
+def _run_chunk(paths):
+    """Run a chunk of files in a worker process"""
+    return [_worker_runner.run_file(path) for path in paths]
+
+
+def run_batch(paths, engine='pipelined', max_cycles=DEFAULT_MAX_CYCLES,
+              workers=None, ordered=True, chunksize=8,
+              profile_top=0, profile_sort='executions',
+              memory_size=DEFAULT_MEMORY_SIZE, data=None, cache_dir=None,
+              dcache=None, icache=None):
+    """
+    Run many assembly files across a pool of worker processes
+
+    Worker processes are started once and each keeps its own Assembler
+    and CPU, so per-program cost is only assembly and execution. Results
+    are yielded as soon as their chunk finishes.
+
+    Args:
+        paths: Iterable of .asm file paths
+        engine: Engine name (see ENGINES)
+        max_cycles: Cycle cap per program
+        workers: Number of worker processes (default: one per usable CPU);
+                 1 runs everything in the calling process
+        ordered: Yield results in input order (otherwise as completed)
+        chunksize: Files sent to a worker per task
+        profile_top: Hot instructions to report per program (0 disables)
+        profile_sort: Profile counter the hot instructions are sorted by
+        memory_size: Data memory words per CPU
+        data: Optional data memory words (at most memory_size) copied
+              in before each program runs
+        cache_dir: Directory of assembled object files keyed by source
+                   hash (None disables the cache)
+        dcache: Optional core.cache.CacheConfig for a data cache model
+                (pipelined engine)
+        icache: Optional core.cache.CacheConfig for an instruction cache
+                model (pipelined engine)
+
+    Yields:
+        Result dicts, as returned by BatchRunner.run_file
+    """
+    paths = list(paths)
+    workers = workers or default_workers()
+
+    options = dict(engine=engine, max_cycles=max_cycles,
+                   profile_top=profile_top, profile_sort=profile_sort,
+                   memory_size=memory_size, data=data,
+                   cache_dir=cache_dir, dcache=dcache, icache=icache)
+
+    if workers == 1 or len(paths) <= 1:
+        runner = BatchRunner(**options)
+        for path in paths:
+            yield runner.run_file(path)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(options,)) as pool:
+        if ordered:
+            for results in pool.map(_run_chunk, chunks):
+                yield from results
+        else:
+            futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
@@ -0,0 +1,229 @@
+"""
+MIPS 16-bit Execution Trace
+Fixed-width binary per-cycle records for PipelinedCPU
+"""
+
+import mmap
+import struct
+from collections import namedtuple
+
+from .isa import OP_SW, OP_JAL
+
+# File header: magic, format version, record size
+TRACE_MAGIC = b'MTRC'
+TRACE_VERSION = 1
+HEADER_STRUCT = struct.Struct('<4sHH')
+
+# One record per cycle (little-endian, 23 bytes):
+# cycle, pc of the instruction in IF/ID, ID/EX, EX/MEM, MEM/WB and the one
+# retired by WB (BUBBLE_PC for an empty slot), flags, forwarding sources,
+# register write (index, value) and memory write (address, value)
+RECORD_STRUCT = struct.Struct('<I5HBBBHHH')
+
+BUBBLE_PC = 0xFFFF
+
+# Flag bits
+FLAG_STALL = 0x01
+FLAG_FLUSH = 0x02
+FLAG_REG_WRITE = 0x04
+FLAG_MEM_WRITE = 0x08
+FLAG_LINK = 0x10        # JAL in EX set r7 = ex_pc + 1 (after any WB write)
+FLAG_MEM_STALL = 0x20   # MEM waited for the data cache (no access made)
+FLAG_FETCH_STALL = 0x40  # IF waited for the instruction cache (fetch miss)
+
+# Forwarding byte: ForwardSource of rs in bits 0-1, of rt in bits 2-3
+
+TraceRecord = namedtuple('TraceRecord', [
+    'cycle', 'if_pc', 'id_pc', 'ex_pc', 'mem_pc', 'wb_pc',
+    'flags', 'forward', 'reg', 'reg_value', 'mem_addr', 'mem_value'
+])
+
+
+class TraceWriter:
+    """
+    Streams one trace record per cycle to a binary file
+
+    Records are packed into an in-memory buffer and written out whenever
+    it grows past 'buffer_size', so long traces never sit in RAM.
+
+    Usage:
+        with TraceWriter('run.trace') as tracer:
+            cpu.set_tracer(tracer)
+            ...
+    """
+
+    def __init__(self, path, buffer_size=1 << 20):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.records = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER_STRUCT.pack(TRACE_MAGIC, TRACE_VERSION, RECORD_STRUCT.size))
+        self._buffer = bytearray()
+
+        # Latch contents the next cycle's MEM and WB stages will consume
+        self._pending_store = None   # (address, value) or None
+        self._pending_write = None   # (pc, rd, value, write_reg) or None
+
+    def attach(self, cpu):
+        """Capture the latches the next cycle's MEM and WB stages consume"""
+        EX_MEM = cpu.EX_MEM
+        if EX_MEM.valid and EX_MEM.opcode == OP_SW:
+            self._pending_store = (EX_MEM.alu_result % len(cpu.memory),
+                                   EX_MEM.rt_value & 0xFFFF)
+        else:
+            self._pending_store = None
+
+        MEM_WB = cpu.MEM_WB
+        if MEM_WB.valid:
+            self._pending_write = (MEM_WB.pc, MEM_WB.rd,
+                                   MEM_WB.write_data & 0xFFFF,
+                                   MEM_WB.write_reg and MEM_WB.rd != 0)
+        else:
+            self._pending_write = None
+
+    def record(self, cpu):
+        """Append the record for the cycle cpu.step() just finished"""
+        flags = 0
+        if cpu.stall:
+            flags |= FLAG_STALL
+        if cpu.flush:
+            flags |= FLAG_FLUSH
+        if cpu.mem_stall:
+            flags |= FLAG_MEM_STALL
+        if cpu.icache is not None and cpu.fetch_stall:
+            flags |= FLAG_FETCH_STALL
+
+        # WB retired what MEM/WB held before this cycle
+        reg = reg_value = 0
+        wb_pc = BUBBLE_PC
+        if self._pending_write is not None:
+            wb_pc, rd, value, write_reg = self._pending_write
+            if write_reg:
+                flags |= FLAG_REG_WRITE
+                reg = rd
+                reg_value = value
+
+        # MEM stored what EX/MEM held before this cycle
+        mem_addr = mem_value = 0
+        if self._pending_store is not None and not cpu.mem_stall:
+            flags |= FLAG_MEM_WRITE
+            mem_addr, mem_value = self._pending_store
+
+        forwarding = cpu.forwarding
+        forward = forwarding[0] | forwarding[1] << 2
+
+        IF_ID = cpu.IF_ID
+        ID_EX = cpu.ID_EX
+        EX_MEM = cpu.EX_MEM
+        MEM_WB = cpu.MEM_WB
+        if EX_MEM.valid and EX_MEM.opcode == OP_JAL:
+            flags |= FLAG_LINK
+
+        self._buffer += RECORD_STRUCT.pack(
+            cpu.cycle & 0xFFFFFFFF,
+            IF_ID.pc if IF_ID.valid else BUBBLE_PC,
+            ID_EX.pc if ID_EX.valid else BUBBLE_PC,
+            EX_MEM.pc if EX_MEM.valid else BUBBLE_PC,
+            MEM_WB.pc if MEM_WB.valid else BUBBLE_PC,
+            wb_pc, flags, forward, reg, reg_value, mem_addr, mem_value
+        )
+        self.records += 1
+
+        self.attach(cpu)
+
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records to the file"""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the trace file"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TraceReader:
+    """
+    Random access to a trace file through a read-only memory map
+
+    Records are decoded on demand, so opening a multi-million-cycle
+    trace is instant. trace[i] is the i-th record; at_cycle() looks a
+    record up by cycle number for traces recorded without rewinding.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER_STRUCT.size:
+            self.close()
+            raise ValueError(f"{path}: not a trace file (too short)")
+
+        magic, version, record_size = HEADER_STRUCT.unpack_from(self._map)
+        if magic != TRACE_MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a trace file (bad magic)")
+        if version != TRACE_VERSION or record_size != RECORD_STRUCT.size:
+            self.close()
+            raise ValueError(f"{path}: unsupported trace version {version}")
+
+        self._count = (len(self._map) - HEADER_STRUCT.size) // RECORD_STRUCT.size
+        self._first_cycle = self[0].cycle if self._count else 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("trace record index out of range")
+        offset = HEADER_STRUCT.size + index * RECORD_STRUCT.size
+        return TraceRecord._make(RECORD_STRUCT.unpack_from(self._map, offset))
+
+    def __iter__(self):
+        view = memoryview(self._map)[HEADER_STRUCT.size:
+                                     HEADER_STRUCT.size + self._count * RECORD_STRUCT.size]
+        try:
+            for values in RECORD_STRUCT.iter_unpack(view):
+                yield TraceRecord._make(values)
+        finally:
+            view.release()
+
+    def at_cycle(self, cycle):
+        """
+        Get the record for a cycle
+
+        Args:
+            cycle: Cycle number as counted by PipelinedCPU.cycle
+
+        Returns:
+            TraceRecord
+        """
+        index = cycle - self._first_cycle
+        if index < 0:
+            raise IndexError(f"cycle {cycle} is before the start of the trace")
+        return self[index]
+
+    def close(self):
+        """Release the memory map"""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,209 @@
+"""
+MIPS 16-bit Vector CPU
+Lockstep functional execution of many CPU states at once (requires NumPy)
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("core.vector requires NumPy (pip install numpy)") from None
+
+from array import array
+
+from .memory import DEFAULT_MEMORY_SIZE, MAX_MEMORY_SIZE
+from .objfile import ObjectFile
+from .isa import (OP_SLT, OP_LW, OP_SW, OP_J, OP_JAL, OP_JR,
+                  R_TYPE_OPS, IMM_ALU_OPS, BRANCH_OPS,
+                  ALU_FUNCTIONS, BRANCH_CONDITIONS, decode, to_word)
+
+
+# ALU operations on uint16 lane arrays. The core.isa functions already
+# work element-wise (uint16 arithmetic wraps like the & 0xFFFF mask);
+# only SLT needs an array form of its conditional.
+
+def _alu_slt(a, b):
+    return (a < b).astype(np.uint16)
+
+
+VECTOR_ALU_FUNCTIONS = list(ALU_FUNCTIONS)
+VECTOR_ALU_FUNCTIONS[OP_SLT] = _alu_slt
+
+
+class VectorCPU:
+    """
+    16-bit MIPS Lockstep CPU Implementation
+
+    Runs one program on N independent architectural states held as NumPy
+    arrays: registers (N, 8), memory (N, M) and pc (N,), all uint16
+    except pc. Each step applies one instruction to every lane at the
+    same pc; lanes that diverge at a branch are grouped by pc and updated
+    through masks. Every lane ends in the state FunctionalCPU would reach
+    from the same initial registers and memory.
+
+    Set per-lane initial state by writing into the arrays after
+    load_program(), which clears them.
+    """
+
+    def __init__(self, lanes, memory_size=DEFAULT_MEMORY_SIZE):
+        if lanes < 1:
+            raise ValueError("VectorCPU needs at least one lane")
+        if not 1 <= memory_size <= MAX_MEMORY_SIZE:
+            raise ValueError(f"Memory size must be between 1 and {MAX_MEMORY_SIZE} words")
+
+        # Hardware Components (one row per lane)
+        self.lanes = lanes
+        self.memory_size = memory_size
+        self.registers = np.zeros((lanes, 8), dtype=np.uint16)
+        self.memory = np.zeros((lanes, memory_size), dtype=np.uint16)
+        self.pc = np.zeros(lanes, dtype=np.int64)
+        self.instr_mem = array('H')  # Instruction memory (16-bit words)
+        self.decoded = []            # Pre-decoded instruction memory
+
+        # Statistics (per lane)
+        self.total_instructions = np.zeros(lanes, dtype=np.int64)
+
+        self._all = np.arange(lanes)
+
+    def reset(self):
+        """Reset every lane to the initial state"""
+        # Clear in place so callers holding references stay in sync
+        self.registers.fill(0)
+        self.memory.fill(0)
+        self.pc.fill(0)
+        self.total_instructions.fill(0)
+
+    def load_program(self, instructions):
+        """
+        Load program into instruction memory and pre-decode it
+
+        Args:
+            instructions: Sequence of 16-bit instruction words
+                          (binary strings are also accepted), or an
+                          ObjectFile whose data segment is preloaded
+                          into every lane
+        """
+        if isinstance(instructions, ObjectFile):
+            program = instructions
+            self.instr_mem = array('H', program.instructions)
+        else:
+            program = None
+            self.instr_mem = array('H', [to_word(instr) for instr in instructions])
+        self.decoded = [decode(instr) for instr in self.instr_mem]
+        self.reset()
+        if program is not None:
+            if len(program.data) > self.memory_size:
+                raise ValueError(f"Data segment of {len(program.data)} words does not fit "
+                                 f"in {self.memory_size} words of memory")
+            self.memory[:, :len(program.data)] = program.data
+
+    def _execute(self, d, lanes):
+        """Apply one decoded instruction to the lanes (index array) at its pc"""
+        regs = self.registers
+        opcode = d.opcode
+        next_pc = (self.pc[lanes] + 1) & 0xFFF
+
+        if opcode in R_TYPE_OPS:
+            if d.dest:
+                regs[lanes, d.dest] = VECTOR_ALU_FUNCTIONS[opcode](
+                    regs[lanes, d.rs], regs[lanes, d.rt])
+        elif opcode in IMM_ALU_OPS:
+            if d.dest:
+                regs[lanes, d.dest] = VECTOR_ALU_FUNCTIONS[opcode](
+                    regs[lanes, d.rs], d.imm)
+        elif opcode == OP_LW or opcode == OP_SW:
+            addr = ((regs[lanes, d.rs].astype(np.int64) + d.simm)
+                    & 0xFFFF) % self.memory_size
+            if opcode == OP_LW:
+                if d.dest:
+                    regs[lanes, d.dest] = self.memory[lanes, addr]
+            else:
+                self.memory[lanes, addr] = regs[lanes, d.rt]
+        elif opcode in BRANCH_OPS:
+            taken = BRANCH_CONDITIONS[opcode](regs[lanes, d.rs], regs[lanes, d.rt])
+            next_pc = np.where(taken, (next_pc + d.simm) & 0xFFF, next_pc)
+        elif opcode == OP_J:
+            next_pc = d.addr
+        elif opcode == OP_JAL:
+            regs[lanes, 7] = next_pc
+            next_pc = d.addr
+        elif opcode == OP_JR:
+            next_pc = regs[lanes, d.rs] & 0xFFF
+
+        self.pc[lanes] = next_pc
+
+    def step(self):
+        """
+        Execute one instruction on every running lane
+
+        Returns:
+            Number of lanes that executed an instruction
+        """
+        return self._step(len(self.decoded), None)
+
+    def _step(self, end, max_instructions):
+        """One lockstep round, skipping lanes at their instruction cap"""
+        pc = self.pc
+        running = pc < end
+        if max_instructions is not None:
+            running &= self.total_instructions < max_instructions
+        lanes = self._all[running]
+        if not len(lanes):
+            return 0
+
+        lane_pcs = pc[lanes]
+        first = lane_pcs[0]
+        if (lane_pcs == first).all():
+            self._execute(self.decoded[first], lanes)
+        else:
+            # Divergent lanes: one masked update per distinct pc
+            for target in np.unique(lane_pcs):
+                self._execute(self.decoded[target], lanes[lane_pcs == target])
+
+        self.total_instructions[lanes] += 1
+        return len(lanes)
+
+    def run(self, max_instructions=None):
+        """
+        Execute until every lane completes
+
+        Args:
+            max_instructions: Optional cap on instructions executed per lane
+
+        Returns:
+            Number of lockstep rounds executed
+        """
+        end = len(self.decoded)
+        rounds = 0
+        while self._step(end, max_instructions):
+            rounds += 1
+        return rounds
+
+    def is_program_complete(self):
+        """Check if every lane has finished the program"""
+        return bool((self.pc >= len(self.instr_mem)).all())
+
+    def get_lane(self, lane):
+        """
+        Architectural state of one lane
+
+        Args:
+            lane: Lane index
+
+        Returns:
+            Dict with pc, registers, memory and stats, as plain Python
+            values (matching FunctionalCPU results)
+        """
+        instructions = int(self.total_instructions[lane])
+        return {
+            'pc': int(self.pc[lane]),
+            'registers': self.registers[lane].tolist(),
+            'memory': self.memory[lane].tolist(),
+            'stats': {
+                'cycles': instructions,
+                'instructions': instructions,
+                'stalls': 0,
+                'flushes': 0,
+                'forwards': 0,
+                'cpi': 1.0 if instructions else 0.0
+            },
+        }
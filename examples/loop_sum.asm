@@ -0,0 +1,17 @@
+# Loop Example: sum 40 + 39 + ... + 1 with a counted loop
+# Branch offsets are relative to the next instruction (PC + 1)
+ADDI r1, r0, 40     # r1 = counter
+ADDI r3, r0, 1      # r3 = 1 (decrement)
+NOP
+NOP
+ADD r2, r2, r1      # loop: r2 += r1
+SUB r1, r1, r3      # r1 -= 1
+NOP
+NOP
+BNE r1, r0, -5      # if r1 != 0, back to loop
+NOP
+NOP
+SW r2, 0(r0)        # MEM[0] = 820
+NOP
+NOP
+NOP
@@ -0,0 +1,26 @@
+# Table Sum: add up the words of a table preloaded by .data
+# Branches and jumps name labels; LW/SW/ADDI may use data labels (0-63)
+.data
+count:  .word 5
+table:  .word 10, 20, 30, 40, 50
+result: .word 0
+
+.text
+        LW r1, count(r0)     # r1 = number of words
+        ADDI r3, r0, 1       # r3 = 1 (decrement)
+        ADDI r4, r0, table   # r4 = address of the first word
+        NOP
+        NOP
+loop:   LW r5, 0(r4)         # r5 = next word
+        ADDI r4, r4, 1       # advance the pointer
+        SUB r1, r1, r3       # one word fewer left
+        ADD r2, r2, r5       # r2 += word
+        NOP
+        BNE r1, r0, loop     # more words?
+        NOP
+        NOP
+        SW r2, result(r0)    # MEM[result] = 150
+        J done
+        NOP
+        NOP
+done:   NOP
@@ -1,8 +1,34 @@
 """
 MIPS Simulator - GUI Package
 Frontend components for the simulator
+
+Components are imported on first access, so importing the package does
+not load Tk until a window or panel is actually needed.
 """
 
-from .main_window import MainWindow
+import importlib
+
+_COMPONENTS = {
+    'MainWindow': '.main_window',
+    'CodeEditor': '.code_editor',
+    'StatsPanel': '.stats_panel',
+    'RegistersPanel': '.registers_panel',
+    'PipelinePanel': '.pipeline_panel',
+    'MemoryPanel': '.memory_panel',
+    'VirtualTable': '.virtual_table',
+}
+
+__all__ = list(_COMPONENTS)
+
+
+def __getattr__(name):
+    if name in _COMPONENTS:
+        module = importlib.import_module(_COMPONENTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ['MainWindow']
+def __dir__():
+    return sorted(list(globals()) + __all__)
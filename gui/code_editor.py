@@ -90,15 +90,10 @@ class CodeEditor(ttk.Frame):
         """Highlight current instruction line"""
         self.text_widget.tag_remove("current_line", '1.0', tk.END)
         
-        # Find actual code line (skip comments and empty lines)
-        code_lines = []
-        for i, line in enumerate(self.get_text().split('\n'), 1):
-            clean_line = line.split('#')[0].strip()
-            if clean_line:
-                code_lines.append(i)
+        # Source line recorded by the assembler for this PC
+        actual_line = self.assembler.symbols.line_for_pc(pc)
         
-        if pc < len(code_lines):
-            actual_line = code_lines[pc]
+        if actual_line is not None:
             self.text_widget.tag_add("current_line", f"{actual_line}.0", f"{actual_line}.end")
             self.text_widget.see(f"{actual_line}.0")
     
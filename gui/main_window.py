@@ -3,6 +3,7 @@ Main Window GUI for MIPS Simulator
 Contains the main application window and layout
 """
 
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 from .code_editor import CodeEditor
@@ -10,14 +11,33 @@ from .stats_panel import StatsPanel
 from .registers_panel import RegistersPanel
 from .pipeline_panel import PipelinePanel
 from .memory_panel import MemoryPanel
+from core.memory import load_words
 
 class MainWindow:
     """Main application window"""
     
+    # Run All pacing: CPU time per scheduled chunk and display refresh rate
+    RUN_SLICE_SECONDS = 0.03
+    RUN_REFRESH_FPS = 20
+    DEFAULT_RUN_BUDGET = 1000000
+    
+    # Cycles between automatic checkpoints (bounds Step Back / Go To cost)
+    CHECKPOINT_INTERVAL = 1000
+    
+    # Test values written to the start of data memory on reset
+    INITIAL_DATA = (100, 200, 50)
+    
     def __init__(self, root, cpu, assembler):
         self.root = root
         self.cpu = cpu
         self.assembler = assembler
+        self.cpu.enable_checkpoints(self.CHECKPOINT_INTERVAL)
+        self.cpu.enable_profiling()  # Feeds the heat overlay in MemoryPanel
+        
+        # Run All state
+        self._run_job = None          # Pending after() id while running
+        self._run_stop_cycle = None   # Cycle at which the current run ends
+        self._last_refresh = 0.0
         
         # Configure window
         self.root.title("16-bit MIPS Pipelined Simulator")
@@ -80,23 +100,54 @@ class MainWindow:
                              style='Action.TButton')
         load_btn.pack(side=tk.LEFT, padx=2, expand=True, fill=tk.X)
         
+        # Step Back button
+        back_btn = ttk.Button(btn_frame, text="◀️ Back",
+                             command=self.step_back,
+                             style='Action.TButton')
+        back_btn.pack(side=tk.LEFT, padx=2, expand=True, fill=tk.X)
+        
         # Step button
         step_btn = ttk.Button(btn_frame, text="▶️ Step",
                              command=self.step,
                              style='Action.TButton')
         step_btn.pack(side=tk.LEFT, padx=2, expand=True, fill=tk.X)
         
-        # Run All button
-        run_btn = ttk.Button(btn_frame, text="⏩ Run All",
-                            command=self.run_all,
-                            style='Action.TButton')
-        run_btn.pack(side=tk.LEFT, padx=2, expand=True, fill=tk.X)
+        # Run All button (doubles as Pause/Resume while a run is active)
+        self.run_btn = ttk.Button(btn_frame, text="⏩ Run All",
+                                 command=self.run_all,
+                                 style='Action.TButton')
+        self.run_btn.pack(side=tk.LEFT, padx=2, expand=True, fill=tk.X)
+        
+        # Stop button (cancels the active run)
+        stop_btn = ttk.Button(btn_frame, text="⏹ Stop",
+                             command=self.stop_run,
+                             style='Action.TButton')
+        stop_btn.pack(side=tk.LEFT, padx=2, expand=True, fill=tk.X)
         
         # Reset button
         reset_btn = ttk.Button(btn_frame, text="🔄 Reset",
                               command=self.reset,
                               style='Action.TButton')
         reset_btn.pack(side=tk.LEFT, padx=2, expand=True, fill=tk.X)
+        
+        # Cycle budget for Run All
+        budget_frame = ttk.Frame(parent)
+        budget_frame.pack(fill=tk.X, padx=5)
+        
+        ttk.Label(budget_frame, text="Run All cycle budget:").pack(side=tk.LEFT, padx=2)
+        self.run_budget = tk.IntVar(value=self.DEFAULT_RUN_BUDGET)
+        budget_box = ttk.Spinbox(budget_frame, from_=1, to=10**9, increment=1000,
+                                 textvariable=self.run_budget, width=12)
+        budget_box.pack(side=tk.LEFT, padx=2)
+        
+        # Seek to a cycle (restores the nearest checkpoint and replays)
+        self.seek_cycle = tk.IntVar(value=0)
+        goto_btn = ttk.Button(budget_frame, text="Go to cycle",
+                             command=self.seek)
+        goto_btn.pack(side=tk.RIGHT, padx=2)
+        seek_box = ttk.Spinbox(budget_frame, from_=0, to=10**9, increment=1,
+                               textvariable=self.seek_cycle, width=10)
+        seek_box.pack(side=tk.RIGHT, padx=2)
     
     def _create_instruction_reference(self, parent):
         """Create instruction reference section"""
@@ -124,7 +175,7 @@ Examples:
     def _create_right_panel(self, parent):
         """Create right panel with all info displays"""
         # Create notebook for tabs
-        notebook = ttk.Notebook(parent)
+        self.notebook = notebook = ttk.Notebook(parent)
         notebook.pack(fill=tk.BOTH, expand=True)
         
         # Tab 1: Execution View
@@ -136,6 +187,14 @@ Examples:
         mem_tab = ttk.Frame(notebook)
         notebook.add(mem_tab, text="Memory & Instructions")
         self._create_memory_tab(mem_tab)
+        
+        # Panels per tab: only the selected tab is refreshed, the others
+        # catch up on their accumulated changes when selected
+        self._tab_panels = {
+            str(exec_tab): (self.stats_panel, self.registers_panel, self.pipeline_panel),
+            str(mem_tab): (self.memory_panel,),
+        }
+        notebook.bind("<<NotebookTabChanged>>", lambda event: self.update_display())
     
     def _create_execution_tab(self, parent):
         """Create execution tab with stats, registers, pipeline"""
@@ -183,6 +242,7 @@ NOP"""
     
     def load_code(self):
         """Load code from editor into CPU"""
+        self.stop_run()
         try:
             code = self.code_editor.get_text()
             instructions = self.assembler.assemble(code)
@@ -192,15 +252,26 @@ NOP"""
                 return
             
             self.cpu.load_program(instructions)
+            load_words(self.cpu.memory, self.assembler.data)  # .data section
             self.update_display()
             
-            messagebox.showinfo("Success", 
-                              f"Loaded {len(instructions)} instructions successfully!")
+            messages = self.assembler.messages
+            if messages:
+                shown = '\n'.join(str(message) for message in messages[:10])
+                if len(messages) > 10:
+                    shown += f"\n... and {len(messages) - 10} more"
+                messagebox.showwarning("Loaded with problems",
+                                       f"Loaded {len(instructions)} instructions "
+                                       f"(bad lines became NOPs):\n\n{shown}")
+            else:
+                messagebox.showinfo("Success", 
+                                  f"Loaded {len(instructions)} instructions successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load code:\n{str(e)}")
     
     def step(self):
         """Execute one cycle"""
+        self.stop_run()
         if self.cpu.is_program_complete():
             messagebox.showinfo("Complete", "✓ Program execution completed!")
             return
@@ -209,13 +280,102 @@ NOP"""
         self.update_display()
         self.code_editor.highlight_current_line(self.cpu.pc)
     
+    def step_back(self):
+        """Undo one cycle"""
+        self.stop_run()
+        if self.cpu.cycle == 0:
+            return
+        
+        self.cpu.step_back()
+        self.update_display()
+        self.code_editor.highlight_current_line(self.cpu.pc)
+    
+    def seek(self):
+        """Move to the cycle entered in the Go To box"""
+        self.stop_run()
+        try:
+            target = max(0, int(self.seek_cycle.get()))
+        except (tk.TclError, ValueError):
+            messagebox.showwarning("Warning", "Enter a cycle number to go to.")
+            return
+        
+        try:
+            reached = self.cpu.seek(target)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Cannot go to cycle {target}:\n{str(e)}")
+            return
+        
+        self.update_display()
+        self.code_editor.highlight_current_line(self.cpu.pc)
+        if reached != target:
+            messagebox.showinfo("Complete", 
+                              f"✓ Program completed at cycle {reached}")
+    
     def run_all(self):
-        """Execute until program completes"""
-        max_cycles = 1000
-        initial_cycle = self.cpu.cycle
+        """Start, pause or resume running until the program completes"""
+        if self._run_job is not None:
+            self._pause_run()
+            return
+        
+        # Start a new run unless resuming a paused one
+        if self._run_stop_cycle is None:
+            try:
+                budget = max(1, int(self.run_budget.get()))
+            except (tk.TclError, ValueError):
+                budget = self.DEFAULT_RUN_BUDGET
+            self._run_stop_cycle = self.cpu.cycle + budget
+        
+        self.run_btn.config(text="⏸ Pause")
+        self._last_refresh = time.perf_counter()
+        self._run_job = self.root.after_idle(self._run_chunk)
+    
+    def stop_run(self):
+        """Cancel the active (or paused) run"""
+        if self._run_job is not None:
+            self.root.after_cancel(self._run_job)
+            self._run_job = None
+            self.update_display()
+        self._run_stop_cycle = None
+        self.run_btn.config(text="⏩ Run All")
+    
+    def _pause_run(self):
+        """Pause the active run, keeping its cycle budget"""
+        self.root.after_cancel(self._run_job)
+        self._run_job = None
+        self.run_btn.config(text="⏩ Resume")
+        self.update_display()
+        self.code_editor.highlight_current_line(self.cpu.pc)
+    
+    def _run_chunk(self):
+        """Run cycles for one time slice, then yield to the Tk event loop"""
+        cpu = self.cpu
+        step = cpu.step
+        is_complete = cpu.is_program_complete
+        stop_cycle = self._run_stop_cycle
+        deadline = time.perf_counter() + self.RUN_SLICE_SECONDS
         
-        while not self.cpu.is_program_complete() and self.cpu.cycle - initial_cycle < max_cycles:
-            self.cpu.step()
+        # Check the clock every 256 cycles to keep the loop cheap
+        while time.perf_counter() < deadline:
+            for _ in range(256):
+                if is_complete() or cpu.cycle >= stop_cycle:
+                    self._finish_run()
+                    return
+                step()
+        
+        # Refresh the panels at a fixed frame rate, not per cycle
+        now = time.perf_counter()
+        if now - self._last_refresh >= 1.0 / self.RUN_REFRESH_FPS:
+            self.update_display()
+            self._last_refresh = now
+        
+        self._run_job = self.root.after(1, self._run_chunk)
+    
+    def _finish_run(self):
+        """Report the end of a run (program complete or budget used up)"""
+        budget_cycles = self._run_stop_cycle
+        self._run_job = None
+        self._run_stop_cycle = None
+        self.run_btn.config(text="⏩ Run All")
         
         self.update_display()
         self.code_editor.highlight_current_line(self.cpu.pc)
@@ -229,23 +389,23 @@ NOP"""
                               f"Instructions: {stats['instructions']}\n"
                               f"CPI: {stats['cpi']:.2f}")
         else:
-            messagebox.showwarning("Timeout", 
-                                 f"Execution stopped after {max_cycles} cycles\n"
-                                 f"(possible infinite loop)")
+            messagebox.showwarning("Budget Reached", 
+                                 f"Execution stopped at cycle {budget_cycles}\n"
+                                 f"(cycle budget used up - possible infinite loop)")
     
     def reset(self):
         """Reset CPU and reload code"""
+        self.stop_run()
         self.cpu.reset()
-        # Initialize some test values in memory
-        self.cpu.memory[0] = 100
-        self.cpu.memory[1] = 200
-        self.cpu.memory[2] = 50
+        # Preload the program's .data section, or some test values
+        if self.assembler.data:
+            load_words(self.cpu.memory, self.assembler.data)
+        else:
+            load_words(self.cpu.memory, self.INITIAL_DATA[:self.cpu.memory_size])
         self.update_display()
         self.code_editor.clear_highlight()
     
     def update_display(self):
-        """Update all display panels"""
-        self.stats_panel.update()
-        self.registers_panel.update()
-        self.pipeline_panel.update()
-        self.memory_panel.update()
+        """Update the display panels on the selected tab"""
+        for panel in self._tab_panels.get(str(self.notebook.select()), ()):
+            panel.update()
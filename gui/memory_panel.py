@@ -6,14 +6,33 @@ Displays instruction memory and data memory
 import tkinter as tk
 from tkinter import ttk
 
+from .virtual_table import VirtualTable
+
 class MemoryPanel(ttk.Frame):
     """Panel displaying memory contents"""
     
+    # Instruction row backgrounds for execution-count heat levels 1-4
+    HEAT_COLORS = ('#fff3e0', '#ffe0b2', '#ffb74d', '#ff8a65')
+    
+    # Rows materialised per view, whatever the program or memory size
+    VISIBLE_ROWS = 25
+    
     def __init__(self, parent, cpu, assembler):
         super().__init__(parent)
         self.cpu = cpu
         self.assembler = assembler
         
+        # Display state; rows are drawn from the CPU arrays on demand
+        self._shown_program = None    # instr_mem the view was set up for
+        self._executions = None       # Profile counts used for the heat overlay
+        self._peak = 0                # Highest execution count
+        
+        # Memory words written since the last refresh
+        cpu.enable_change_tracking()
+        self.changes = cpu.changes.subscribe()
+        
+        self.follow_pc = tk.BooleanVar(value=True)
+        
         self._create_memory_display()
     
     def _create_memory_display(self):
@@ -24,70 +43,144 @@ class MemoryPanel(ttk.Frame):
         instr_frame = ttk.LabelFrame(self, text="Instruction Memory", padding=10)
         instr_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
         
-        columns = ('Address', 'Binary', 'Assembly')
-        self.instr_tree = ttk.Treeview(instr_frame, columns=columns, show='headings', height=25)
-        
-        self.instr_tree.heading('Address', text='Addr')
-        self.instr_tree.heading('Binary', text='Binary')
-        self.instr_tree.heading('Assembly', text='Assembly')
-        
-        self.instr_tree.column('Address', width=50)
-        self.instr_tree.column('Binary', width=120)
-        self.instr_tree.column('Assembly', width=200)
+        self.instr_table = VirtualTable(
+            instr_frame,
+            (('Address', 'Addr', 50), ('Binary', 'Binary', 120), ('Assembly', 'Assembly', 200)),
+            self._instruction_row, self._row_tags, rows=self.VISIBLE_ROWS)
         
-        instr_scroll = ttk.Scrollbar(instr_frame, orient=tk.VERTICAL, command=self.instr_tree.yview)
-        self.instr_tree.configure(yscrollcommand=instr_scroll.set)
+        instr_bar = ttk.Frame(instr_frame)
+        instr_bar.pack(fill=tk.X, pady=(0, 5))
+        self.instr_goto = self._create_goto(instr_bar, self.instr_table)
+        ttk.Checkbutton(instr_bar, text="Follow PC", variable=self.follow_pc,
+                        command=self._on_follow_pc).pack(side=tk.RIGHT, padx=2)
+        self.instr_table.pack(fill=tk.BOTH, expand=True)
         
-        self.instr_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        instr_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.instr_tree.tag_configure("current", background="#ffeb3b")
+        # Heat overlay from the CPU profile (configured first so the
+        # PC highlight takes priority)
+        for level, color in enumerate(self.HEAT_COLORS, 1):
+            self.instr_table.tag_configure(f"heat{level}", background=color)
+        self.instr_table.tag_configure("current", background="#ffeb3b")
         
         # Data Memory (right)
         data_frame = ttk.LabelFrame(self, text="Data Memory", padding=10)
         data_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        columns = ('Address', 'Decimal', 'Hex')
-        self.data_tree = ttk.Treeview(data_frame, columns=columns, show='headings', height=25)
-        
-        self.data_tree.heading('Address', text='Address')
-        self.data_tree.heading('Decimal', text='Decimal')
-        self.data_tree.heading('Hex', text='Hex')
+        self.data_table = VirtualTable(
+            data_frame,
+            (('Address', 'Address', 80), ('Decimal', 'Decimal', 80), ('Hex', 'Hex', 100)),
+            self._data_row, rows=self.VISIBLE_ROWS)
         
-        self.data_tree.column('Address', width=80)
-        self.data_tree.column('Decimal', width=80)
-        self.data_tree.column('Hex', width=100)
-        
-        data_scroll = ttk.Scrollbar(data_frame, orient=tk.VERTICAL, command=self.data_tree.yview)
-        self.data_tree.configure(yscrollcommand=data_scroll.set)
-        
-        self.data_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        data_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        data_bar = ttk.Frame(data_frame)
+        data_bar.pack(fill=tk.X, pady=(0, 5))
+        self.data_goto = self._create_goto(data_bar, self.data_table)
+        self.data_table.pack(fill=tk.BOTH, expand=True)
+    
+    def _create_goto(self, parent, table):
+        """Add a 'Go to' box (address, 0x hex or label) for a table"""
+        ttk.Label(parent, text="Go to:").pack(side=tk.LEFT, padx=2)
+        entry = ttk.Entry(parent, width=12)
+        entry.pack(side=tk.LEFT, padx=2)
+        
+        def go(event=None):
+            self.goto(table, entry.get())
+        
+        entry.bind('<Return>', go)
+        ttk.Button(parent, text="Go", width=4, command=go).pack(side=tk.LEFT, padx=2)
+        return entry
+    
+    def goto(self, table, target):
+        """
+        Scroll a table to an address
+        
+        Args:
+            table: self.instr_table or self.data_table
+            target: Address (decimal or 0x hex) or label name
+        """
+        target = target.strip()
+        labels = self.assembler.symbols.labels
+        try:
+            address = labels[target] if target in labels else int(target, 0)
+        except ValueError:
+            self.bell()
+            return
+        
+        # Jumping away from the PC stops the view from following it
+        if table is self.instr_table:
+            self.follow_pc.set(False)
+        table.scroll_to(address)
+    
+    def _on_follow_pc(self):
+        """Bring the PC back into view when following is turned on"""
+        if self.follow_pc.get():
+            self.instr_table.see(self.cpu.pc)
     
     def update(self):
         """Update memory displays"""
+        changes = self.cpu.changes.collect(self.changes)
+        if not changes and self.cpu.instr_mem is self._shown_program:
+            return
         self._update_instruction_memory()
-        self._update_data_memory()
+        self._update_data_memory(changes)
+        changes.clear()
     
     def _update_instruction_memory(self):
         """Update instruction memory display"""
-        # Clear existing
-        for item in self.instr_tree.get_children():
-            self.instr_tree.delete(item)
-        
-        # Add instructions
-        for i, instr in enumerate(self.cpu.instr_mem):
-            asm = self.assembler.disassemble(instr)
-            tag = "current" if i == self.cpu.pc else ""
-            self.instr_tree.insert("", "end", values=(i, instr, asm), tags=(tag,))
+        instr_mem = self.cpu.instr_mem
+        self._update_heat_scale(len(instr_mem))
+        
+        if instr_mem is not self._shown_program:
+            self._shown_program = instr_mem
+            self.instr_table.set_count(len(instr_mem))
+        
+        # Follow the PC a page at a time, so most steps only move the highlight
+        pc = self.cpu.pc
+        if self.follow_pc.get() and not self.instr_table.is_visible(pc):
+            self.instr_table.scroll_to(pc - self.VISIBLE_ROWS // 4)
+        
+        # The rows themselves only change with the program or the scroll
+        # position; restyle the visible ones whose PC highlight or heat
+        # level changed
+        self.instr_table.refresh_tags()
+    
+    def _update_heat_scale(self, count):
+        """Take the execution counts and their peak (kept by the profile)"""
+        profile = self.cpu.profile
+        if profile is None or profile.size != count:
+            self._executions = None
+            self._peak = 0
+        else:
+            self._executions = profile.executions
+            self._peak = profile.peak
+    
+    def _instruction_row(self, i):
+        """Values for instruction row i"""
+        instr = self.cpu.instr_mem[i]
+        return (i, f'{instr:016b}', self.assembler.disassemble(instr))
+    
+    def _row_tags(self, i):
+        """Tags for instruction row i (PC highlight and heat level)"""
+        tags = ()
+        if i == self.cpu.pc:
+            tags = ("current",)
+        peak = self._peak
+        if peak:
+            level = (self._executions[i] * len(self.HEAT_COLORS) + peak - 1) // peak
+            if level:
+                tags += (f"heat{level}",)
+        return tags
+    
+    def _data_row(self, i):
+        """Values for data memory row i"""
+        val = self.cpu.memory[i]
+        return (i, val, f'0x{val:04X}')
     
-    def _update_data_memory(self):
+    def _update_data_memory(self, changes):
         """Update data memory display"""
-        # Clear existing
-        for item in self.data_tree.get_children():
-            self.data_tree.delete(item)
-        
-        # Add memory values (show first 32 locations)
-        for i in range(min(32, len(self.cpu.memory))):
-            val = self.cpu.memory[i]
-            self.data_tree.insert("", "end", values=(i, val, f'0x{val:04X}'))
+        count = len(self.cpu.memory)
+        if count != self.data_table.count:
+            self.data_table.set_count(count)
+        elif changes.everything:
+            self.data_table.refresh()
+        else:
+            # Redraw only if a word written since the last refresh is on screen
+            self.data_table.refresh_rows(changes.memory)
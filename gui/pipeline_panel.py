@@ -6,6 +6,8 @@ Displays current state of all 5 pipeline stages
 import tkinter as tk
 from tkinter import ttk
 
+from core.isa import OPCODE_NAMES
+
 class PipelinePanel(ttk.LabelFrame):
     """Panel displaying pipeline stages"""
     
@@ -14,6 +16,11 @@ class PipelinePanel(ttk.LabelFrame):
         self.cpu = cpu
         self.assembler = assembler
         
+        # Redraw only after the latches changed, and only stages whose text did
+        cpu.enable_change_tracking()
+        self.changes = cpu.changes.subscribe()
+        self._shown_text = {}
+        
         self._create_pipeline_display()
     
     def _create_pipeline_display(self):
@@ -49,36 +56,41 @@ class PipelinePanel(ttk.LabelFrame):
     
     def update(self):
         """Update pipeline display"""
-        self._update_stage("IF", self.cpu.IF_ID)
-        self._update_stage("ID", self.cpu.ID_EX)
-        self._update_stage("EX", self.cpu.EX_MEM)
-        self._update_stage("MEM", self.cpu.MEM_WB)
-        self._update_stage("WB", self.cpu.MEM_WB)
-    
-    def _update_stage(self, stage_name, stage_data):
-        """Update individual pipeline stage"""
-        frame, content_lbl = self.stage_frames[stage_name]
-        
-        if stage_data is None:
-            content_lbl.config(text="NOP")
+        changes = self.cpu.changes.collect(self.changes)
+        if not (changes.everything or changes.latches):
             return
+        changes.clear()
         
-        if stage_name == "IF" and 'instr' in stage_data:
-            asm = self.assembler.disassemble(stage_data['instr'])
-            content_lbl.config(text=asm)
+        # Latches are reused in place by the CPU, so read their fields
+        # directly instead of keeping references
+        cpu = self.cpu
+        IF_ID = cpu.IF_ID
+        ID_EX = cpu.ID_EX
+        EX_MEM = cpu.EX_MEM
+        MEM_WB = cpu.MEM_WB
         
-        elif stage_name in ["ID", "EX"] and 'opcode' in stage_data:
-            opcode = stage_data['opcode']
-            opcode_names = {v: k for k, v in self.cpu.OPCODES.items()}
-            op_name = opcode_names.get(opcode, "UNK")
-            content_lbl.config(text=op_name)
+        if IF_ID.valid:
+            self._set_stage("IF", self.assembler.disassemble(IF_ID.instr))
+        else:
+            self._set_stage("IF", "NOP")
+        self._set_stage("ID", self._op_name(ID_EX.inst.opcode) if ID_EX.valid else "NOP")
+        self._set_stage("EX", self._op_name(EX_MEM.opcode) if EX_MEM.valid else "NOP")
         
-        elif stage_name in ["MEM", "WB"] and 'opcode' in stage_data:
-            opcode = stage_data['opcode']
-            opcode_names = {v: k for k, v in self.cpu.OPCODES.items()}
-            op_name = opcode_names.get(opcode, "UNK")
-            
-            if 'write_data' in stage_data:
-                content_lbl.config(text=f"{op_name} (→R{stage_data.get('rd', 0)}={stage_data['write_data']})")
-            else:
-                content_lbl.config(text=op_name)
+        if MEM_WB.valid:
+            text = f"{self._op_name(MEM_WB.opcode)} (→R{MEM_WB.rd}={MEM_WB.write_data})"
+        else:
+            text = "NOP"
+        self._set_stage("MEM", text)
+        self._set_stage("WB", text)
+    
+    @staticmethod
+    def _op_name(opcode):
+        """Mnemonic for an opcode"""
+        return OPCODE_NAMES.get(opcode, "UNK")
+    
+    def _set_stage(self, stage_name, text):
+        """Show text for a pipeline stage (no Tk call if it is already shown)"""
+        if self._shown_text.get(stage_name) != text:
+            frame, content_lbl = self.stage_frames[stage_name]
+            content_lbl.config(text=text)
+            self._shown_text[stage_name] = text
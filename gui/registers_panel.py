@@ -13,6 +13,10 @@ class RegistersPanel(ttk.LabelFrame):
         super().__init__(parent, text="Registers", padding=10)
         self.cpu = cpu
         
+        # Registers written since the last refresh
+        cpu.enable_change_tracking()
+        self.changes = cpu.changes.subscribe()
+        
         self._create_registers_display()
     
     def _create_registers_display(self):
@@ -37,12 +41,17 @@ class RegistersPanel(ttk.LabelFrame):
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Initialize with registers
+        # Initialize with registers (item id = register number)
         for i in range(8):
-            self.tree.insert('', 'end', values=(f'R{i}', '0', '0x0000'))
+            self.tree.insert('', 'end', iid=str(i), values=(f'R{i}', '0', '0x0000'))
     
     def update(self):
-        """Update register display"""
-        for i, item in enumerate(self.tree.get_children()):
-            val = self.cpu.registers[i]
-            self.tree.item(item, values=(f'R{i}', str(val), f'0x{val:04X}'))
+        """Update the rows of registers written since the last refresh"""
+        changes = self.cpu.changes.collect(self.changes)
+        rows = range(8) if changes.everything else changes.registers
+        
+        registers = self.cpu.registers
+        for i in rows:
+            val = registers[i]
+            self.tree.item(str(i), values=(f'R{i}', str(val), f'0x{val:04X}'))
+        changes.clear()
@@ -6,6 +6,8 @@ Displays CPU execution statistics and hazard information
 import tkinter as tk
 from tkinter import ttk
 
+from core.events import Hazard, NO_FORWARDING, hazard_message, forwarding_message
+
 class StatsPanel(ttk.LabelFrame):
     """Panel displaying CPU statistics"""
     
@@ -13,6 +15,15 @@ class StatsPanel(ttk.LabelFrame):
         super().__init__(parent, text="Execution Statistics", padding=10)
         self.cpu = cpu
         
+        # Event codes currently shown (messages are rebuilt only on change)
+        self._shown_hazards = Hazard.NONE
+        self._shown_forwarding = NO_FORWARDING
+        self._shown_values = {}  # Label -> text currently shown
+        
+        # Statistics only move when the CPU steps or is reset/restored
+        cpu.enable_change_tracking()
+        self.changes = cpu.changes.subscribe()
+        
         self._create_stats_display()
     
     def _create_stats_display(self):
@@ -76,24 +87,76 @@ class StatsPanel(ttk.LabelFrame):
         self.forward_status = ttk.Label(forward_frame, text="No Forwarding",
                                        font=("Arial", 10), foreground="#666666")
         self.forward_status.pack(side=tk.LEFT, padx=5)
+        
+        # Data cache counters (when the CPU models a data cache)
+        cache_frame = ttk.Frame(stats_frame)
+        cache_frame.grid(row=4, column=0, columnspan=3, sticky=tk.EW, pady=(10, 0))
+        
+        ttk.Label(cache_frame, text="Data Cache:", 
+                 font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
+        self.dcache_lbl = ttk.Label(cache_frame, text="Off", font=("Arial", 10))
+        self.dcache_lbl.pack(side=tk.LEFT, padx=5)
+        
+        # Instruction cache counters (when the CPU models an instruction cache)
+        icache_frame = ttk.Frame(stats_frame)
+        icache_frame.grid(row=5, column=0, columnspan=3, sticky=tk.EW, pady=(5, 0))
+        
+        ttk.Label(icache_frame, text="Instruction Cache:", 
+                 font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
+        self.icache_lbl = ttk.Label(icache_frame, text="Off", font=("Arial", 10))
+        self.icache_lbl.pack(side=tk.LEFT, padx=5)
     
     def update(self):
         """Update statistics display"""
+        changes = self.cpu.changes.collect(self.changes)
+        if not changes:
+            return
+        changes.clear()
+        
         stats = self.cpu.get_stats()
         
-        self.cycle_lbl.config(text=str(self.cpu.cycle))
-        self.pc_lbl.config(text=str(self.cpu.pc))
-        self.instr_lbl.config(text=str(stats['instructions']))
-        self.stall_lbl.config(text=str(stats['stalls']))
-        self.flush_lbl.config(text=str(stats['flushes']))
-        self.fwd_lbl.config(text=str(stats['forwards']))
+        self._set_label(self.cycle_lbl, str(self.cpu.cycle))
+        self._set_label(self.pc_lbl, str(self.cpu.pc))
+        self._set_label(self.instr_lbl, str(stats['instructions']))
+        self._set_label(self.stall_lbl, str(stats['stalls']))
+        self._set_label(self.flush_lbl, str(stats['flushes']))
+        self._set_label(self.fwd_lbl, str(stats['forwards']))
+        self._set_label(self.dcache_lbl, self._cache_text(stats.get('dcache')))
+        self._set_label(self.icache_lbl, self._cache_text(stats.get('icache')))
         
         # Update hazard status with color
-        if "STALL" in self.cpu.hazard_msg:
-            self.hazard_status.config(text=self.cpu.hazard_msg, foreground="#d32f2f")
-        elif "CONTROL" in self.cpu.hazard_msg:
-            self.hazard_status.config(text=self.cpu.hazard_msg, foreground="#f57c00")
-        else:
-            self.hazard_status.config(text=self.cpu.hazard_msg, foreground="#2e7d32")
-        
-        self.forward_status.config(text=self.cpu.forwarding_msg)
+        hazards = self.cpu.hazards
+        if hazards != self._shown_hazards:
+            if hazards & Hazard.CONTROL:
+                color = "#f57c00"
+            elif hazards & Hazard.LOAD_USE:
+                color = "#d32f2f"
+            elif hazards & Hazard.MEMORY:
+                color = "#6a1b9a"
+            elif hazards & Hazard.FETCH:
+                color = "#1565c0"
+            else:
+                color = "#2e7d32"
+            self.hazard_status.config(text=hazard_message(hazards), foreground=color)
+            self._shown_hazards = hazards
+        
+        forwarding = self.cpu.forwarding
+        if forwarding != self._shown_forwarding:
+            self.forward_status.config(text=forwarding_message(forwarding))
+            self._shown_forwarding = forwarding
+    
+    def _set_label(self, label, text):
+        """Set a label's text unless it is already shown"""
+        if self._shown_values.get(label) != text:
+            label.config(text=text)
+            self._shown_values[label] = text
+    
+    @staticmethod
+    def _cache_text(cache_stats):
+        """One-line summary of a cache's counters"""
+        if cache_stats is None:
+            return "Off"
+        return (f"{cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                f"{cache_stats['evictions']} evictions "
+                f"({cache_stats['hit_rate']:.1%} hit rate, "
+                f"{cache_stats['stall_cycles']} stall cycles)")
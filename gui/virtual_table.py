@@ -0,0 +1,158 @@
+"""
+Virtual Table Component
+Treeview that only materialises the visible window of a large row range
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualTable(ttk.Frame):
+    """
+    Table over 'count' rows produced on demand by a callback
+    
+    The Treeview holds one item per visible line (item ids "0", "1", ...),
+    however many rows there are; scrolling only rewrites those items. Row
+    values and tags are cached per line, so a refresh makes Tk calls only
+    for lines whose content changed.
+    """
+    
+    def __init__(self, parent, columns, row_values, row_tags=None, rows=25):
+        """
+        Args:
+            parent: Parent widget
+            columns: Sequence of (name, heading, width)
+            row_values: row_values(index) -> tuple of column values
+            row_tags: Optional row_tags(index) -> tuple of Treeview tags
+            rows: Number of visible lines
+        """
+        super().__init__(parent)
+        self.row_values = row_values
+        self.row_tags = row_tags
+        self.rows = rows
+        self.count = 0    # Total number of rows
+        self.top = 0      # Row shown on the first line
+        
+        # (values, tags) currently shown on each line
+        self._shown = [None] * rows
+        
+        names = [name for name, heading, width in columns]
+        self.tree = ttk.Treeview(self, columns=names, show='headings',
+                                 height=rows, selectmode='none')
+        for name, heading, width in columns:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width)
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scroll)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # The Treeview holds no more items than it shows, so wheel events
+        # scroll the row range instead
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1, 'units'))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-1, 'units'))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(1, 'units'))
+    
+    def tag_configure(self, tag, **options):
+        """Configure a row tag (see Treeview.tag_configure)"""
+        self.tree.tag_configure(tag, **options)
+    
+    def set_count(self, count):
+        """Set the number of rows and redraw every visible line"""
+        self.count = count
+        self.top = min(self.top, self._max_top())
+        self.tree.delete(*self.tree.get_children())
+        self._shown = [None] * self.rows
+        self.refresh()
+    
+    def refresh(self):
+        """Redraw the visible lines whose values or tags changed"""
+        tree = self.tree
+        shown = self._shown
+        row_tags = self.row_tags
+        
+        for line in range(self.rows):
+            index = self.top + line
+            if index < self.count:
+                content = (self.row_values(index),
+                           row_tags(index) if row_tags is not None else ())
+            else:
+                content = None
+            if content == shown[line]:
+                continue
+        
+            iid = str(line)
+            if content is None:
+                tree.delete(iid)
+            else:
+                values, tags = content
+                if shown[line] is None:
+                    tree.insert('', 'end', iid=iid, values=values, tags=tags)
+                else:
+                    tree.item(iid, values=values, tags=tags)
+            shown[line] = content
+        
+        self._update_scrollbar()
+    
+    def refresh_rows(self, indices):
+        """Redraw the given rows if they are visible"""
+        top = self.top
+        bottom = min(top + self.rows, self.count)
+        if any(top <= index < bottom for index in indices):
+            self.refresh()
+    
+    def refresh_tags(self):
+        """Recompute the tags of the visible lines, keeping their values"""
+        if self.row_tags is None:
+            return
+        tree = self.tree
+        shown = self._shown
+        row_tags = self.row_tags
+        
+        for line in range(min(self.rows, self.count - self.top)):
+            values, tags = shown[line]
+            new_tags = row_tags(self.top + line)
+            if new_tags != tags:
+                tree.item(str(line), tags=new_tags)
+                shown[line] = (values, new_tags)
+    
+    def is_visible(self, index):
+        """Check if a row is on screen"""
+        return self.top <= index < self.top + self.rows
+    
+    def see(self, index):
+        """Scroll just enough to bring a row on screen"""
+        if index < self.top:
+            self.scroll_to(index)
+        elif index >= self.top + self.rows:
+            self.scroll_to(index - self.rows + 1)
+    
+    def scroll_to(self, index):
+        """Show rows from 'index' on (clamped to the row range)"""
+        top = max(0, min(index, self._max_top()))
+        if top != self.top:
+            self.top = top
+            self.refresh()
+    
+    def scroll(self, amount, what='units'):
+        """Scroll by rows ('units') or by screens ('pages')"""
+        if what == 'pages':
+            amount *= self.rows
+        self.scroll_to(self.top + amount)
+    
+    def _max_top(self):
+        """Largest valid first row"""
+        return max(0, self.count - self.rows)
+    
+    def _on_scroll(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, what)"""
+        if args[0] == 'moveto':
+            self.scroll_to(round(float(args[1]) * self.count))
+        elif args[0] == 'scroll':
+            self.scroll(int(args[1]), args[2])
+    
+    def _update_scrollbar(self):
+        """Show the visible window as a fraction of all rows"""
+        if self.count <= self.rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.top / self.count, (self.top + self.rows) / self.count)
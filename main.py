@@ -2,14 +2,21 @@
 """
 16-bit MIPS Pipelined Simulator
 Main application entry point
+
+    python main.py                  # Launch the GUI
+    python main.py run FILE.asm     # Headless run (same as python -m core run)
 """
 
-import tkinter as tk
-from core import PipelinedCPU, Assembler
-from gui import MainWindow
+import sys
 
-def main():
-    """Main application function"""
+
+def launch_gui():
+    """Create the Tk window and start the GUI"""
+    # Tk and the GUI package are only imported when the GUI is requested
+    import tkinter as tk
+    from core import PipelinedCPU, Assembler
+    from gui import MainWindow
+    
     # Create root window
     root = tk.Tk()
     
@@ -23,5 +30,18 @@ def main():
     # Start application
     root.mainloop()
 
+
+def main(argv=None):
+    """Main application function"""
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Any arguments select the headless command line interface
+    if argv:
+        from core.__main__ import main as cli_main
+        return cli_main(argv)
+    
+    launch_gui()
+    return 0
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Shared test helpers: example location, cycle cap and program generators
+"""
+
+import os
+import random
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', 'examples')
+
+# Cycle cap for running a test program to completion
+MAX_CYCLES = 200000
+
+ALU_OPS = ('ADD', 'SUB', 'AND', 'OR', 'SLT')
+IMM_OPS = ('ADDI', 'ANDI', 'ORI')
+
+
+def loop_program(outer, inner, body):
+    """
+    Nested counted loop: 'body' ALU instructions run outer x inner times,
+    accumulating into r5, which is stored at address 0
+    """
+    lines = [
+        f"ADDI r4, r0, {outer}",
+        "ADDI r3, r0, 1",
+        "outer:",
+        f"ADDI r1, r0, {inner}",
+        "inner:",
+    ]
+    lines += [f"{ALU_OPS[i % len(ALU_OPS)]} r5, r5, r1" for i in range(body)]
+    lines += [
+        "SUB r1, r1, r3",
+        "BNE r1, r0, inner",
+        "SUB r4, r4, r3",
+        "BNE r4, r0, outer",
+        "SW r5, 0(r0)",
+    ]
+    return '\n'.join(lines)
+
+
+def hazard_free_program(seed, size=60):
+    """
+    Random program with two NOPs after every instruction, and only
+    forward branches and jumps
+    """
+    rng = random.Random(seed)
+    count = size * 3
+    lines = []
+    for index in range(size):
+        pc = index * 3
+        kind = rng.random()
+        rd, rs, rt = (rng.randint(1, 7) for _ in range(3))
+        if kind < 0.35:
+            lines.append(f"{rng.choice(ALU_OPS)} r{rd}, r{rs}, r{rt}")
+        elif kind < 0.6:
+            lines.append(f"{rng.choice(IMM_OPS)} r{rd}, r{rs}, {rng.randint(0, 63)}")
+        elif kind < 0.72:
+            lines.append(f"LW r{rd}, {rng.randint(-8, 31)}(r{rng.choice((0, rs))})")
+        elif kind < 0.84:
+            lines.append(f"SW r{rd}, {rng.randint(-8, 31)}(r{rng.choice((0, rs))})")
+        elif kind < 0.95:
+            offset = min(rng.randint(0, 10), count - pc - 1)
+            lines.append(f"{rng.choice(('BEQ', 'BNE'))} r{rs}, r{rt}, {offset}")
+        else:
+            lines.append(f"J {min(pc + 1 + rng.randint(0, 10), count)}")
+        lines += ["NOP", "NOP"]
+    return '\n'.join(lines)
+
+
+def random_program(seed, size=40):
+    """
+    Random program with no hazard rules: any instruction may use the
+    register written by the one before it. Branches and jumps go
+    forward, then a JAL calls a subroutine that returns with JR.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for pc in range(size):
+        kind = rng.random()
+        rd, rs, rt = (rng.randint(1, 6) for _ in range(3))
+        if kind < 0.3:
+            lines.append(f"{rng.choice(ALU_OPS)} r{rd}, r{rs}, r{rt}")
+        elif kind < 0.5:
+            lines.append(f"{rng.choice(IMM_OPS)} r{rd}, r{rs}, {rng.randint(0, 15)}")
+        elif kind < 0.62:
+            lines.append(f"LW r{rd}, {rng.randint(0, 7)}(r{rng.choice((0, rs))})")
+        elif kind < 0.72:
+            lines.append(f"SW r{rd}, {rng.randint(0, 7)}(r{rng.choice((0, rs))})")
+        elif kind < 0.85:
+            offset = rng.randint(0, min(5, size - pc - 1))
+            lines.append(f"{rng.choice(('BEQ', 'BNE'))} r{rs}, r{rt}, {offset}")
+        elif kind < 0.9:
+            lines.append(f"J {min(size, pc + 1 + rng.randint(0, 3))}")
+        else:
+            lines.append("NOP")
+    lines += [
+        f"JAL {size + 3}",
+        "SW r7, 20(r0)",
+        f"J {size + 7}",
+        "ADDI r1, r1, 3",
+        "LW r2, 1(r0)",
+        "ADD r3, r2, r7",
+        "JR r7",
+    ]
+    return '\n'.join(lines)
@@ -0,0 +1,88 @@
+"""
+Assembler: labels, .data sections, the PC -> line index and the line cache
+"""
+
+from core import assembler as assembler_module
+from core import Assembler
+
+from .helpers import random_program
+
+
+def test_line_cache_bound(monkeypatch):
+    monkeypatch.setattr(assembler_module, 'LINE_CACHE_SIZE', 16)
+    source = '\n'.join(f"ADDI r1, r1, {i % 64}  # {i}" for i in range(100))
+    assembler = Assembler()
+    first = assembler.assemble(source)
+    assert len(assembler._line_cache) <= 16
+
+    # Lines evicted from the cache assemble the same as cached ones
+    assert assembler.assemble(source) == first
+    assert assembler.assemble(random_program(0)) == Assembler().assemble(random_program(0))
+    assert len(assembler._line_cache) <= 16
+
+
+PROGRAM = """
+start:  BEQ r1, r2, done   # Forward reference
+        J end
+.data
+table:  .word 5, 6
+.text
+        LW r3, table(r0)
+done:   LW r4, more(r0)
+.data
+more:   .word 0x10, -1, table
+.text
+end:    JAL start
+"""
+
+# PROGRAM with every label replaced by its value
+RESOLVED = """
+BEQ r1, r2, 2
+J 4
+LW r3, 0(r0)
+LW r4, 2(r0)
+JAL 0
+"""
+
+
+def test_labels_and_data():
+    assembler = Assembler()
+    instructions = assembler.assemble(PROGRAM)
+    assert not assembler.messages
+    assert instructions == Assembler().assemble(RESOLVED)
+
+    # .data sections are laid out one after another from address 0
+    assert list(assembler.data) == [5, 6, 0x10, 0xFFFF, 0]
+    symbols = assembler.symbols
+    assert symbols.labels == {'start': 0, 'done': 3, 'end': 4, 'table': 0, 'more': 2}
+    assert symbols.data_labels == {'table', 'more'}
+
+
+def test_label_errors():
+    assembler = Assembler()
+    instructions = assembler.assemble("a: NOP\na: NOP\nJ nowhere\n.data\nNOP")
+    assert len(instructions) == 3
+    assert sorted(message.line for message in assembler.errors) == [2, 3, 5]
+    assert instructions[2] == Assembler().assemble("NOP")[0]
+
+
+def test_line_for_pc():
+    assembler = Assembler()
+    assembler.assemble(PROGRAM)
+    symbols = assembler.symbols
+    assert [symbols.line_for_pc(pc) for pc in range(5)] == [2, 3, 7, 8, 12]
+    assert symbols.line_for_pc(5) is None
+    assert symbols.line_for_pc(-1) is None
+
+    # After an edit (served partly from the line cache) the index follows
+    lines = PROGRAM.split('\n')
+    lines[3:3] = ["# comment", "", "        ADD r5, r1, r2"]
+    assembler.assemble('\n'.join(lines))
+    symbols = assembler.symbols
+    assert [symbols.line_for_pc(pc) for pc in range(6)] == [2, 3, 6, 10, 11, 15]
+    assert symbols.labels['done'] == 4 and symbols.labels['end'] == 5
+
+    lines = PROGRAM.split('\n')
+    del lines[2]
+    assembler.assemble('\n'.join(lines))
+    assert list(assembler.symbols.pc_lines) == [2, 6, 7, 11]
@@ -0,0 +1,150 @@
+"""
+Cache models are timing-only: enabling instruction and data caches
+changes cycle counts, never the registers or memory a program ends with
+"""
+
+import glob
+import os
+
+import pytest
+
+from core import PipelinedCPU, Assembler
+from core.cache import CacheConfig
+from core.events import Hazard, ForwardSource, NO_FORWARDING
+
+from .helpers import EXAMPLES_DIR, MAX_CYCLES, random_program
+
+CACHES = {
+    'icache fully associative': (CacheConfig(size=8, block_size=1, associativity=8,
+                                             miss_penalty=1), None),
+    'icache direct': (CacheConfig(size=16, block_size=4, miss_penalty=3), None),
+    'dcache write-back': (None, CacheConfig(size=8, block_size=2, miss_penalty=2)),
+    'dcache write-through': (None, CacheConfig(size=8, block_size=1, miss_penalty=1,
+                                               write_policy='write-through')),
+    'both': (CacheConfig(size=16, block_size=4, associativity=2, miss_penalty=3),
+             CacheConfig(size=8, block_size=2, associativity=2, miss_penalty=5)),
+}
+
+
+def run(instructions, icache=None, dcache=None):
+    cpu = PipelinedCPU()
+    cpu.enable_instruction_cache(icache)
+    cpu.enable_data_cache(dcache)
+    cpu.load_program(instructions)
+    while not cpu.is_program_complete() and cpu.cycle < MAX_CYCLES:
+        cpu.step()
+    assert cpu.is_program_complete(), "program did not finish"
+    return cpu
+
+
+def assert_same_results(instructions):
+    """Run with every cache setup and compare with the uncached run"""
+    plain = run(instructions)
+    for name, (icache, dcache) in CACHES.items():
+        cpu = run(instructions, icache, dcache)
+        assert cpu.registers == plain.registers, f"{name}: registers differ"
+        assert list(cpu.memory) == list(plain.memory), f"{name}: memory differs"
+        assert cpu.total_instructions == plain.total_instructions, \
+            f"{name}: instruction count differs"
+    return plain
+
+
+@pytest.mark.parametrize('path', sorted(glob.glob(os.path.join(EXAMPLES_DIR, '*.asm'))),
+                         ids=os.path.basename)
+def test_examples(path):
+    with open(path) as f:
+        assert_same_results(Assembler().assemble_object(f.read()))
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_random_programs(seed):
+    assert_same_results(Assembler().assemble(random_program(seed)))
+
+
+def test_fetch_bubble_between_dependents():
+    """A fetch miss between a write and a branch using it (forwarded across WB)"""
+    instructions = Assembler().assemble("""
+        ADDI r4, r3, 8
+        BNE r4, r5, 2
+        ADDI r1, r0, 5
+        NOP
+        NOP
+    """)
+    plain = assert_same_results(instructions)
+    assert plain.registers[1] == 0
+
+    icache, _ = CACHES['icache fully associative']
+    cpu = run(instructions, icache)
+    assert cpu.icache.stall_cycles > 0
+
+
+def forwarding_events(instructions, dcache=None):
+    cpu = PipelinedCPU()
+    cpu.enable_data_cache(dcache)
+    cpu.load_program(instructions)
+    events = []
+    while not cpu.is_program_complete():
+        cpu.step()
+        if cpu.forwarding != NO_FORWARDING:
+            events.append(cpu.forwarding)
+    return events, cpu.get_stats()['forwards']
+
+
+def test_forward_across_data_stall():
+    """WB writes r1 into ID/EX during the LW's miss; EX still counts it"""
+    instructions = Assembler().assemble("""
+        ADDI r1, r0, 5
+        LW r2, 0(r0)
+        ADD r3, r1, r1
+    """)
+    wb = ForwardSource.WB
+    assert forwarding_events(instructions) == ([(wb, wb, 1, 1)], 2)
+    dcache = CacheConfig(size=8, block_size=2, miss_penalty=3)
+    assert forwarding_events(instructions, dcache) == ([(wb, wb, 1, 1)], 2)
+
+
+def test_fetch_hazard_only_while_waiting():
+    """A fetch miss that completes during a data cache stall is not flagged there"""
+    icache = CacheConfig(size=8, block_size=1, miss_penalty=2)
+    dcache = CacheConfig(size=8, block_size=1, miss_penalty=4)
+    cpu = PipelinedCPU()
+    cpu.enable_instruction_cache(icache)
+    cpu.enable_data_cache(dcache)
+    cpu.load_program(Assembler().assemble("LW r1, 0(r0)\n" + "NOP\n" * 6))
+    overlapped = 0
+    while not cpu.is_program_complete():
+        stall_cycles = cpu.icache.stall_cycles
+        cpu.step()
+        waited = cpu.icache.stall_cycles > stall_cycles or cpu.icache.wait > 0
+        assert bool(cpu.hazards & Hazard.FETCH) == waited
+        overlapped += cpu.mem_stall and cpu.icache.ready
+    assert overlapped
+
+
+def test_snapshot_during_long_miss():
+    """A write-back eviction with a large penalty waits twice as long"""
+    config = CacheConfig(size=2, block_size=1, associativity=1, miss_penalty=40000)
+    cpu = PipelinedCPU()
+    cpu.enable_data_cache(config)
+    cpu.load_program(Assembler().assemble("""
+        SW r0, 0(r0)
+        LW r1, 2(r0)
+    """))
+    while cpu.dcache.wait <= config.miss_penalty and not cpu.is_program_complete():
+        cpu.step()
+    assert cpu.dcache.wait > 0xFFFF
+
+    snapshot = cpu.snapshot()
+    wait, tags, stamps = cpu.dcache.wait, list(cpu.dcache.tags), list(cpu.dcache.stamps)
+    cpu.step()
+    cpu.restore(snapshot)
+    assert cpu.dcache.wait == wait
+    assert list(cpu.dcache.tags) == tags and list(cpu.dcache.stamps) == stamps
+
+
+def test_miss_penalty_bound():
+    CacheConfig(miss_penalty=0xFFFF)
+    with pytest.raises(ValueError):
+        CacheConfig(miss_penalty=0x10000)
+    with pytest.raises(ValueError):
+        CacheConfig(miss_penalty=-1)
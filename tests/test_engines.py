@@ -0,0 +1,264 @@
+"""
+Differential tests: FunctionalCPU and BlockCachedCPU against PipelinedCPU
+
+Every program runs to completion on each engine, which must agree on
+the registers, data memory and number of instructions executed.
+"""
+
+import glob
+import os
+
+import pytest
+
+from core import PipelinedCPU, FunctionalCPU, BlockCachedCPU, Assembler
+
+from .helpers import (EXAMPLES_DIR, MAX_CYCLES, hazard_free_program, loop_program,
+                      random_program)
+
+# Hand-written programs, with two NOPs after most register writes
+PROGRAMS = {
+    'branches': """
+        ADDI r1, r0, 3
+        ADDI r2, r0, 3
+        NOP
+        NOP
+        BEQ r1, r2, 2      # taken
+        ADDI r3, r0, 1     # skipped
+        ADDI r3, r0, 2     # skipped
+        BNE r1, r2, 1      # not taken
+        ADDI r4, r0, 4
+        NOP
+        NOP
+        BNE r4, r0, 1      # taken
+        ADDI r5, r0, 9     # skipped
+        ADDI r6, r0, 6
+    """,
+    'loop': """
+        ADDI r1, r0, 10
+        ADDI r3, r0, 1
+        NOP
+        NOP
+    loop:
+        ADD r2, r2, r1
+        SUB r1, r1, r3
+        NOP
+        NOP
+        BNE r1, r0, loop
+        SW r2, 5(r0)
+    """,
+    'jal_jr': """
+        ADDI r1, r0, 2
+        JAL double
+        NOP
+        NOP
+        ADD r5, r2, r0
+        J end
+        ADDI r6, r0, 1     # skipped
+    double:
+        ADD r2, r1, r1
+        JR r7
+        ADDI r6, r0, 2     # skipped
+    end:
+        SW r7, 9(r0)
+    """,
+    'memory': """
+        ADDI r1, r0, 40
+        ADDI r2, r0, 7
+        NOP
+        NOP
+        SW r2, 3(r1)
+        SW r1, 0(r0)
+        LW r3, 3(r1)
+        LW r4, 0(r0)
+        NOP
+        NOP
+        ADD r5, r3, r4
+        NOP
+        NOP
+        SW r5, -1(r1)
+    """,
+}
+
+
+# Load-use hazards the pipeline must stall for (no NOPs after the LWs;
+# other register writes still follow the rule)
+LOAD_USE_PROGRAMS = {
+    'lw_lw_use': """
+        ADDI r4, r0, 7
+        SW r4, 0(r0)
+        LW r2, 0(r0)
+        LW r1, 0(r0)
+        ADD r3, r2, r2
+    """,
+    'lw_lw_sw': """
+        ADDI r4, r0, 7
+        SW r4, 0(r0)
+        LW r2, 0(r0)
+        LW r1, 0(r0)
+        SW r2, 10(r0)
+    """,
+    'lw_use': """
+        ADDI r4, r0, 5
+        SW r4, 2(r0)
+        LW r2, 2(r0)
+        SUB r3, r0, r2
+        SW r2, 11(r0)
+    """,
+    'lw_address': """
+        ADDI r2, r0, 3
+        ADDI r4, r0, 9
+        NOP
+        NOP
+        SW r2, 1(r0)
+        SW r4, 3(r0)
+        LW r2, 1(r0)
+        LW r1, 0(r2)
+    """,
+    'lw_branch': """
+        ADDI r4, r0, 1
+        SW r4, 0(r0)
+        LW r2, 0(r0)
+        BNE r2, r0, 1
+        ADDI r5, r0, 9     # skipped
+        ADDI r6, r0, 6
+    """,
+    'lw_jr': """
+        ADDI r2, r0, 7
+        SW r2, 1(r0)
+        LW r7, 1(r0)
+        JR r7
+        ADDI r1, r0, 5     # skipped
+        NOP
+        NOP
+        ADDI r3, r0, 1
+    """,
+}
+
+
+def run_pipelined(instructions):
+    cpu = PipelinedCPU()
+    cpu.load_program(instructions)
+    while not cpu.is_program_complete() and cpu.cycle < MAX_CYCLES:
+        cpu.step()
+    assert cpu.is_program_complete(), "program did not finish"
+    return cpu
+
+
+def run_functional(cpu_class, instructions):
+    cpu = cpu_class()
+    cpu.load_program(instructions)
+    cpu.run(MAX_CYCLES)
+    assert cpu.is_program_complete(), "program did not finish"
+    return cpu
+
+
+def assert_same_state(instructions):
+    """Run a program on every engine and compare the final states"""
+    pipelined = run_pipelined(instructions)
+    for cpu_class in (FunctionalCPU, BlockCachedCPU):
+        cpu = run_functional(cpu_class, instructions)
+        name = cpu_class.__name__
+        assert cpu.registers == pipelined.registers, f"{name}: registers differ"
+        assert list(cpu.memory) == list(pipelined.memory), f"{name}: memory differs"
+        assert cpu.total_instructions == pipelined.total_instructions, \
+            f"{name}: instruction count differs"
+    return pipelined
+
+
+@pytest.mark.parametrize('path', sorted(glob.glob(os.path.join(EXAMPLES_DIR, '*.asm'))),
+                         ids=os.path.basename)
+def test_examples(path):
+    with open(path) as f:
+        assert_same_state(Assembler().assemble_object(f.read()))
+
+
+@pytest.mark.parametrize('name', sorted(PROGRAMS))
+def test_programs(name):
+    assembler = Assembler()
+    instructions = assembler.assemble(PROGRAMS[name])
+    assert not assembler.errors
+    assert_same_state(instructions)
+
+
+def test_program_results():
+    """Spot-check the expected values, not just agreement"""
+    assembler = Assembler()
+    cpu = assert_same_state(assembler.assemble(PROGRAMS['jal_jr']))
+    assert cpu.registers[2] == 4 and cpu.registers[5] == 4
+    assert cpu.registers[6] == 0
+    assert cpu.memory[9] == 2  # Return address: the instruction after JAL
+
+    cpu = assert_same_state(assembler.assemble(PROGRAMS['loop']))
+    assert cpu.memory[5] == 55
+
+
+def test_nested_loops():
+    assert_same_state(Assembler().assemble(loop_program(outer=5, inner=7, body=3)))
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_hazard_free_random(seed):
+    assembler = Assembler()
+    instructions = assembler.assemble(hazard_free_program(seed))
+    assert not assembler.errors
+    assert_same_state(instructions)
+
+
+# One stall when the next instruction uses the loaded register; none
+# when the use is two instructions behind the LW
+LOAD_USE_STALLS = {
+    'lw_lw_use': 0,
+    'lw_lw_sw': 0,
+    'lw_use': 1,
+    'lw_address': 1,
+    'lw_branch': 1,
+    'lw_jr': 1,
+}
+
+
+@pytest.mark.parametrize('name', sorted(LOAD_USE_PROGRAMS))
+def test_load_use_stalls(name):
+    assembler = Assembler()
+    instructions = assembler.assemble(LOAD_USE_PROGRAMS[name])
+    assert not assembler.errors
+    cpu = assert_same_state(instructions)
+    assert cpu.total_stalls == LOAD_USE_STALLS[name]
+
+
+def test_load_use_single_stall():
+    cpu = assert_same_state(Assembler().assemble("""
+        LW r1, 0(r0)
+        ADD r2, r1, r1
+    """))
+    assert cpu.total_stalls == 1
+
+
+def test_load_use_results():
+    assembler = Assembler()
+    cpu = assert_same_state(assembler.assemble(LOAD_USE_PROGRAMS['lw_lw_use']))
+    assert cpu.registers[3] == 14
+    cpu = assert_same_state(assembler.assemble(LOAD_USE_PROGRAMS['lw_lw_sw']))
+    assert cpu.memory[10] == 7
+    cpu = assert_same_state(assembler.assemble(LOAD_USE_PROGRAMS['lw_address']))
+    assert cpu.registers[1] == 9
+
+
+def test_forwarding_distance_two():
+    """A value is forwarded to the instruction two slots behind its writer"""
+    assembler = Assembler()
+    cpu = assert_same_state(assembler.assemble("""
+        ADDI r1, r0, 5
+        ADDI r2, r0, 6
+        ADD r3, r1, r2
+        SW r1, 4(r0)
+    """))
+    assert cpu.registers[3] == 11
+    assert cpu.memory[4] == 5
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_random_with_hazards(seed):
+    assembler = Assembler()
+    instructions = assembler.assemble(random_program(seed))
+    assert not assembler.errors
+    assert_same_state(instructions)
@@ -0,0 +1,50 @@
+"""
+Object file round trips
+"""
+
+import pytest
+
+from core import Assembler
+from core.assembler import AssemblerMessage
+from core.objfile import ObjectFile
+
+SOURCE = """
+.data
+table: .word 3, 0xFFFF, -2
+.text
+start:
+    LW r1, table(r0)
+    ADDI r2, r1, 1
+    BNE r2, r0, start
+"""
+
+
+def test_round_trip():
+    program = Assembler().assemble_object(SOURCE)
+    loaded = ObjectFile.from_bytes(program.to_bytes())
+    assert loaded.instructions == program.instructions
+    assert list(loaded.data) == [3, 0xFFFF, 0xFFFE]
+    assert loaded.symbols.labels == program.symbols.labels
+    assert loaded.symbols.data_labels == {'table'}
+    assert list(loaded.symbols.pc_lines) == list(program.symbols.pc_lines)
+
+
+def test_long_label(tmp_path):
+    name = 'x' * 256
+    program = Assembler().assemble_object(f"{name}: NOP\nJ {name}")
+    with pytest.raises(ValueError, match='too long'):
+        program.save(tmp_path / 'long.mobj')
+    assert not list(tmp_path.iterdir())
+
+    program = Assembler().assemble_object(f"{name[:255]}: NOP")
+    assert ObjectFile.from_bytes(program.to_bytes()).symbols.labels == {name[:255]: 0}
+
+
+def test_long_message():
+    """Message text is cut to 64 KiB on a character boundary"""
+    program = Assembler().assemble_object(SOURCE)
+    program.messages.append(AssemblerMessage(2, 'warning', 'é' * 40000))
+    loaded = ObjectFile.from_bytes(program.to_bytes())
+    text = loaded.messages[-1].text
+    assert text == 'é' * (0xFFFF // 2)
+    assert loaded.messages[-1].line == 2
@@ -0,0 +1,63 @@
+"""
+Per-PC profile counters against PipelinedCPU's global statistics
+"""
+
+from core import PipelinedCPU, Assembler
+from core.profile import COUNTERS
+
+from .helpers import loop_program, random_program
+
+
+def profiled_run(source):
+    cpu = PipelinedCPU()
+    cpu.load_program(Assembler().assemble(source))
+    cpu.enable_profiling(True)
+    while not cpu.is_program_complete():
+        cpu.step()
+    return cpu
+
+
+def test_counters_add_up():
+    cpu = profiled_run(random_program(0, size=300))
+    profile = cpu.profile
+    assert sum(profile.executions) == cpu.total_instructions
+    assert sum(profile.stalls) == cpu.total_stalls
+    assert sum(profile.flushes) == cpu.total_flushes
+    assert sum(profile.forwards) == cpu.get_stats()['forwards']
+
+
+def test_peak():
+    cpu = profiled_run(loop_program(outer=3, inner=5, body=2))
+    profile = cpu.profile
+    assert profile.peak == max(profile.executions) == 15
+
+    profile.clear()
+    assert profile.peak == 0
+
+
+def profile_state(profile):
+    return [list(getattr(profile, name)) for name in COUNTERS], profile.peak
+
+
+def test_seek_and_replay():
+    """Rewinding and replaying leaves the counters of a straight run"""
+    instructions = Assembler().assemble(random_program(3, size=60))
+    cpu = PipelinedCPU()
+    cpu.load_program(instructions)
+    cpu.enable_profiling(True)
+    cpu.enable_checkpoints(10)
+    states = [profile_state(cpu.profile)]
+    while not cpu.is_program_complete():
+        cpu.step()
+        states.append(profile_state(cpu.profile))
+
+    for target in (len(states) - 2, 25, 3, 0, 17, len(states) - 1):
+        cpu.seek(target)
+        assert profile_state(cpu.profile) == states[target], f"counts differ at cycle {target}"
+
+    cpu.seek(31)
+    for cycle in range(30, 15, -1):
+        cpu.step_back()
+        assert profile_state(cpu.profile) == states[cycle]
+    cpu.step()
+    assert profile_state(cpu.profile) == states[17]
@@ -0,0 +1,44 @@
+"""
+Headless runner and command line checks
+"""
+
+import pytest
+
+from core.__main__ import main
+from core.runner import BatchRunner
+
+PROGRAM = "LW r1, 1(r0)\nSW r1, 5(r0)"
+
+
+def test_data_words():
+    runner = BatchRunner(memory_size=8, data=[7, 9])
+    result = runner.run_source(PROGRAM)
+    assert result['memory'][:2] == [7, 9]
+    assert result['memory'][5] == 9
+
+    with pytest.raises(ValueError):
+        BatchRunner(memory_size=8, data=[0] * 9)
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_bad_data_image(tmp_path, capsys, jobs):
+    source = tmp_path / 'program.asm'
+    source.write_text(PROGRAM)
+    image = tmp_path / 'image.hex'
+    image.write_text('1 ' * 100)
+
+    # Missing, and too large for the data memory
+    for data in (tmp_path / 'missing.hex', image):
+        with pytest.raises(SystemExit) as exit_info:
+            main(['run', '-j', jobs, '--memory-size', '64', '--data', str(data),
+                  str(source), str(source)])
+        assert exit_info.value.code == 2
+        assert 'error: --data:' in capsys.readouterr().err
+
+
+def test_asm_missing_file(tmp_path, capsys):
+    source = tmp_path / 'program.asm'
+    source.write_text(PROGRAM)
+    assert main(['asm', str(tmp_path / 'missing.asm'), str(source)]) == 1
+    assert 'missing.asm' in capsys.readouterr().err
+    assert (tmp_path / 'program.mobj').exists()
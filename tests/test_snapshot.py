@@ -0,0 +1,105 @@
+"""
+Snapshots, checkpoints, seek() and step_back() against fresh runs
+"""
+
+import random
+
+import pytest
+
+from core import PipelinedCPU, Assembler
+from core.cache import CacheConfig
+from core.cpu import SNAPSHOT_STRUCT
+
+from .helpers import loop_program, random_program
+
+CACHES = {
+    'none': (None, None),
+    'dcache': (None, CacheConfig(size=8, block_size=2, miss_penalty=3)),
+    'icache': (CacheConfig(size=16, block_size=4, miss_penalty=2), None),
+    'both': (CacheConfig(size=8, block_size=2, associativity=2, miss_penalty=2),
+             CacheConfig(size=8, block_size=1, miss_penalty=4)),
+}
+
+PROGRAMS = {
+    'loop': loop_program(outer=4, inner=6, body=3),
+    'random': random_program(7, size=60),
+}
+
+
+def new_cpu(instructions, caches, interval=0):
+    icache, dcache = caches
+    cpu = PipelinedCPU()
+    cpu.enable_instruction_cache(icache)
+    cpu.enable_data_cache(dcache)
+    cpu.enable_checkpoints(interval)
+    cpu.load_program(instructions)
+    return cpu
+
+
+def reference_states(instructions, caches):
+    """Snapshot after every cycle of an uninterrupted run, by cycle"""
+    cpu = new_cpu(instructions, caches)
+    states = [cpu.snapshot()]
+    while not cpu.is_program_complete():
+        cpu.step()
+        states.append(cpu.snapshot())
+    return states
+
+
+@pytest.mark.parametrize('program', sorted(PROGRAMS))
+@pytest.mark.parametrize('caches', sorted(CACHES))
+def test_seek(program, caches):
+    instructions = Assembler().assemble(PROGRAMS[program])
+    states = reference_states(instructions, CACHES[caches])
+
+    cpu = new_cpu(instructions, CACHES[caches], interval=16)
+    rng = random.Random(0)
+    for target in [len(states) - 1] + [rng.randrange(len(states)) for _ in range(40)]:
+        assert cpu.seek(target) == target
+        assert cpu.snapshot() == states[target], f"state differs at cycle {target}"
+
+
+@pytest.mark.parametrize('caches', sorted(CACHES))
+def test_step_back(caches):
+    """Step back across checkpoint boundaries, then forward again"""
+    instructions = Assembler().assemble(PROGRAMS['random'])
+    states = reference_states(instructions, CACHES[caches])
+
+    cpu = new_cpu(instructions, CACHES[caches], interval=10)
+    for _ in range(35):
+        cpu.step()
+    for cycle in range(34, 3, -1):
+        cpu.step_back()
+        assert cpu.cycle == cycle
+        assert cpu.snapshot() == states[cycle], f"state differs at cycle {cycle}"
+
+    cpu.step()
+    assert cpu.snapshot() == states[5]
+
+
+def test_seek_back_needs_checkpoints():
+    cpu = new_cpu(Assembler().assemble(PROGRAMS['loop']), CACHES['none'])
+    for _ in range(5):
+        cpu.step()
+    with pytest.raises(ValueError):
+        cpu.seek(2)
+
+
+def test_restore_rejects_bad_snapshots():
+    instructions = Assembler().assemble(PROGRAMS['loop'])
+    cpu = new_cpu(instructions, CACHES['both'])
+    for _ in range(20):
+        cpu.step()
+    snapshot = cpu.snapshot()
+
+    for bad in (snapshot[:SNAPSHOT_STRUCT.size - 1],    # Truncated header
+                snapshot[:-1],                           # Truncated cache state
+                b'\x00\x00' + snapshot[2:],              # Wrong version
+                snapshot + b'\x00'):                     # Trailing data
+        with pytest.raises(ValueError):
+            cpu.restore(bad)
+    assert cpu.snapshot() == snapshot
+
+    # A snapshot taken with caches does not fit a CPU without them
+    with pytest.raises(ValueError):
+        new_cpu(instructions, CACHES['none']).restore(snapshot)
@@ -0,0 +1,119 @@
+"""
+Trace files written by TraceWriter and read back by TraceReader
+"""
+
+import glob
+import os
+
+import pytest
+
+from core import PipelinedCPU, Assembler
+from core.cache import CacheConfig
+from core.trace import (TraceWriter, TraceReader, RECORD_STRUCT, HEADER_STRUCT, BUBBLE_PC,
+                        FLAG_STALL, FLAG_FLUSH, FLAG_REG_WRITE, FLAG_MEM_WRITE, FLAG_LINK,
+                        FLAG_MEM_STALL, FLAG_FETCH_STALL)
+from core.isa import OP_JAL
+
+from .helpers import EXAMPLES_DIR, MAX_CYCLES
+
+
+def latch_pc(latch):
+    return latch.pc if latch.valid else BUBBLE_PC
+
+
+def traced_run(path, trace_path, caches):
+    """Run a program with a tracer; return the expected record fields per cycle"""
+    with open(path) as f:
+        program = Assembler().assemble_object(f.read())
+    cpu = PipelinedCPU()
+    cpu.enable_instruction_cache(caches)
+    cpu.enable_data_cache(caches)
+    cpu.load_program(program)
+
+    expected = []
+    with TraceWriter(trace_path, buffer_size=64) as tracer:
+        cpu.set_tracer(tracer)
+        while not cpu.is_program_complete() and cpu.cycle < MAX_CYCLES:
+            registers, memory = list(cpu.registers), list(cpu.memory)
+            fetch_stalls = cpu.icache.stall_cycles if cpu.icache is not None else 0
+            cpu.step()
+            expected.append({
+                'cycle': cpu.cycle,
+                'pcs': (latch_pc(cpu.IF_ID), latch_pc(cpu.ID_EX),
+                        latch_pc(cpu.EX_MEM), latch_pc(cpu.MEM_WB)),
+                'stall': cpu.stall,
+                'flush': cpu.flush,
+                'mem_stall': cpu.mem_stall,
+                # IF waited this cycle, or a refill runs on behind a data cache stall
+                'fetch_stall': cpu.icache is not None and (
+                    cpu.icache.stall_cycles > fetch_stalls or cpu.icache.wait > 0),
+                'link': cpu.EX_MEM.valid and cpu.EX_MEM.opcode == OP_JAL,
+                'forward': cpu.forwarding[0] | cpu.forwarding[1] << 2,
+                'registers': [(i, value) for i, (old, value)
+                              in enumerate(zip(registers, cpu.registers)) if old != value],
+                'memory': [(i, value) for i, (old, value)
+                           in enumerate(zip(memory, cpu.memory)) if old != value],
+                'after': list(cpu.registers),
+            })
+        assert tracer.records == len(expected)
+    return expected
+
+
+@pytest.mark.parametrize('caches', [None, CacheConfig(size=8, block_size=2, miss_penalty=3)],
+                         ids=['no caches', 'caches'])
+@pytest.mark.parametrize('path', sorted(glob.glob(os.path.join(EXAMPLES_DIR, '*.asm'))),
+                         ids=os.path.basename)
+def test_records_match_cpu(tmp_path, path, caches):
+    trace_path = tmp_path / 'run.trace'
+    expected = traced_run(path, trace_path, caches)
+
+    assert RECORD_STRUCT.size == 23
+    assert os.path.getsize(trace_path) == HEADER_STRUCT.size + 23 * len(expected)
+
+    with TraceReader(trace_path) as trace:
+        assert len(trace) == len(expected)
+        records = list(trace)
+        for state, record in zip(expected, records):
+            assert trace.at_cycle(state['cycle']) == record
+            assert record.cycle == state['cycle']
+            assert (record.if_pc, record.id_pc, record.ex_pc, record.mem_pc) == state['pcs']
+            flags = record.flags
+            assert bool(flags & FLAG_STALL) == state['stall']
+            assert bool(flags & FLAG_FLUSH) == state['flush']
+            assert bool(flags & FLAG_MEM_STALL) == state['mem_stall']
+            assert bool(flags & FLAG_FETCH_STALL) == state['fetch_stall']
+            assert bool(flags & FLAG_LINK) == state['link']
+            assert record.forward == state['forward']
+
+            # Every register or memory word that changed was recorded
+            # (JAL's link write to r7 is flagged separately)
+            changed = [(reg, value) for reg, value in state['registers']
+                       if not (flags & FLAG_LINK and reg == 7)]
+            if changed:
+                assert flags & FLAG_REG_WRITE and changed == [(record.reg, record.reg_value)]
+            if flags & FLAG_REG_WRITE and not (flags & FLAG_LINK and record.reg == 7):
+                assert state['after'][record.reg] == record.reg_value
+            if state['memory']:
+                assert state['memory'] == [(record.mem_addr, record.mem_value)]
+            if flags & FLAG_MEM_WRITE:
+                assert not state['mem_stall']
+
+        # The WB slot of a record is the MEM/WB pc of the record before
+        for before, record in zip(records, records[1:]):
+            assert record.wb_pc == before.mem_pc
+
+    # Flags beyond those defined are never set
+    assert all(not record.flags & ~0x7F for record in records)
+
+
+def test_bad_files(tmp_path):
+    path = tmp_path / 'bad.trace'
+    path.write_bytes(b'MT')
+    with pytest.raises(ValueError, match='too short'):
+        TraceReader(path)
+    path.write_bytes(b'XXXX' + bytes(4))
+    with pytest.raises(ValueError, match='bad magic'):
+        TraceReader(path)
+    path.write_bytes(HEADER_STRUCT.pack(b'MTRC', 99, RECORD_STRUCT.size))
+    with pytest.raises(ValueError, match='version'):
+        TraceReader(path)